@@ -0,0 +1,86 @@
+"""
+Benchmarks the normalization of collected test ids on a synthetic collection
+of 50k tests in 500 test modules.
+
+    python benchmarks/normalize_paths.py [--tests N] [--modules M]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from sflkit.runners.run import PytestRunner
+
+
+def legacy_common_base(directory: Path, tests):
+    parts = directory.parts
+    common_bases = {Path(*parts[:i]) for i in range(1, len(parts) + 1)}
+    leaves_paths = {Path(r.split("::", 1)[0] if "::" in r else r) for r in tests}
+    for cb in filter(
+        lambda p: all(map(lambda r: Path(p, *r.parts).exists(), leaves_paths)),
+        common_bases,
+    ):
+        return cb
+    return None
+
+
+def legacy_normalize_paths(tests, files, directory):
+    result = []
+    for r in tests:
+        for f in files:
+            base = legacy_common_base(f, [r])
+            if base is not None:
+                path, test = r.split("::", 1)
+                result.append(str((base / path).relative_to(directory)) + "::" + test)
+                break
+    return result
+
+
+def create_subject(directory: Path, tests: int, modules: int):
+    collected = []
+    for m in range(modules):
+        module = Path("tests", f"package_{m % 10}", f"test_{m}.py")
+        (directory / module).parent.mkdir(parents=True, exist_ok=True)
+        (directory / module).touch()
+        collected += [f"{module}::test_{t}" for t in range(tests // modules)]
+    return collected
+
+
+def measure(name: str, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    print(f"{name:<24}{time.perf_counter() - start:>10.3f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tests", type=int, default=50000)
+    parser.add_argument("--modules", type=int, default=500)
+    parser.add_argument("--legacy", action="store_true")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp).resolve()
+        tests = create_subject(directory, args.tests, args.modules)
+        print(f"{len(tests)} tests in {args.modules} modules")
+        measure(
+            "directory",
+            PytestRunner.normalize_paths,
+            tests,
+            None,
+            directory,
+            directory,
+        )
+        files = {directory / "tests"}
+        result = measure(
+            "files", PytestRunner.normalize_paths, tests, files, directory, directory
+        )
+        if args.legacy:
+            expected = measure(
+                "files (legacy)", legacy_normalize_paths, tests, files, directory
+            )
+            assert result == expected
+
+
+if __name__ == "__main__":
+    main()
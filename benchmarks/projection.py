@@ -0,0 +1,120 @@
+"""
+Benchmarks loading event files with and without projecting them to the events
+consumed by the configured predicates.
+
+By default, the benchmark instruments the bundled test_events subject with all
+events and concatenates the event logs of repeated executions into one file.
+Event files of a corpus, e.g., events/, are benchmarked with the mapping they
+were instrumented with:
+
+    python benchmarks/projection.py [--runs N] [--predicates line,branch]
+    python benchmarks/projection.py --events events/ --mapping mapping.json
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sflkit import Analyzer, Config, instrument_config
+from sflkit.analysis.analysis_type import AnalysisType
+from sflkit.analysis.factory import CombinationFactory, analysis_factory_mapping
+from sflkit.analysis.mapping import get_consumed_events
+from sflkit.mapping import EventMapping
+from sflkit.model import EventFile
+
+SUBJECT = Path(__file__).parent.parent / "resources" / "subjects" / "tests"
+ALL_EVENTS = (
+    "line,branch,def,use,function_enter,function_exit,function_error,condition,"
+    "loop_begin,loop_hit,loop_end,len"
+)
+
+
+def create_event_file(directory: Path, runs: int) -> (Path, EventMapping):
+    working = directory / "subject"
+    config = Config.create(
+        path=str(SUBJECT / "test_events"),
+        language="python",
+        events=ALL_EVENTS,
+        working=str(working),
+        mapping_path=str(directory / "mapping.json"),
+    )
+    instrument_config(config)
+    path = directory / "events"
+    with open(path, "wb") as events:
+        for _ in range(runs):
+            subprocess.run(
+                [sys.executable, "main.py"],
+                cwd=working,
+                stdout=subprocess.DEVNULL,
+            )
+            with open(working / "EVENTS_PATH", "rb") as fp:
+                events.write(fp.read())
+    return path, EventMapping.load(config)
+
+
+def get_files(path: Path):
+    if path.is_dir():
+        return sorted(f for f in path.rglob("*") if f.is_file())
+    return [path]
+
+
+def load(files, mapping: EventMapping, events=None):
+    loaded = 0
+    for f in files:
+        with EventFile(f, 0, mapping, events=events) as event_file:
+            for _ in event_file.load():
+                loaded += 1
+    return loaded
+
+
+def analyze(files, mapping: EventMapping, predicates, events=None):
+    factory = CombinationFactory([analysis_factory_mapping[p]() for p in predicates])
+    analyzer = Analyzer(
+        [EventFile(f, i, mapping, events=events) for i, f in enumerate(files)],
+        [],
+        factory,
+    )
+    analyzer.analyze()
+    return len(analyzer.get_analysis())
+
+
+def measure(name: str, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    print(f"{name:<24}{time.perf_counter() - start:>10.3f}s{result:>12}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--events", type=Path, default=None)
+    parser.add_argument("--mapping", type=Path, default=None)
+    parser.add_argument("--predicates", default="line,branch")
+    args = parser.parse_args()
+    predicates = [AnalysisType[p.upper()] for p in args.predicates.split(",")]
+    consumed = get_consumed_events(predicates)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.events is None:
+            path, mapping = create_event_file(Path(tmp), args.runs)
+        else:
+            path = args.events
+            mapping = EventMapping.load_from_file(args.mapping, args.events)
+        files = get_files(path)
+        size = sum(os.path.getsize(f) for f in files)
+        print(f"{len(files)} event files with {size / 2**20:.1f} MiB")
+        print(f"consumed events: {', '.join(sorted(e.name for e in consumed))}")
+        measure("load", load, files, mapping)
+        measure("load (projected)", load, files, mapping, consumed)
+        expected = measure("analyze", analyze, files, mapping, predicates)
+        result = measure(
+            "analyze (projected)", analyze, files, mapping, predicates, consumed
+        )
+        assert result == expected
+
+
+if __name__ == "__main__":
+    main()
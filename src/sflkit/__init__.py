@@ -1,10 +1,20 @@
+import os
+import shutil
 from os import PathLike
 from pathlib import Path
+from typing import List, Optional
 
 from sflkit.analysis.analyzer import Analyzer
 from sflkit.analysis.predicate import Predicate
+from sflkit.analysis.stream import EventCollector
 from sflkit.config import Config, parse_config
 from sflkit.instrumentation.dir_instrumentation import DirInstrumentation
+from sflkit.language.python import coverage
+from sflkit.language.python.factory import coverage_lib
+from sflkit.mapping import EventMapping
+from sflkit.model import columnar
+from sflkit.runners.cache import ResultCache
+from sflkit.runners.shard import Shard, get_shard_dir, merge_runs
 
 
 def instrument_config(conf: Config):
@@ -17,6 +27,11 @@ def instrument_config(conf: Config):
         excludes=conf.instrument_exclude,
     )
     instrumentation.dump_events(conf)
+    if conf.instrument_coverage:
+        working = Path(conf.instrument_working)
+        if not working.is_dir():
+            working = working.parent
+        shutil.copy(coverage.__file__, working / f"{coverage_lib}.py")
 
 
 def instrument(config_path: PathLike):
@@ -24,28 +39,116 @@ def instrument(config_path: PathLike):
     instrument_config(conf)
 
 
-def run_config(conf: Config, output: PathLike = None):
+def get_runner(conf: Config):
     runner = conf.runner
     if runner is None:
         raise ValueError("No runner defined")
-    runner = runner.runner
+    if conf.collection_cache:
+        runner = runner.runner(workers=conf.workers, collection_cache=True)
+    else:
+        runner = runner.runner(workers=conf.workers)
+    if conf.memory_limit or conf.cpu_limit:
+        runner.set_limits(conf.memory_limit, conf.cpu_limit)
+    if conf.event_compression:
+        runner.set_compression(conf.event_compression, conf.compression_level)
+    return runner
+
+
+def get_output(output: PathLike = None) -> Path:
     if output is None:
-        output = (Path.cwd() / "events").absolute()
+        return (Path.cwd() / "events").absolute()
     else:
-        output = Path(output)
-    runner.run(conf.instrument_working, output)
+        return Path(output)
+
+
+def get_result_cache(conf: Config) -> Optional[ResultCache]:
+    if not conf.result_cache:
+        return None
+    if conf.mapping_path:
+        mapping = conf.mapping_path
+    else:
+        mapping = EventMapping.get_path(conf.identifier())
+    return ResultCache(conf.result_cache, mapping)
+
 
+def run_config(
+    conf: Config,
+    output: PathLike = None,
+    resume: bool = False,
+    shard: Optional[Shard] = None,
+):
+    runner = get_runner(conf)
+    output = get_output(output)
+    if shard:
+        output = get_shard_dir(output, shard)
+    runner.run(
+        conf.instrument_working,
+        output,
+        history=conf.test_history,
+        resume=resume,
+        results=get_result_cache(conf),
+        shard=shard,
+    )
 
-def run(config_path: PathLike, output: PathLike = None):
+
+def run(
+    config_path: PathLike,
+    output: PathLike = None,
+    resume: bool = False,
+    shard: Optional[Shard] = None,
+):
     conf = parse_config(config_path)
-    run_config(conf, output)
+    run_config(conf, output, resume, shard)
+
+
+def merge(outputs: List[PathLike], output: PathLike = None) -> int:
+    return merge_runs(outputs, get_output(output))
+
+
+def convert_config(conf: Config, events: PathLike, output: PathLike = None):
+    return columnar.convert(events, conf.mapping.mapping, output)
 
 
-def analyze_config(conf: Config, analysis_dump: PathLike = None):
-    analyzer = Analyzer(conf.failing, conf.passing, conf.factory)
+def convert(config_path: PathLike, events: PathLike, output: PathLike = None):
+    conf = parse_config(config_path)
+    return convert_config(conf, events, output)
+
+
+def analyze_config(
+    conf: Config, analysis_dump: PathLike = None, incremental: bool = False
+):
+    if incremental and analysis_dump and os.path.exists(analysis_dump):
+        analyzer = Analyzer.load(analysis_dump)
+        analyzer.workers = conf.analysis_workers
+        analyzer.add_event_files(conf.failing, conf.passing)
+    else:
+        analyzer = Analyzer(
+            conf.failing, conf.passing, conf.factory, workers=conf.analysis_workers
+        )
     analyzer.analyze()
     if analysis_dump:
         analyzer.dump(analysis_dump)
+    return get_results(conf, analyzer)
+
+
+def stream_config(
+    conf: Config, analysis_dump: PathLike = None, output: PathLike = None
+):
+    runner = get_runner(conf)
+    runner.collector = EventCollector(conf.mapping, conf.factory)
+    runner.run(conf.instrument_working, get_output(output))
+    analyzer = runner.collector.get_analyzer()
+    if analysis_dump:
+        analyzer.dump(analysis_dump)
+    return get_results(conf, analyzer)
+
+
+def stream(config_path: PathLike, analysis_dump: PathLike = None):
+    conf = parse_config(config_path)
+    return stream_config(conf, analysis_dump)
+
+
+def get_results(conf: Config, analyzer: Analyzer):
     results = dict()
     for analysis_type in conf.predicates:
         results[analysis_type.name] = dict()
@@ -61,9 +164,11 @@ def analyze_config(conf: Config, analysis_dump: PathLike = None):
     return results
 
 
-def analyze(config_path: PathLike, analysis_dump: PathLike = None):
+def analyze(
+    config_path: PathLike, analysis_dump: PathLike = None, incremental: bool = False
+):
     conf = parse_config(config_path)
-    return analyze_config(conf, analysis_dump)
+    return analyze_config(conf, analysis_dump, incremental)
 
 
 __all__ = [
@@ -77,6 +182,10 @@ __all__ = [
     "instrument_config",
     "analyze",
     "analyze_config",
+    "stream",
+    "stream_config",
+    "convert",
+    "convert_config",
     "Analyzer",
     "Config",
 ]
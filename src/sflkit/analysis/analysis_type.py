@@ -73,6 +73,14 @@ class AnalysisObject(object):
     def analysis_type() -> AnalysisType:
         raise NotImplementedError()
 
+    def merge(self, other: "AnalysisObject"):
+        self.hits.update(other.hits)
+
+    def rename_run(self, run, new_run=None):
+        hits = self.hits.pop(run, None)
+        if hits is not None and new_run is not None:
+            self.hits[new_run] = hits
+
     def analyze(self, passed: List, failed: List):
         self.finalize(passed, failed)
         self.calculate()
@@ -1,45 +1,158 @@
+import itertools
 import os
-from typing import List, Callable, Set, Dict
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Callable, Set, Dict, Optional, Iterable, Tuple
 
+import numpy
+
+from sflkit.analysis import coefficients
 from sflkit.analysis.analysis_type import AnalysisType, AnalysisObject
 from sflkit.analysis.factory import AnalysisFactory
+from sflkit.analysis.matrix import HitMatrix
+from sflkit.analysis.predicate import Predicate
+from sflkit.analysis.spectra import Spectrum
 from sflkit.analysis.suggestion import Suggestion
 from sflkit.model.event_file import EventFile
 from sflkit.model.model import Model
 
 
+def analyze_shard(
+    factory: AnalysisFactory, event_files: List[EventFile]
+) -> AnalysisFactory:
+    model = Model(factory)
+    for event_file in event_files:
+        Analyzer.analyze_event_file(model, event_file)
+    return factory
+
+
+def get_size(event_file: EventFile) -> int:
+    try:
+        return os.path.getsize(event_file.path)
+    except OSError:
+        return 0
+
+
 class Analyzer(object):
     def __init__(
         self,
         relevant_event_files: List[EventFile],
         irrelevant_event_files: List[EventFile],
         factory: AnalysisFactory,
+        workers: int = 1,
     ):
         self.relevant_event_files = relevant_event_files
         self.irrelevant_event_files = irrelevant_event_files
         self.model = Model(factory)
+        self.workers = max(1, workers)
         self.paths: Dict[int, os.PathLike] = dict()
+        self.analyzed: Set[EventFile] = set()
+        self.matrix: Optional[HitMatrix] = None
         self.max_suspiciousness = 0
         self.min_suspiciousness = 0
         self.avg_suspiciousness = 0
 
-    def _analyze(self, event_file):
-        self.model.prepare(event_file)
+    @staticmethod
+    def analyze_event_file(model: Model, event_file: EventFile):
+        model.prepare(event_file)
         with event_file:
             for event in event_file.load():
-                event.handle(self.model)
+                event.handle(model)
+
+    def _analyze(self, event_file):
+        self.analyze_event_file(self.model, event_file)
+
+    def _analyze_parallel(self, event_files: List[EventFile]):
+        event_files = sorted(event_files, key=get_size, reverse=True)
+        workers = min(self.workers, len(event_files))
+        shards = [event_files[worker::workers] for worker in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for factory in executor.map(
+                analyze_shard, itertools.repeat(self.model.factory), shards
+            ):
+                self.model.factory.merge(factory)
 
     def _finalize(self):
-        self.model.finalize(self.irrelevant_event_files, self.relevant_event_files)
+        passed, failed = self.irrelevant_event_files, self.relevant_event_files
+        objects = self.get_analysis()
+        self.matrix = HitMatrix(objects, passed, failed)
+        for obj, passed_observed, failed_observed in zip(objects, *self.matrix.count()):
+            obj.finalize_observed(
+                int(passed_observed), int(failed_observed), len(passed), len(failed)
+            )
+        predicates = [obj for obj in objects if isinstance(obj, Predicate)]
+        evaluated_passed, evaluated_failed = HitMatrix(
+            predicates, passed, failed, lambda p: p.true_hits, lambda p, h: True
+        ).count()
+        true_passed, true_failed = HitMatrix(
+            predicates, passed, failed, lambda p: p.true_hits, lambda p, h: h > 0
+        ).count()
+        for i, predicate in enumerate(predicates):
+            predicate.finalize_evaluations(
+                int(true_failed[i]),
+                int(true_passed[i]),
+                int(evaluated_failed[i] - true_failed[i]),
+                int(evaluated_passed[i] - true_passed[i]),
+            )
+        for obj in objects:
+            obj.calculate()
 
     def analyze(self):
-        for event_file in self.relevant_event_files + self.irrelevant_event_files:
+        event_files = [
+            event_file
+            for event_file in self.relevant_event_files + self.irrelevant_event_files
+            if event_file not in self.analyzed
+        ]
+        for event_file in event_files:
             self.paths[event_file.run_id] = event_file.path
-            self._analyze(event_file)
+        if self.workers > 1 and len(event_files) > 1:
+            self._analyze_parallel(event_files)
+        else:
+            for event_file in event_files:
+                self._analyze(event_file)
+        self.analyzed.update(event_files)
         self._finalize()
 
+    def add_event_files(
+        self,
+        relevant_event_files: List[EventFile],
+        irrelevant_event_files: List[EventFile],
+    ) -> List[EventFile]:
+        """
+        Adds the event files of new runs to the analysis, skipping the files that
+        are already part of it. The new files are analyzed by the next call of
+        analyze(). Returns the added event files.
+        """
+        event_files = self.relevant_event_files + self.irrelevant_event_files
+        known = set(os.fspath(event_file.path) for event_file in event_files)
+        run_id = max((event_file.run_id for event_file in event_files), default=-1)
+        run_id += 1
+        added = list()
+        for event_files, new_event_files in (
+            (self.relevant_event_files, relevant_event_files),
+            (self.irrelevant_event_files, irrelevant_event_files),
+        ):
+            for event_file in new_event_files:
+                if os.fspath(event_file.path) in known:
+                    continue
+                known.add(os.fspath(event_file.path))
+                event_file.run_id = run_id
+                run_id += 1
+                event_files.append(event_file)
+                added.append(event_file)
+        return added
+
     def dump(self, path):
-        pass
+        with open(path, "wb") as fp:
+            pickle.dump(self, fp)
+
+    @staticmethod
+    def load(path) -> "Analyzer":
+        with open(path, "rb") as fp:
+            analyzer = pickle.load(fp)
+        if not isinstance(analyzer, Analyzer):
+            raise TypeError(f"{path} does not contain an analysis")
+        return analyzer
 
     def get_analysis(self) -> Set[AnalysisObject]:
         return list(self.model.get_analysis())
@@ -58,9 +171,53 @@ class Analyzer(object):
             objects = self.get_analysis()
         return self.get_sorted_suggestions_from_analysis(base_dir, objects, metric)
 
+    @staticmethod
+    def get_counts(
+        analysis: List[AnalysisObject],
+    ) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        return tuple(
+            numpy.array([getattr(obj, count) for obj in analysis], dtype=numpy.int64)
+            for count in (
+                "passed_observed",
+                "passed_not_observed",
+                "failed_observed",
+                "failed_not_observed",
+            )
+        )
+
+    def get_coefficients(
+        self, type_: AnalysisType = None, metrics: Iterable[str] = None
+    ) -> Tuple[List[AnalysisObject], Dict[str, numpy.ndarray]]:
+        if type_:
+            objects = self.get_analysis_by_type(type_)
+        else:
+            objects = self.get_analysis()
+        return objects, coefficients.evaluate_all(*self.get_counts(objects), metrics)
+
+    def _vectorize(
+        self, analysis: List[AnalysisObject], metric: Callable = None
+    ) -> Callable:
+        if (
+            metric is None
+            or metric.__name__ not in coefficients.COEFFICIENTS
+            or getattr(Spectrum, metric.__name__) is not metric
+        ):
+            return metric
+        suspiciousness = dict(
+            zip(
+                map(id, analysis),
+                coefficients.evaluate(
+                    metric.__name__, *self.get_counts(analysis)
+                ).tolist(),
+            )
+        )
+        return lambda obj: suspiciousness[id(obj)]
+
     def get_sorted_suggestions_from_analysis(
         self, base_dir, analysis: Set[AnalysisObject], metric: Callable = None
     ) -> List[Suggestion]:
+        analysis = list(analysis)
+        metric = self._vectorize(analysis, metric)
         suggestions = dict()
         max_suspiciousness = float("-inf")
         min_suspiciousness = float("inf")
@@ -0,0 +1,232 @@
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy
+
+from sflkit.analysis.similarity import similarity_coefficients
+
+"""
+Vectorized similarity coefficients. Each coefficient takes arrays of the
+passed observed (po), passed not observed (pn), failed observed (fo), and
+failed not observed (fn) counts of a set of spectra and returns an array of
+their suspiciousness. In line with Spectrum.get_metric, which maps a division
+by zero to 0, all results that are not finite (nan, inf, -inf) are 0.
+"""
+
+
+def AMPLE(po, pn, fo, fn):
+    return numpy.abs(fo / (fo + fn) - po / (po + pn))
+
+
+def AMPLE2(po, pn, fo, fn):
+    return fo / (fo + fn) - po / (po + pn)
+
+
+def Anderberg(po, pn, fo, fn):
+    return fo / (fo + 2 * (fn + po))
+
+
+def ArithmeticMean(po, pn, fo, fn):
+    return (2 * fo * pn - 2 * fn * po) / ((fo + po) * (fn + pn) * (fo + fn) * (po + pn))
+
+
+def Binary(po, pn, fo, fn):
+    return numpy.where(fo < fo + fn, 0.0, 1.0)
+
+
+def CBIInc(po, pn, fo, fn):
+    return fo / (fo + po) - (fo + fn) / (fo + fn + po + pn)
+
+
+def Cohen(po, pn, fo, fn):
+    return (2 * fo * pn - 2 * fn * po) / ((fo + po) * (po + pn) + (fo + fn) * (fn + pn))
+
+
+def Crosstab(po, pn, fo, fn):
+    failed, passed = fo + fn, po + pn
+    total = failed + passed
+    observed, not_observed = fo + po, fn + pn
+    return (
+        (fn - observed * failed / total) ** 2 / (observed * failed / total)
+        + (po - observed * passed / total) ** 2 / (observed * passed / total)
+        + (fn - not_observed * failed / total) ** 2 / (not_observed * failed / total)
+        + (pn - not_observed * passed / total) ** 2 / (not_observed * passed / total)
+    )
+
+
+def Dice(po, pn, fo, fn):
+    return 2 * fo / (fo + fn + po)
+
+
+def DStar(po, pn, fo, fn, n=2):
+    return fo * n / (fn + po)
+
+
+def Euclid(po, pn, fo, fn):
+    return numpy.sqrt(fo + pn)
+
+
+def Fleiss(po, pn, fo, fn):
+    return (4 * fo * pn - 4 * fn * po - (fn - po) ** 2) / (
+        (2 * fo + fn + po) + (2 * pn + fn + po)
+    )
+
+
+def GP02(po, pn, fo, fn):
+    return 2 * (fo + numpy.sqrt(pn)) + numpy.sqrt(po)
+
+
+def GP03(po, pn, fo, fn):
+    return numpy.sqrt(numpy.abs(fo**2 - numpy.sqrt(po)))
+
+
+def GP13(po, pn, fo, fn):
+    return fo * (1 + 1 / (2 * po + fo))
+
+
+def GP19(po, pn, fo, fn):
+    return fo * numpy.sqrt(numpy.abs(po - fo + fn - pn))
+
+
+def Goodman(po, pn, fo, fn):
+    return (2 * fo - fn - po) / (2 * fo + fn + po)
+
+
+def Hamann(po, pn, fo, fn):
+    return (fo + pn - fn - po) / (fo + fn + po + pn)
+
+
+def HammingEtc(po, pn, fo, fn):
+    return fo + pn
+
+
+def HarmonicMean(po, pn, fo, fn):
+    return (
+        (fo * pn - fn * po)
+        * ((fo + po) * (fn + pn) + (fo + fn) * (po + pn))
+        / ((fo + po) * (fn + pn) * (fo + fn) * (po + pn))
+    )
+
+
+def Jaccard(po, pn, fo, fn):
+    return fo / (fo + fn + po)
+
+
+def Kulczynski1(po, pn, fo, fn):
+    return fo / (fn + po)
+
+
+def Kulczynski2(po, pn, fo, fn):
+    return 1 / 2 * (fo / (fo + fn) + fo / (fo + po))
+
+
+def M1(po, pn, fo, fn):
+    return (fo + pn) / (fn + po)
+
+
+def M2(po, pn, fo, fn):
+    return fo / (fo + pn + 2 * (fn + po))
+
+
+def Naish1(po, pn, fo, fn):
+    return numpy.where(fo < fo + fn, -1.0, pn)
+
+
+def Naish2(po, pn, fo, fn):
+    return fo - po / (po + pn + 1)
+
+
+def Ochiai(po, pn, fo, fn):
+    return fo / numpy.sqrt((fo + fn) * (fo + po))
+
+
+def Ochiai2(po, pn, fo, fn):
+    return fo * pn / numpy.sqrt((fo + po) * (fn + pn) * (fo + fn) * (po + pn))
+
+
+def PairScoring(po, pn, fo, fn):
+    return fo * (2 * pn + po)
+
+
+def qe(po, pn, fo, fn):
+    return fo / (fo + po)
+
+
+def RogersAndTanimoto(po, pn, fo, fn):
+    return (fo + pn) / (fo + pn + 2 * (fn + po))
+
+
+def Rogot1(po, pn, fo, fn):
+    return 1 / 2 * (fo / (2 * fo + fn + po) + pn / (2 * pn + fn + po))
+
+
+def Rogot2(po, pn, fo, fn):
+    return 1 / 4 * (fo / (fo + po) + fo / (fo + fn) + pn / (po + pn) + pn / (fn + pn))
+
+
+def RusselAndRao(po, pn, fo, fn):
+    return fo / (fo + fn + po + pn)
+
+
+def Scott(po, pn, fo, fn):
+    return (4 * fo * pn - 4 * fn * po - (fn - po) ** 2) / (
+        (2 * fo + fn + po) * (2 * pn + fn + po)
+    )
+
+
+def SimpleMatching(po, pn, fo, fn):
+    return (fo + pn) / (fo + fn + po + pn)
+
+
+def Sokal(po, pn, fo, fn):
+    return 2 * (fo + pn) / (2 * (fo + pn) + fn + po)
+
+
+def SorensenDice(po, pn, fo, fn):
+    return 2 * fo / (2 * fo + fn + po)
+
+
+def Tarantula(po, pn, fo, fn):
+    return fo / (fo + fn) / (fo / (fo + fn) + po / (po + pn))
+
+
+def Wong1(po, pn, fo, fn):
+    return fo
+
+
+def Wong2(po, pn, fo, fn):
+    return fo - po
+
+
+def Wong3(po, pn, fo, fn):
+    return fo - numpy.where(
+        po <= 2,
+        po,
+        numpy.where(po <= 10, 2 + 0.1 * (po - 2), 2.8 + 0.001 * (po - 10)),
+    )
+
+
+def Zoltar(po, pn, fo, fn):
+    return fo / (fo + fn + po + 10000 * fn * po / fo)
+
+
+COEFFICIENTS: Dict[str, Callable] = {
+    coefficient: globals()[coefficient] for coefficient in similarity_coefficients
+}
+
+
+def evaluate(coefficient: str | Callable, po, pn, fo, fn) -> numpy.ndarray:
+    if not callable(coefficient):
+        coefficient = COEFFICIENTS[coefficient]
+    po, pn, fo, fn = (numpy.asarray(a, dtype=numpy.float64) for a in (po, pn, fo, fn))
+    with numpy.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        result = numpy.broadcast_to(coefficient(po, pn, fo, fn), po.shape)
+    return numpy.where(numpy.isfinite(result), result, 0.0)
+
+
+def evaluate_all(
+    po, pn, fo, fn, coefficients: Optional[Iterable[str]] = None
+) -> Dict[str, numpy.ndarray]:
+    return {
+        coefficient: evaluate(coefficient, po, pn, fo, fn)
+        for coefficient in (coefficients or similarity_coefficients)
+    }
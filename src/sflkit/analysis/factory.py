@@ -1,8 +1,9 @@
 import abc
 from abc import abstractmethod
-from typing import List, Type, Set
+from typing import Dict, List, Optional, Set, Tuple, Type
 
 from sflkitlib.events import EventType
+from sflkitlib.events.event import BranchEvent
 
 from sflkit.analysis.analysis_type import AnalysisObject, AnalysisType
 from sflkit.analysis.predicate import (
@@ -25,9 +26,17 @@ from sflkit.model.scope import Scope
 
 
 class AnalysisFactory:
+    # the event types the factory handles, None if it handles all events
+    event_types: Optional[Set[EventType]] = None
+    # whether the objects of an event are determined by its event id alone
+    static = False
+
     def __init__(self):
         self.objects = dict()
 
+    def handles(self, event_type: EventType) -> bool:
+        return self.event_types is None or event_type in self.event_types
+
     @abstractmethod
     def get_analysis(self, event, scope: Scope = None) -> List[AnalysisObject]:
         raise NotImplementedError()
@@ -49,16 +58,56 @@ class AnalysisFactory:
     def get_all(self) -> Set[AnalysisObject]:
         return set(self.objects.values())
 
+    @staticmethod
+    def merge_objects(obj, other):
+        obj.merge(other)
+
+    def merge(self, other: "AnalysisFactory"):
+        for key, obj in other.objects.items():
+            if key in self.objects:
+                self.merge_objects(self.objects[key], obj)
+            else:
+                self.objects[key] = obj
+
 
 class CombinationFactory(AnalysisFactory):
+    """
+    Combines the analysis of several factories. The first time an event id is
+    handled, the objects of the static factories for it are resolved and stored
+    with the dynamic factories handling its event type in a dispatch table,
+    such that later events with this id only query the dynamic factories.
+    """
+
     def __init__(self, factories: List[AnalysisFactory]):
         super().__init__()
         self.factories = factories
+        self.dispatch: Dict[
+            int, Tuple[List[AnalysisObject], List[AnalysisFactory]]
+        ] = dict()
+
+    def resolve(
+        self, event, scope: Scope = None
+    ) -> Tuple[List[AnalysisObject], List[AnalysisFactory]]:
+        objects, dynamic = list(), list()
+        for factory in self.factories:
+            if factory.handles(event.event_type):
+                if factory.static:
+                    objects.extend(factory.handle(event, scope))
+                else:
+                    dynamic.append(factory)
+        return objects, dynamic
 
     def get_analysis(self, event, scope: Scope = None) -> List[AnalysisObject]:
-        return sum(
-            [factory.handle(event, scope) for factory in self.factories], start=list()
-        )
+        entry = self.dispatch.get(event.event_id)
+        if entry is None:
+            entry = self.dispatch[event.event_id] = self.resolve(event, scope)
+        objects, dynamic = entry
+        if not dynamic:
+            return objects
+        objects = objects[:]
+        for factory in dynamic:
+            objects.extend(factory.handle(event, scope))
+        return objects
 
     def reset(self):
         [f.reset() for f in self.factories]
@@ -66,8 +115,15 @@ class CombinationFactory(AnalysisFactory):
     def get_all(self) -> Set[AnalysisObject]:
         return set().union(*map(lambda f: f.get_all(), self.factories))
 
+    def merge(self, other: "CombinationFactory"):
+        for factory, other_factory in zip(self.factories, other.factories):
+            factory.merge(other_factory)
+
 
 class LineFactory(AnalysisFactory):
+    event_types = {EventType.LINE}
+    static = True
+
     def get_analysis(self, event, scope: Scope = None) -> List[AnalysisObject]:
         if event.event_type == EventType.LINE:
             key = (Line.analysis_type(), event.file, event.line)
@@ -77,6 +133,9 @@ class LineFactory(AnalysisFactory):
 
 
 class BranchFactory(AnalysisFactory):
+    event_types = {EventType.BRANCH}
+    static = True
+
     def __init__(self, else_: bool = True):
         super().__init__()
         self.else_ = else_
@@ -84,9 +143,18 @@ class BranchFactory(AnalysisFactory):
     def get_analysis(self, event, scope: Scope = None) -> List[AnalysisObject]:
         if event.event_type == EventType.BRANCH:
             key = (Branch.analysis_type(), event.file, event.line, event.then_id)
+            # the objects must not depend on the direction of the first seen event,
+            # branches without an else, e.g., except handlers, have a single object
             then = event.then_id < event.else_id
+            then_event = (
+                event
+                if then or event.else_id < 0
+                else BranchEvent(
+                    event.file, event.line, event.event_id, event.else_id, event.then_id
+                )
+            )
             if key not in self.objects:
-                self.objects[key] = Branch(event, then=then)
+                self.objects[key] = Branch(then_event, then=then)
             if self.else_ and event.else_id >= 0:
                 else_key = (
                     Branch.analysis_type(),
@@ -95,12 +163,15 @@ class BranchFactory(AnalysisFactory):
                     event.else_id,
                 )
                 if else_key not in self.objects:
-                    self.objects[else_key] = Branch(event, then=not then)
+                    self.objects[else_key] = Branch(then_event, then=not then)
                 return [self.objects[key], self.objects[else_key]]
             return [self.objects[key]]
 
 
 class FunctionFactory(AnalysisFactory):
+    event_types = {EventType.FUNCTION_ENTER}
+    static = True
+
     def get_analysis(self, event, scope: Scope = None) -> List[AnalysisObject]:
         if event.event_type == EventType.FUNCTION_ENTER:
             key = (Function.analysis_type(), event.file, event.line, event.function_id)
@@ -110,6 +181,8 @@ class FunctionFactory(AnalysisFactory):
 
 
 class LoopFactory(AnalysisFactory):
+    event_types = {EventType.LOOP_BEGIN, EventType.LOOP_HIT, EventType.LOOP_END}
+
     def __init__(self, hit_0: bool = True, hit_1: bool = True, hit_more: bool = True):
         super().__init__()
         self.hit_0 = hit_0
@@ -119,6 +192,11 @@ class LoopFactory(AnalysisFactory):
     def get_all(self) -> Set[AnalysisObject]:
         return set(obj for value in self.objects.values() for obj in value)
 
+    @staticmethod
+    def merge_objects(obj, other):
+        for o, other_o in zip(obj, other):
+            o.merge(other_o)
+
     def get_analysis(self, event, scope: Scope = None) -> List[AnalysisObject]:
         if event.event_type in (
             EventType.LOOP_BEGIN,
@@ -144,6 +222,8 @@ class LoopFactory(AnalysisFactory):
 
 
 class DefUseFactory(AnalysisFactory):
+    event_types = {EventType.DEF, EventType.USE}
+
     def __init__(self):
         super().__init__()
         self.id_to_def = dict()
@@ -170,6 +250,9 @@ class DefUseFactory(AnalysisFactory):
 
 
 class ConditionFactory(AnalysisFactory):
+    event_types = {EventType.CONDITION}
+    static = True
+
     def get_analysis(self, event, scope: Scope = None) -> List[AnalysisObject]:
         if event.event_type == EventType.CONDITION:
             key = (Condition.analysis_type(), event.file, event.line, event.condition)
@@ -179,6 +262,8 @@ class ConditionFactory(AnalysisFactory):
 
 
 class ComparisonFactory(AnalysisFactory, abc.ABC):
+    event_types = {EventType.DEF}
+
     def __init__(
         self,
         eq: bool = True,
@@ -276,6 +361,8 @@ class VariableFactory(ComparisonFactory):
 
 
 class ReturnFactory(ComparisonFactory):
+    event_types = {EventType.FUNCTION_EXIT}
+
     def get_analysis(self, event, scope: Scope = None) -> List[AnalysisObject]:
         if event.event_type == EventType.FUNCTION_EXIT:
             objects = list()
@@ -333,6 +420,9 @@ class ReturnFactory(ComparisonFactory):
 
 
 class ConstantCompFactory(AnalysisFactory):
+    event_types = {EventType.DEF}
+    static = True
+
     def __init__(self, class_: Type[AnalysisObject]):
         super().__init__()
         self.class_ = class_
@@ -370,6 +460,9 @@ class EmptyBytesFactory(ConstantCompFactory):
 
 
 class PredicateFunctionFactory(AnalysisFactory):
+    event_types = {EventType.DEF}
+    static = True
+
     def __init__(self, class_: Type[AnalysisObject]):
         super().__init__()
         self.class_ = class_
@@ -403,6 +496,9 @@ class ContainsSpecialFactory(PredicateFunctionFactory):
 
 
 class LengthFactory(AnalysisFactory):
+    event_types = {EventType.LEN}
+    static = True
+
     def __init__(
         self, length_0: bool = True, length_1: bool = True, length_more: bool = True
     ):
@@ -414,6 +510,11 @@ class LengthFactory(AnalysisFactory):
     def get_all(self) -> Set[AnalysisObject]:
         return set(obj for value in self.objects.values() for obj in value)
 
+    @staticmethod
+    def merge_objects(obj, other):
+        for o, other_o in zip(obj, other):
+            o.merge(other_o)
+
     def get_analysis(self, event, scope: Scope = None) -> List[AnalysisObject]:
         if event.event_type == EventType.LEN:
             key = (Length.analysis_type(), event.file, event.line, event.var)
@@ -431,10 +532,20 @@ class LengthFactory(AnalysisFactory):
 
 
 class FunctionErrorFactory(AnalysisFactory):
+    event_types = {
+        EventType.FUNCTION_ENTER,
+        EventType.FUNCTION_ERROR,
+        EventType.FUNCTION_EXIT,
+    }
+
     def __init__(self):
         super().__init__()
         self.function_mapping = dict()
 
+    def merge(self, other: "FunctionErrorFactory"):
+        super().merge(other)
+        self.function_mapping.update(other.function_mapping)
+
     def get_analysis(self, event, scope: Scope = None) -> List[AnalysisObject]:
         if event.event_type == EventType.FUNCTION_ENTER:
             self.function_mapping[event.function_id] = event.line
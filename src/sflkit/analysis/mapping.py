@@ -1,3 +1,7 @@
+from typing import Iterable, Set
+
+from sflkitlib.events import EventType
+
 from sflkit.analysis.analysis_type import AnalysisType
 from sflkit.analysis.spectra import Line, Function, DefUse, Loop, Length
 from sflkit.analysis.predicate import (
@@ -42,6 +46,16 @@ analysis_mapping[AnalysisType.SPECIAL_STRING] = ContainsSpecialPredicate
 analysis_mapping[AnalysisType.CONDITION] = Condition
 analysis_mapping[AnalysisType.FUNCTION_ERROR] = FunctionErrorPredicate
 
+
+def get_consumed_events(analysis_types: Iterable[AnalysisType]) -> Set[EventType]:
+    """
+    Returns the event types that the analysis of the given types consumes.
+    Analysis objects evaluated in the scope of other variables, e.g., scalar
+    pairs, consume the function events that maintain the scopes.
+    """
+    return {e for a in analysis_types for e in analysis_mapping[a].events()}
+
+
 """
 If you want to add new spectra or predicates, please register them here and in sdtools/analysis/analysis_type.py
 """
@@ -0,0 +1,63 @@
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy
+
+from sflkit.analysis.analysis_type import AnalysisObject
+from sflkit.model.event_file import EventFile
+
+
+class HitMatrix:
+    """
+    A sparse boolean matrix of analysis objects x runs in coordinate format.
+    The columns of the failing runs precede the columns of the passing runs,
+    such that the observations of all objects can be counted with a single
+    reduction per outcome.
+    """
+
+    def __init__(
+        self,
+        objects: Sequence[AnalysisObject],
+        passed: List[EventFile],
+        failed: List[EventFile],
+        hits: Callable[[AnalysisObject], Dict] = None,
+        observed: Callable[[AnalysisObject, object], bool] = None,
+    ):
+        self.objects = objects
+        self.failed = len(failed)
+        self.passed = len(passed)
+        self.runs = {
+            event_file: column for column, event_file in enumerate(failed + passed)
+        }
+        hits = hits or (lambda o: o.hits)
+        observed = observed or (lambda o, h: o.observed(h))
+        rows, columns = list(), list()
+        for row, obj in enumerate(objects):
+            for event_file, value in hits(obj).items():
+                if event_file in self.runs and observed(obj, value):
+                    rows.append(row)
+                    columns.append(self.runs[event_file])
+        self.rows = numpy.array(rows, dtype=numpy.int64)
+        self.columns = numpy.array(columns, dtype=numpy.int64)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.objects), self.failed + self.passed
+
+    def to_dense(self) -> numpy.ndarray:
+        dense = numpy.zeros(self.shape, dtype=bool)
+        dense[self.rows, self.columns] = True
+        return dense
+
+    def count(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Returns the number of passing and failing runs that observed each object.
+        """
+        failing = self.columns < self.failed
+        size = len(self.objects)
+        return (
+            numpy.bincount(self.rows[~failing], minlength=size),
+            numpy.bincount(self.rows[failing], minlength=size),
+        )
@@ -57,6 +57,28 @@ class Predicate(Spectrum, ABC):
                 else:
                     self.false_relevant_observed()
 
+    def merge(self, other: "Predicate"):
+        super().merge(other)
+        self.true_hits.update(other.true_hits)
+
+    def rename_run(self, run, new_run=None):
+        super().rename_run(run, new_run)
+        true_hits = self.true_hits.pop(run, None)
+        if true_hits is not None and new_run is not None:
+            self.true_hits[new_run] = true_hits
+
+    def finalize_evaluations(
+        self,
+        true_relevant: int,
+        true_irrelevant: int,
+        false_relevant: int,
+        false_irrelevant: int,
+    ):
+        self.true_relevant = true_relevant
+        self.true_irrelevant = true_irrelevant
+        self.false_relevant = false_relevant
+        self.false_irrelevant = false_irrelevant
+
     def hit(self, id_, event: Event, scope_: scope.Scope = None):
         if id_ not in self.true_hits:
             self.true_hits[id_] = 0
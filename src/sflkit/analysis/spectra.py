@@ -58,8 +58,10 @@ class Spectrum(AnalysisObject, ABC):
         if metric is None:
             metric = Spectrum.Ochiai
         try:
-            m = metric(self)
-            if m == math.nan:
+            # numpy warns instead of raising on zero denominators, e.g., of sqrt
+            with numpy.errstate(divide="ignore", invalid="ignore", over="ignore"):
+                m = metric(self)
+            if isinstance(m, float) and not math.isfinite(m):
                 m = 0
             return m
         except ZeroDivisionError:
@@ -93,16 +95,27 @@ class Spectrum(AnalysisObject, ABC):
         self.failed = failed
         self.failed_not_observed = failed - self.failed_observed
 
+    def observed(self, hits) -> bool:
+        return hits > 0
+
     def finalize(self, passed: list, failed: list):
         for event_file in failed:
-            if event_file in self.hits and self.hits[event_file] > 0:
+            if event_file in self.hits and self.observed(self.hits[event_file]):
                 self.fail_observed()
         for event_file in passed:
-            if event_file in self.hits and self.hits[event_file] > 0:
+            if event_file in self.hits and self.observed(self.hits[event_file]):
                 self.pass_observed()
         self.set_passed(len(passed))
         self.set_failed(len(failed))
 
+    def finalize_observed(
+        self, passed_observed: int, failed_observed: int, passed: int, failed: int
+    ):
+        self.passed_observed = passed_observed
+        self.failed_observed = failed_observed
+        self.set_passed(passed)
+        self.set_failed(failed)
+
     def AMPLE(self):
         return abs(
             self.failed_observed / self.failed - self.passed_observed / self.passed
@@ -585,6 +598,9 @@ class Loop(ModifiableSpectrum):
     def finalize(self, passed: list, failed: list):
         self.finalize_evaluation(self.evaluate_hit, passed, failed)
 
+    def observed(self, hits) -> bool:
+        return any(map(self.evaluate_hit, hits))
+
     def get_suggestion(self, metric: Callable = None, base_dir: str = ""):
         finder = self.loop_finder(self.file, self.line)
         return Suggestion(
@@ -635,5 +651,8 @@ class Length(ModifiableSpectrum):
     def finalize(self, passed: list, failed: list):
         self.finalize_evaluation(self.evaluate_length, passed, failed)
 
+    def observed(self, hits) -> bool:
+        return any(map(self.evaluate_length, hits))
+
     def __str__(self):
         return f"{self.analysis_type()}:{self.file}:{self.line}:{self.var}:{self.evaluate_length.__name__}"
@@ -0,0 +1,185 @@
+import copy
+import os
+import threading
+from pathlib import Path
+from pickle import PickleError
+from typing import Dict, List, Optional, Set
+
+from sflkitlib.events import event
+
+from sflkit.analysis.analysis_type import AnalysisObject
+from sflkit.analysis.analyzer import Analyzer
+from sflkit.analysis.factory import AnalysisFactory
+from sflkit.logger import LOGGER
+from sflkit.mapping import EventMapping
+from sflkit.model.event_file import EventFile
+from sflkit.model.model import Model
+from sflkit.model.scope import Scope
+from sflkit.runners.run import TestResult
+
+# seconds to wait for a stream to be consumed after its test has finished
+JOIN_TIMEOUT = 60
+
+
+class StreamModel(Model):
+    def __init__(self, factory):
+        super().__init__(factory)
+        self.observed: Set[AnalysisObject] = set()
+
+    def prepare(self, run_id):
+        super().prepare(run_id)
+        self.observed = set()
+
+    def handle_event(self, event, scope: Scope = None):
+        analysis = self.factory.handle(event, scope=scope)
+        for a in analysis:
+            a.hit(self.current_run_id, event, scope)
+        self.observed.update(analysis)
+
+
+class EventStream:
+    """
+    A named pipe at the events path of a test that is consumed by a model while
+    the test executes. The stream holds a write end of the pipe itself, such that
+    the instrumented process never blocks on opening it and the consumer only
+    sees the end of the stream after the test has finished. If the analysis of
+    the events fails, the rest of the stream is drained and the error recorded.
+    """
+
+    def __init__(self, path: Path, run: EventFile, model: StreamModel):
+        self.path = path
+        self.run = run
+        self.model = model
+        self.error: Optional[Exception] = None
+        os.mkfifo(path)
+        self._reader = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        self._writer = os.open(path, os.O_WRONLY)
+        os.set_blocking(self._reader, True)
+        self._thread = threading.Thread(target=self._consume, daemon=True)
+        self._thread.start()
+
+    def _consume(self):
+        self.model.prepare(self.run)
+        with os.fdopen(self._reader, "rb") as stream:
+            try:
+                while stream.peek(1):
+                    try:
+                        e = event.load_next_event(stream, self.run.mapping.mapping)
+                    except (IndexError, ValueError, PickleError):
+                        break
+                    e.handle(self.model)
+            except Exception as e:
+                self.error = e
+                LOGGER.error(f"analyzing the events of run {self.run.run_id}: {e!r}")
+            finally:
+                # drain the pipe such that the writer never blocks
+                while stream.read(65536):
+                    pass
+
+    @property
+    def alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def join(self, timeout: Optional[float] = None):
+        self._thread.join(timeout)
+
+    def close(self):
+        os.close(self._writer)
+        self.join(JOIN_TIMEOUT)
+        if self.alive:
+            self.error = TimeoutError(f"consuming {self.path}")
+            LOGGER.error(f"events of run {self.run.run_id} not consumed in time")
+        os.remove(self.path)
+
+
+class EventCollector:
+    """
+    Collects the events of test executions from named pipes and analyzes them
+    while the tests run, such that no event files are written. Each worker of
+    the runner feeds its own copy of the factory, which are merged afterward.
+    A worker whose stream is still consumed after its test finished continues
+    with a fresh copy, such that no hits are attributed to the wrong test.
+    """
+
+    def __init__(self, mapping: EventMapping, factory: AnalysisFactory):
+        self.mapping = mapping
+        self.factory = factory
+        self.models: Dict[int, StreamModel] = dict()
+        self.relevant_event_files: List[EventFile] = list()
+        self.irrelevant_event_files: List[EventFile] = list()
+        self.abandoned: List[EventStream] = list()
+        self.run_id = 0
+        self.lock = threading.Lock()
+
+    def open(self, events_path: Path, worker: int = 0) -> EventStream:
+        with self.lock:
+            if worker not in self.models:
+                self.models[worker] = StreamModel(copy.deepcopy(self.factory))
+            run_id = self.run_id
+            self.run_id += 1
+        return EventStream(
+            events_path,
+            EventFile(events_path, run_id, self.mapping),
+            self.models[worker],
+        )
+
+    def close(
+        self, stream: EventStream, path: Path, test_result: TestResult
+    ) -> TestResult:
+        """
+        Closes the stream of a test and returns the result of the test, which is
+        undefined if its events could not be analyzed.
+        """
+        stream.close()
+        if stream.alive:
+            with self.lock:
+                for worker, model in self.models.items():
+                    if model is stream.model:
+                        self.models[worker] = StreamModel(copy.deepcopy(self.factory))
+                self.abandoned.append(stream)
+            return TestResult.UNDEFINED
+        if stream.error is not None:
+            # the events of the run are only partially analyzed
+            test_result = TestResult.UNDEFINED
+        if test_result == TestResult.UNDEFINED:
+            run = None
+        else:
+            run = EventFile(
+                path,
+                stream.run.run_id,
+                self.mapping,
+                failing=test_result == TestResult.FAILING,
+            )
+        for obj in stream.model.observed:
+            obj.rename_run(stream.run, run)
+        with self.lock:
+            if test_result == TestResult.FAILING:
+                self.relevant_event_files.append(run)
+            elif test_result == TestResult.PASSING:
+                self.irrelevant_event_files.append(run)
+        return test_result
+
+    def get_analyzer(self) -> Analyzer:
+        for stream in self.abandoned:
+            stream.join(JOIN_TIMEOUT)
+            if stream.alive:
+                LOGGER.error(
+                    f"discarding the runs analyzed with run {stream.run.run_id}, "
+                    "its events are still consumed"
+                )
+                continue
+            for obj in stream.model.observed:
+                obj.rename_run(stream.run, None)
+            self.factory.merge(stream.model.factory)
+        self.abandoned.clear()
+        for model in self.models.values():
+            self.factory.merge(model.factory)
+        self.models.clear()
+        analyzer = Analyzer(
+            self.relevant_event_files, self.irrelevant_event_files, self.factory
+        )
+        for event_file in self.relevant_event_files + self.irrelevant_event_files:
+            analyzer.paths[event_file.run_id] = event_file.path
+            analyzer.analyzed.add(event_file)
+        analyzer.analyze()
+        return analyzer
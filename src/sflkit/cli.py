@@ -11,11 +11,14 @@ from sflkit.config import hash_identifier
 from sflkit.logger import LOGGER
 from sflkit.mapping import EventMapping
 from sflkit.model import EventFile
+from sflkit.runners.shard import parse_shard
 
 INSTRUMENT = "instrument"
 RUN = "run"
 ANALYZE = "analyze"
 READ = "read"
+CONVERT = "convert"
+MERGE_RUNS = "merge-runs"
 
 
 class ResultEncoder(json.JSONEncoder):
@@ -50,11 +53,20 @@ def main(*args: str, stdout=sys.stdout, stderr=sys.stderr):
     if args.command == INSTRUMENT:
         sflkit.instrument(args.config)
     elif args.command == RUN:
-        sflkit.run(args.config, args.out)
+        sflkit.run(args.config, args.out, args.resume, args.shard)
+    elif args.command == MERGE_RUNS:
+        merged = sflkit.merge(args.shards, args.out)
+        LOGGER.info(f"merged {merged} event files")
     elif args.command == ANALYZE:
-        results = sflkit.analyze(args.config, args.analysis)
+        if args.stream:
+            results = sflkit.stream(args.config, args.analysis)
+        else:
+            results = sflkit.analyze(args.config, args.analysis, args.incremental)
         with open(args.out, "w") as output:
             json.dump(results, output, cls=ResultEncoder, indent=4)
+    elif args.command == CONVERT:
+        converted = sflkit.convert(args.config, args.event_file, args.out)
+        LOGGER.info(f"converted {converted} event files")
     elif args.command == READ:
         mapping = EventMapping.load_from_file(hash_identifier(args.target))
         with EventFile(args.event_file, 0, mapping) as event_file:
@@ -113,6 +125,22 @@ def parse_args(args=None, namespace=None):
         help="The dump file of the counts of the relevant and irrelevant, "
         "true and false analysis objects",
     )
+    analyze_parser.add_argument(
+        "--stream",
+        dest="stream",
+        action="store_true",
+        default=False,
+        help="Run the tests and analyze their events while they execute instead of "
+        "reading event files",
+    )
+    analyze_parser.add_argument(
+        "--incremental",
+        dest="incremental",
+        action="store_true",
+        default=False,
+        help="Load the analysis dump if it exists and only analyze the event files "
+        "that are not part of it yet",
+    )
     analyze_parser.add_argument(
         "-o",
         "--out",
@@ -136,6 +164,38 @@ def parse_args(args=None, namespace=None):
         default=None,
         help="The output path of the event files.",
     )
+    run_parser.add_argument(
+        "--resume",
+        dest="resume",
+        action="store_true",
+        default=False,
+        help="Skip the tests that a previous run into the output already completed.",
+    )
+    run_parser.add_argument(
+        "--shard",
+        dest="shard",
+        type=parse_shard,
+        default=None,
+        help="Only execute the i-th of N partitions of the tests, given as i/N, "
+        "and write the event files to shard-i-of-N inside the output path.",
+    )
+
+    merge_parser = commands.add_parser(
+        MERGE_RUNS,
+        description="The merge-runs command combines the event files and manifests "
+        "of several shards into one output.",
+        help="merge the outputs of shards",
+    )
+    merge_parser.add_argument(
+        "-o",
+        "--out",
+        dest="out",
+        default=None,
+        help="The output path of the merged event files, must be empty.",
+    )
+    merge_parser.add_argument(
+        "shards", nargs="+", help="The output paths of the shards to merge."
+    )
 
     read_parser = commands.add_parser(
         READ,
@@ -157,6 +217,31 @@ def parse_args(args=None, namespace=None):
         help="The path of the target to investigate.",
     )
 
+    convert_parser = commands.add_parser(
+        CONVERT,
+        description="The convert command converts event files to the columnar "
+        "event format.",
+        help="convert event files to the columnar format",
+    )
+    convert_parser.add_argument(
+        "-c", "--config", dest="config", required=True, help="path to the config file"
+    )
+    convert_parser.add_argument(
+        "-e",
+        "--events",
+        dest="event_file",
+        required=True,
+        help="The path of the event file or a directory of event files.",
+    )
+    convert_parser.add_argument(
+        "-o",
+        "--out",
+        dest="out",
+        default=None,
+        help="The output path of the converted event files, defaults to "
+        "converting in place.",
+    )
+
     return arg_parser.parse_args(args=args, namespace=namespace)
 
 
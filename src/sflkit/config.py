@@ -4,7 +4,7 @@ import hashlib
 import os.path
 import queue
 from pathlib import Path
-from typing import List, Callable, Union
+from typing import List, Callable, Optional, Set, Union
 
 from sflkitlib.events import EventType
 
@@ -14,7 +14,7 @@ from sflkit.analysis.factory import (
     CombinationFactory,
     AnalysisFactory,
 )
-from sflkit.analysis.mapping import analysis_mapping
+from sflkit.analysis.mapping import get_consumed_events
 from sflkit.analysis.predicate import Predicate
 from sflkit.analysis.spectra import Spectrum
 from sflkit.language.language import Language
@@ -26,8 +26,11 @@ from sflkit.language.meta import (
 )
 from sflkit.language.visitor import ASTVisitor
 from sflkit.mapping import EventMapping, InstrumentationError
+from sflkit.model.compression import check_compression
+from sflkit.model.coverage import COVERAGE_EVENTS
 from sflkit.model.event_file import EventFile
 from sflkit.runners import RunnerType
+from sflkit.runners.run import DEFAULT_WORKERS, PytestRunner
 
 
 class ConfigError(Exception):
@@ -50,15 +53,31 @@ class Config:
                                               all files inside the tree will be treated as event files
     failing=/path(,path)*                   : The event files of failing runs, if a dir is provided
                                               all files inside the tree will be treated as event files
+    workers=N                               : The number of processes analyzing the event files, defaults to 1
 
     [instrumentation]
     path=/path/to/the/instrumented/subject
     include=file(,file)*                    : Files to include in the instrumentation (other files will automatically
                                               be excluded), should be a python re pattern
     exclude=file(,file)*                    : Files to exclude from the instrumentation, should be a python re pattern
+    coverage=True|False                     : Only count the hits of each event instead of logging every event,
+                                              supports the line, branch, and function_enter events
 
     [test]
     runner=TestRunner                       : The testrunner class, None if no run needed
+    workers=N                               : The number of tests executed in parallel, defaults to 1
+    cache=True|False                        : Cache the collected tests and only collect changed test
+                                              modules again, only supported by the pytest runners
+    history=/path/to/history.jsonl          : The manifests of past runs, schedules the tests longest first and
+                                              derives their timeouts from their past durations
+    results=/path/to/cache                  : Cache the results and event files of the tests and reuse them
+                                              as long as the instrumented sources and the mapping are unchanged
+    memory=N                                : The memory limit of each test in megabytes
+    cpu=N                                   : The cpu time limit of each test in seconds, not applied by
+                                              runners executing several tests in one process
+    compression=gzip|zstd                   : Compress the event files when they are stored, zstd requires
+                                              the zstandard package
+    compression_level=N                     : The compression level, defaults to 6 for gzip and 3 for zstd
     """
 
     def __init__(self, path: Union[str, configparser.ConfigParser] = None):
@@ -75,7 +94,17 @@ class Config:
         self.instrument_include = list()
         self.instrument_exclude = list()
         self.instrument_working = None
+        self.instrument_coverage = False
         self.runner = None
+        self.workers = DEFAULT_WORKERS
+        self.analysis_workers = DEFAULT_WORKERS
+        self.collection_cache = False
+        self.test_history = None
+        self.result_cache = None
+        self.memory_limit = None
+        self.cpu_limit = None
+        self.event_compression = None
+        self.compression_level = None
         self.mapping = None
         self.mapping_path = None
         if path:
@@ -111,9 +140,7 @@ class Config:
                         )
                     )
                     # get the events
-                    self.events = {
-                        e for p in self.predicates for e in analysis_mapping[p].events()
-                    }
+                    self.events = get_consumed_events(self.predicates)
                 elif "events" in events:
                     self.factory = CombinationFactory(list())
                     # get the events
@@ -143,6 +170,8 @@ class Config:
                 else:
                     self.metrics = [Spectrum.Ochiai]
 
+                # only the events consumed by the analysis are loaded
+                consumed = self.events if self.predicates else None
                 run_id_generator = IDGenerator()
                 if "mapping" in events:
                     self.mapping_path = Path(events["mapping"])
@@ -156,6 +185,7 @@ class Config:
                         run_id_generator,
                         self.mapping,
                         False,
+                        events=consumed,
                     )
                 if "failing" in events:
                     self.failing = self.get_event_files(
@@ -163,7 +193,10 @@ class Config:
                         run_id_generator,
                         self.mapping,
                         True,
+                        events=consumed,
                     )
+                if "workers" in events:
+                    self.analysis_workers = int(events["workers"])
                 # instrumentation section
                 instrument = config["instrumentation"]
                 if "include" in instrument:
@@ -179,16 +212,61 @@ class Config:
                     while "" in self.instrument_exclude:
                         self.instrument_exclude.remove("")
                 self.instrument_working = Path(instrument["path"])
+                if "coverage" in instrument:
+                    self.instrument_coverage = instrument.getboolean("coverage")
+                    self.check_coverage()
 
                 # test section
                 if "test" in config:
                     test = config["test"]
                     if "runner" in test and test["runner"] != "None":
                         self.runner = RunnerType[test["runner"].upper()]
+                    if "workers" in test:
+                        self.workers = int(test["workers"])
+                    if "cache" in test:
+                        self.collection_cache = test.getboolean("cache")
+                        self.check_collection_cache()
+                    if "history" in test:
+                        self.test_history = Path(test["history"])
+                    if "results" in test:
+                        self.result_cache = Path(test["results"])
+                    if "memory" in test:
+                        self.memory_limit = int(test["memory"])
+                    if "cpu" in test:
+                        self.cpu_limit = int(test["cpu"])
+                    if "compression" in test:
+                        self.event_compression = test["compression"]
+                        try:
+                            check_compression(self.event_compression)
+                        except ValueError as e:
+                            raise ConfigError(e)
+                    if "compression_level" in test:
+                        self.compression_level = int(test["compression_level"])
 
             except KeyError as e:
                 raise ConfigError(e)
 
+    def check_collection_cache(self):
+        if (
+            self.collection_cache
+            and self.runner is not None
+            and not issubclass(self.runner.runner, PytestRunner)
+        ):
+            raise ConfigError(
+                f"runner {self.runner.name.lower()} does not support a collection cache"
+            )
+
+    def check_coverage(self):
+        if self.instrument_coverage:
+            unsupported = set(self.events) - COVERAGE_EVENTS
+            if unsupported:
+                raise ConfigError(
+                    "coverage instrumentation does not support "
+                    + ",".join(sorted(e.name for e in unsupported))
+                )
+            if self.visitor is not None:
+                self.visitor.coverage = True
+
     @staticmethod
     def create_from_values(
         target_path: str = None,
@@ -205,7 +283,17 @@ class Config:
         instrument_include: List[str] = None,
         instrument_exclude: List[str] = None,
         instrument_working: str = None,
+        instrument_coverage: bool = False,
         runner: RunnerType = None,
+        workers: int = DEFAULT_WORKERS,
+        analysis_workers: int = DEFAULT_WORKERS,
+        collection_cache: bool = False,
+        test_history: str = None,
+        result_cache: str = None,
+        memory_limit: int = None,
+        cpu_limit: int = None,
+        event_compression: str = None,
+        compression_level: int = None,
     ):
         conf = Config()
         conf.target_path = target_path
@@ -223,7 +311,19 @@ class Config:
         conf.instrument_include = instrument_include if instrument_include else list()
         conf.instrument_exclude = instrument_exclude if instrument_exclude else list()
         conf.instrument_working = instrument_working
+        conf.instrument_coverage = instrument_coverage
+        conf.check_coverage()
         conf.runner = runner
+        conf.workers = workers
+        conf.analysis_workers = analysis_workers
+        conf.collection_cache = collection_cache
+        conf.check_collection_cache()
+        conf.test_history = test_history
+        conf.result_cache = result_cache
+        conf.memory_limit = memory_limit
+        conf.cpu_limit = cpu_limit
+        conf.event_compression = event_compression
+        conf.compression_level = compression_level
         if mapping:
             conf.mapping = mapping
             if mapping.path:
@@ -231,7 +331,13 @@ class Config:
         return conf
 
     @staticmethod
-    def get_event_files(files, run_id_generator, mapping: EventMapping, failing):
+    def get_event_files(
+        files,
+        run_id_generator,
+        mapping: EventMapping,
+        failing,
+        events: Optional[Set[EventType]] = None,
+    ):
         file_queue = queue.Queue()
         for f in files:
             file_queue.put(f)
@@ -240,7 +346,7 @@ class Config:
             element = file_queue.get()
             if os.path.exists(element):
                 if os.path.isdir(element):
-                    for f in os.listdir(element):
+                    for f in sorted(os.listdir(element)):
                         file_queue.put(os.path.join(element, f))
                 elif os.path.isfile(element) and not os.path.islink(element):
                     result.append(
@@ -249,6 +355,7 @@ class Config:
                             run_id_generator.get_next_id(),
                             mapping,
                             failing=failing,
+                            events=events,
                         )
                     )
             else:
@@ -258,6 +365,7 @@ class Config:
                         run_id_generator.get_next_id(),
                         mapping,
                         failing=failing,
+                        events=events,
                     )
                 )
         return result
@@ -275,7 +383,17 @@ class Config:
         working=None,
         include=None,
         exclude=None,
+        coverage=None,
         runner=None,
+        workers=None,
+        analysis_workers=None,
+        cache=None,
+        history=None,
+        results=None,
+        memory=None,
+        cpu=None,
+        compression=None,
+        compression_level=None,
     ):
         conf = configparser.ConfigParser()
         conf["target"] = dict()
@@ -299,14 +417,34 @@ class Config:
             conf["events"]["failing"] = failing
         if mapping_path:
             conf["events"]["mapping"] = mapping_path
+        if analysis_workers:
+            conf["events"]["workers"] = str(analysis_workers)
         if working:
             conf["instrumentation"]["path"] = working
         if include:
             conf["instrumentation"]["include"] = include
         if exclude:
             conf["instrumentation"]["exclude"] = exclude
+        if coverage:
+            conf["instrumentation"]["coverage"] = str(coverage)
         if runner:
             conf["test"]["runner"] = runner
+        if workers:
+            conf["test"]["workers"] = str(workers)
+        if cache:
+            conf["test"]["cache"] = str(cache)
+        if history:
+            conf["test"]["history"] = str(history)
+        if results:
+            conf["test"]["results"] = str(results)
+        if memory:
+            conf["test"]["memory"] = str(memory)
+        if cpu:
+            conf["test"]["cpu"] = str(cpu)
+        if compression:
+            conf["test"]["compression"] = compression
+        if compression_level is not None:
+            conf["test"]["compression_level"] = str(compression_level)
 
         return Config(conf)
 
@@ -333,14 +471,34 @@ class Config:
             conf["events"]["failing"] = ",".join(e.path for e in self.failing)
         if self.mapping_path:
             conf["events"]["mapping"] = str(self.mapping_path)
+        if self.analysis_workers != DEFAULT_WORKERS:
+            conf["events"]["workers"] = str(self.analysis_workers)
         if self.instrument_working:
             conf["instrumentation"]["path"] = str(self.instrument_working)
         if self.instrument_include:
             conf["instrumentation"]["include"] = ",".join(self.instrument_include)
         if self.instrument_exclude:
             conf["instrumentation"]["exclude"] = ",".join(self.instrument_exclude)
+        if self.instrument_coverage:
+            conf["instrumentation"]["coverage"] = str(self.instrument_coverage)
         if self.runner:
             conf["test"]["runner"] = self.runner.name
+        if self.workers != DEFAULT_WORKERS:
+            conf["test"]["workers"] = str(self.workers)
+        if self.collection_cache:
+            conf["test"]["cache"] = str(self.collection_cache)
+        if self.test_history:
+            conf["test"]["history"] = str(self.test_history)
+        if self.result_cache:
+            conf["test"]["results"] = str(self.result_cache)
+        if self.memory_limit:
+            conf["test"]["memory"] = str(self.memory_limit)
+        if self.cpu_limit:
+            conf["test"]["cpu"] = str(self.cpu_limit)
+        if self.event_compression:
+            conf["test"]["compression"] = self.event_compression
+        if self.compression_level is not None:
+            conf["test"]["compression_level"] = str(self.compression_level)
 
         with open(path, "w") as fp:
             conf.write(fp)
@@ -0,0 +1,114 @@
+"""
+The coverage runtime of sflkit. Instead of writing every event, it counts the
+hits of each event id and writes the counts once when the events are dumped.
+
+Instrumented modules import it as ``import sflkit_coverage as sflkitlib`` in
+place of sflkitlib.lib, hence it provides the same functions and exposes
+itself as ``lib``. This module is copied into the instrumented subject and
+must only depend on the standard library.
+"""
+import atexit
+import os
+import struct
+import sys
+
+MAGIC = b"SFLKCOV1"
+
+lib = sys.modules[__name__]
+
+_counts = dict()
+_event_path = os.getenv("EVENTS_PATH", default="EVENTS_PATH")
+
+
+def reset():
+    global _counts, _event_path
+    dump_events()
+    _counts = dict()
+    _event_path = os.getenv("EVENTS_PATH", default="EVENTS_PATH")
+
+
+def dump_events():
+    global _event_path
+    if _event_path is None:
+        return
+    items = sorted(_counts.items())
+    # noinspection PyBroadException
+    try:
+        with open(_event_path, "wb") as fp:
+            fp.write(MAGIC)
+            fp.write(struct.pack("<Q", len(items)))
+            fp.write(
+                struct.pack(f"<{2 * len(items)}Q", *(v for item in items for v in item))
+            )
+    except:
+        pass
+    _event_path = None
+
+
+atexit.register(dump_events)
+
+
+def get_id(x):
+    try:
+        return id(x)
+    except (AttributeError, TypeError):
+        return None
+
+
+def get_type(x):
+    try:
+        return type(x)
+    except (AttributeError, TypeError):
+        return None
+
+
+def hit(event_id: int):
+    _counts[event_id] = _counts.get(event_id, 0) + 1
+
+
+def add_line_event(event_id: int):
+    hit(event_id)
+
+
+def add_branch_event(event_id: int):
+    hit(event_id)
+
+
+def add_def_event(event_id: int, *args):
+    hit(event_id)
+
+
+def add_function_enter_event(event_id: int):
+    hit(event_id)
+
+
+def add_function_exit_event(event_id: int, *args):
+    hit(event_id)
+
+
+def add_function_error_event(event_id: int):
+    hit(event_id)
+
+
+def add_condition_event(event_id: int, *args):
+    hit(event_id)
+
+
+def add_loop_begin_event(event_id: int):
+    hit(event_id)
+
+
+def add_loop_hit_event(event_id: int):
+    hit(event_id)
+
+
+def add_loop_end_event(event_id: int):
+    hit(event_id)
+
+
+def add_use_event(event_id: int, *args):
+    hit(event_id)
+
+
+def add_len_event(event_id: int, *args):
+    hit(event_id)
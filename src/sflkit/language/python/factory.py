@@ -21,6 +21,7 @@ from sflkitlib.events.event import (
 from sflkit.language.meta import MetaVisitor, Injection, IDGenerator, TmpGenerator
 
 python_lib = "sflkitlib.lib"
+coverage_lib = "sflkit_coverage"
 
 
 def get_call(function, *args) -> Expr:
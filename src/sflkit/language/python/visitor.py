@@ -3,15 +3,24 @@ from typing import Any, Union
 
 from sflkit.language.meta import MetaVisitor, Injection
 from sflkit.language.python.extract import PythonIsDoc
-from sflkit.language.python.factory import python_lib
+from sflkit.language.python.factory import python_lib, coverage_lib
 from sflkit.language.visitor import ASTVisitor
 
 
 class PythonInstrumentation(NodeTransformer, ASTVisitor):
-    def __init__(self, meta_visitor: MetaVisitor):
+    def __init__(self, meta_visitor: MetaVisitor, coverage: bool = False):
         super().__init__(meta_visitor)
         self.is_doc = PythonIsDoc()
         self.__future__ = list()
+        self.coverage = coverage
+
+    def get_import(self) -> Import:
+        if self.coverage:
+            # the coverage runtime exposes itself as lib
+            return Import(
+                names=[alias(name=coverage_lib, asname=python_lib.split(".")[0])]
+            )
+        return Import(names=[alias(name=python_lib, asname=None)])
 
     def parse(self, source: str):
         return parse(source)
@@ -28,7 +37,7 @@ class PythonInstrumentation(NodeTransformer, ASTVisitor):
             body=doc
             + self.__future__
             + [
-                Import(names=[alias(name=python_lib, asname=None)]),
+                self.get_import(),
                 instrumented_tree,
             ],
             type_ignores=list(),
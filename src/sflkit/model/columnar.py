@@ -0,0 +1,313 @@
+import io
+import mmap
+import os
+import shutil
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy
+from sflkitlib.events import EventType
+from sflkitlib.events.codec import ENDIAN
+from sflkitlib.events.event import Event, load_next_event
+
+from sflkit.model import coverage
+from sflkit.model.compression import is_compressed, open_events
+
+"""
+The columnar event format stores an event log as
+
+    MAGIC | number of events (u8) | number of payloads (u8) | id size (u8)
+          | event ids (u2 or u4 * events)
+          | payload offsets (u8 * (payloads + 1))
+          | payload blob
+
+Payloads are the encoded values of events with a value, e.g., the variable id,
+value and type of a def event, in the same order as their events.
+"""
+
+MAGIC = b"SFLKCOL1"
+HEADER = numpy.dtype([("events", "<u8"), ("payloads", "<u8"), ("id_size", "<u8")])
+EVENT_IDS = {2: numpy.dtype("<u2"), 4: numpy.dtype("<u4")}
+CHUNK_SIZE = 1 << 20
+OFFSET = numpy.dtype("<u8")
+# the number of events decoded at once by the columnar reader
+BATCH_SIZE = 1 << 16
+# the ids in the logs assembled from the columns are encoded with a fixed size
+RAW_ID = numpy.dtype(">u4" if ENDIAN == "big" else "<u4")
+
+PAYLOAD_EVENTS = {
+    EventType.DEF,
+    EventType.USE,
+    EventType.FUNCTION_EXIT,
+    EventType.CONDITION,
+    EventType.LEN,
+}
+# the sizes of the length prefixes of the fields of a payload, the payload of a
+# condition event is a single byte
+PAYLOAD_FIELDS = {
+    EventType.DEF: (1, 4, 2),
+    EventType.USE: (1,),
+    EventType.FUNCTION_EXIT: (4, 2),
+    EventType.LEN: (1, 1),
+}
+
+
+def is_columnar(path: os.PathLike) -> bool:
+    with open_events(path) as fp:
+        return fp.read(len(MAGIC)) == MAGIC
+
+
+def _read(stream: BinaryIO, n: int) -> bytes:
+    data = stream.read(n)
+    if len(data) < n:
+        raise ValueError("truncated stream")
+    return data
+
+
+def _read_len(stream: BinaryIO, n: int) -> bytes:
+    length = _read(stream, n)
+    return length + _read(stream, int.from_bytes(length, ENDIAN))
+
+
+def read_raw_event(
+    stream: BinaryIO, events: Dict[int, Event]
+) -> Tuple[int, Optional[bytes]]:
+    """
+    Reads the next event of an event log without decoding it and returns its id
+    and the encoded payload, or None if the event has no payload.
+    """
+    test = stream.read(1)
+    if not test:
+        raise ValueError("empty stream")
+    event_id = int.from_bytes(_read(stream, int.from_bytes(test, ENDIAN)), ENDIAN)
+    event_type = events[event_id].event_type
+    if event_type == EventType.CONDITION:
+        payload = _read(stream, 1)
+    elif event_type in PAYLOAD_FIELDS:
+        payload = b"".join(_read_len(stream, n) for n in PAYLOAD_FIELDS[event_type])
+    else:
+        payload = None
+    return event_id, payload
+
+
+def get_payload_end(buffer: bytes, position: int, event_type: EventType) -> int:
+    """
+    Returns the end of the payload starting at the position, which is beyond the
+    buffer if the payload is incomplete.
+    """
+    if event_type == EventType.CONDITION:
+        return position + 1
+    for n in PAYLOAD_FIELDS[event_type]:
+        if position + n > len(buffer):
+            return len(buffer) + 1
+        position += n + int.from_bytes(buffer[position : position + n], ENDIAN)
+    return position
+
+
+def load_projected(
+    stream: BinaryIO,
+    events: Dict[int, Event],
+    types: Set[EventType],
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Event]:
+    """
+    Yields the events of the given types of an event log. The log is read in
+    chunks and the payloads of all other events are skipped without decoding
+    them. A truncated last event is ignored.
+    """
+    buffer, position = b"", 0
+    while True:
+        chunk = stream.read(chunk_size)
+        buffer, position = buffer[position:] + chunk, 0
+        size = len(buffer)
+        while position < size:
+            end = position + 1 + buffer[position]
+            if end > size:
+                break
+            event = events[int.from_bytes(buffer[position + 1 : end], ENDIAN)]
+            event_type = event.event_type
+            if event_type in PAYLOAD_EVENTS:
+                end = get_payload_end(buffer, end, event_type)
+                if end > size:
+                    break
+                if event_type in types:
+                    yield load_next_event(io.BytesIO(buffer[position:end]), events)
+            elif event_type in types:
+                yield event.instantiate()
+            position = end
+        if not chunk:
+            return
+
+
+def write_columnar(
+    path: os.PathLike, event_ids: List[int], payloads: List[bytes]
+) -> None:
+    offsets = numpy.zeros(len(payloads) + 1, dtype=OFFSET)
+    offsets[1:] = numpy.cumsum([len(p) for p in payloads])
+    id_size = 2 if max(event_ids, default=0) < 2**16 else 4
+    header = numpy.array([(len(event_ids), len(payloads), id_size)], dtype=HEADER)
+    with open(path, "wb") as fp:
+        fp.write(MAGIC)
+        fp.write(header.tobytes())
+        fp.write(numpy.asarray(event_ids, dtype=EVENT_IDS[id_size]).tobytes())
+        fp.write(offsets.tobytes())
+        for payload in payloads:
+            fp.write(payload)
+
+
+def convert_event_file(
+    src: os.PathLike, dst: os.PathLike, events: Dict[int, Event]
+) -> None:
+    event_ids, payloads = list(), list()
+    with open_events(src) as fp:
+        while fp.peek(1):
+            try:
+                event_id, payload = read_raw_event(fp, events)
+            except (KeyError, ValueError):
+                break
+            event_ids.append(event_id)
+            if payload is not None:
+                payloads.append(payload)
+    write_columnar(dst, event_ids, payloads)
+
+
+def convert(
+    src: os.PathLike, events: Dict[int, Event], dst: Optional[os.PathLike] = None
+) -> int:
+    """
+    Converts an event file or all event files in a directory tree to the columnar
+    format and returns the number of converted files. If no destination is
+    given, the files are converted in place.
+    """
+    src = Path(src)
+    dst = src if dst is None else Path(dst)
+    if src.is_dir():
+        dst.mkdir(parents=True, exist_ok=True)
+        converted = 0
+        for element in os.listdir(src):
+            if src / element == dst:
+                continue
+            converted += convert(src / element, events, dst / element)
+        return converted
+    if is_columnar(src) or coverage.is_coverage(src):
+        if src != dst:
+            shutil.copy(src, dst)
+        return 0
+    tmp = dst.with_name(dst.name + ".columnar")
+    convert_event_file(src, tmp, events)
+    os.replace(tmp, dst)
+    return 1
+
+
+class ColumnarEventReader:
+    def __init__(self, path: os.PathLike):
+        self._file_pointer = open_events(path)
+        if is_compressed(path):
+            self._buffer = self._file_pointer.read()
+        else:
+            try:
+                self._buffer = mmap.mmap(
+                    self._file_pointer.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            except ValueError:
+                self._buffer = b""
+        if self._buffer[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a columnar event file")
+        offset = len(MAGIC)
+        header = numpy.frombuffer(self._buffer, dtype=HEADER, count=1, offset=offset)
+        events, payloads = int(header["events"][0]), int(header["payloads"][0])
+        event_id = EVENT_IDS[int(header["id_size"][0])]
+        offset += HEADER.itemsize
+        self.event_ids = numpy.frombuffer(
+            self._buffer, dtype=event_id, count=events, offset=offset
+        )
+        offset += event_id.itemsize * events
+        self.offsets = numpy.frombuffer(
+            self._buffer, dtype=OFFSET, count=payloads + 1, offset=offset
+        )
+        self._blob = offset + OFFSET.itemsize * (payloads + 1)
+
+    def __len__(self):
+        return len(self.event_ids)
+
+    def payload(self, index: int) -> bytes:
+        start = self._blob + int(self.offsets[index])
+        end = self._blob + int(self.offsets[index + 1])
+        return self._buffer[start:end]
+
+    def assemble(self, event_ids: numpy.ndarray, payloads: numpy.ndarray) -> bytes:
+        """
+        Assembles the event log of the events with the given ids and payload
+        indices, copying the payloads from the blob with numpy.
+        """
+        starts = self.offsets[payloads]
+        lengths = (self.offsets[payloads + 1] - starts).astype(numpy.int64)
+        prefix = 1 + RAW_ID.itemsize
+        positions = numpy.zeros(len(payloads), dtype=numpy.int64)
+        numpy.cumsum(prefix + lengths[:-1], out=positions[1:])
+        log = numpy.empty(int(prefix * len(payloads) + lengths.sum()), numpy.uint8)
+        log[positions] = RAW_ID.itemsize
+        ids = event_ids.astype(RAW_ID).view(numpy.uint8).reshape(-1, RAW_ID.itemsize)
+        log[positions[:, None] + numpy.arange(1, prefix)] = ids
+        copied = numpy.zeros(len(payloads), dtype=numpy.int64)
+        numpy.cumsum(lengths[:-1], out=copied[1:])
+        index = numpy.arange(int(lengths.sum()), dtype=numpy.int64)
+        blob = numpy.frombuffer(self._buffer, dtype=numpy.uint8)
+        log[numpy.repeat(positions + prefix - copied, lengths) + index] = blob[
+            numpy.repeat(starts.astype(numpy.int64) + self._blob - copied, lengths)
+            + index
+        ]
+        return log.tobytes()
+
+    def load(
+        self, events: Dict[int, Event], types: Optional[Set[EventType]] = None
+    ) -> Iterator[Event]:
+        """
+        Yields the events, or only those of the given types. The events to load
+        and the locations of their payloads are computed on whole columns, and
+        the payloads of a batch are decoded from one assembled event log.
+        """
+        size = max(events, default=-1) + 2
+        known = numpy.zeros(size, dtype=bool)
+        has_payload = numpy.zeros(size, dtype=bool)
+        selected = numpy.zeros(size, dtype=bool)
+        for event_id, event in events.items():
+            known[event_id] = True
+            has_payload[event_id] = event.event_type in PAYLOAD_EVENTS
+            selected[event_id] = types is None or event.event_type in types
+        event_ids = self.event_ids.astype(numpy.int64)
+        unknown = numpy.flatnonzero(
+            ~known[numpy.minimum(event_ids, size - 1)] | (event_ids < 0)
+        )
+        end = int(unknown[0]) if len(unknown) else len(event_ids)
+        event_ids = event_ids[:end]
+        payloads = numpy.cumsum(has_payload[event_ids]) - 1
+        for batch in range(0, end, BATCH_SIZE):
+            ids = event_ids[batch : batch + BATCH_SIZE]
+            chosen = numpy.flatnonzero(selected[ids])
+            ids = ids[chosen]
+            with_payload = has_payload[ids]
+            log = io.BytesIO(
+                self.assemble(
+                    ids[with_payload],
+                    payloads[batch : batch + BATCH_SIZE][chosen][with_payload],
+                )
+            )
+            for event_id, payload in zip(ids.tolist(), with_payload.tolist()):
+                if payload:
+                    yield load_next_event(log, events)
+                else:
+                    yield events[event_id].instantiate()
+        if end < len(self.event_ids):
+            raise KeyError(int(self.event_ids[end]))
+
+    def close(self):
+        self.event_ids = None
+        self.offsets = None
+        if isinstance(self._buffer, mmap.mmap):
+            try:
+                self._buffer.close()
+            except BufferError:
+                pass
+        self._file_pointer.close()
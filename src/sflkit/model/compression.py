@@ -0,0 +1,79 @@
+import gzip
+import io
+import os
+import shutil
+from typing import BinaryIO, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+DEFAULT_LEVELS = {GZIP: 6, ZSTD: 3}
+MAGICS = {b"\x1f\x8b": GZIP, b"\x28\xb5\x2f\xfd": ZSTD}
+MAGIC_SIZE = max(map(len, MAGICS))
+CHUNK_SIZE = 1 << 20
+
+
+def check_compression(compression: str):
+    if compression not in DEFAULT_LEVELS:
+        raise ValueError(
+            f"unknown compression {compression}, choose from "
+            + ", ".join(DEFAULT_LEVELS)
+        )
+    if compression == ZSTD and zstandard is None:
+        raise ValueError("zstd compression requires the zstandard package")
+
+
+def get_compression(magic: bytes) -> Optional[str]:
+    for prefix, compression in MAGICS.items():
+        if magic.startswith(prefix):
+            return compression
+    return None
+
+
+def is_compressed(path: os.PathLike) -> bool:
+    with open(path, "rb") as fp:
+        return get_compression(fp.read(MAGIC_SIZE)) is not None
+
+
+def compress(
+    src: os.PathLike,
+    dst: os.PathLike,
+    compression: str = GZIP,
+    level: Optional[int] = None,
+):
+    check_compression(compression)
+    if level is None:
+        level = DEFAULT_LEVELS[compression]
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        if compression == GZIP:
+            with gzip.GzipFile(
+                fileobj=target, mode="wb", compresslevel=level, mtime=0
+            ) as stream:
+                shutil.copyfileobj(source, stream, CHUNK_SIZE)
+        else:
+            zstandard.ZstdCompressor(level=level).copy_stream(source, target)
+
+
+def open_events(path: os.PathLike) -> BinaryIO:
+    """
+    Opens an event file for reading and transparently decompresses it if it is
+    compressed. The returned stream supports peek.
+    """
+    fp = open(path, "rb")
+    compression = get_compression(fp.peek(MAGIC_SIZE)[:MAGIC_SIZE])
+    if compression is None:
+        return fp
+    if compression == GZIP:
+        fp.close()
+        return io.BufferedReader(gzip.open(path, "rb"), CHUNK_SIZE)
+    if zstandard is None:
+        fp.close()
+        raise ValueError(f"{path} is compressed with zstd, requires zstandard")
+    return io.BufferedReader(
+        zstandard.ZstdDecompressor().stream_reader(fp, closefd=True), CHUNK_SIZE
+    )
@@ -0,0 +1,60 @@
+import os
+from typing import Dict, Iterator, Optional, Set
+
+import numpy
+from sflkitlib.events import EventType
+from sflkitlib.events.event import Event
+
+from sflkit.model.compression import open_events
+
+"""
+A coverage file stores the number of hits of each event id of a run as
+
+    MAGIC | number of event ids (u8) | (event id (u8), hits (u8)) * event ids
+
+It is written by the coverage runtime in sflkit.language.python.coverage.
+"""
+
+MAGIC = b"SFLKCOV1"
+COUNT = numpy.dtype("<u8")
+
+COVERAGE_EVENTS = {EventType.LINE, EventType.BRANCH, EventType.FUNCTION_ENTER}
+
+
+def is_coverage(path: os.PathLike) -> bool:
+    with open_events(path) as fp:
+        return fp.read(len(MAGIC)) == MAGIC
+
+
+class CoverageReader:
+    def __init__(self, path: os.PathLike):
+        with open_events(path) as fp:
+            data = fp.read()
+        if data[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a coverage file")
+        offset = len(MAGIC)
+        size = int(numpy.frombuffer(data, dtype=COUNT, count=1, offset=offset)[0])
+        offset += COUNT.itemsize
+        counts = numpy.frombuffer(
+            data, dtype=COUNT, count=2 * size, offset=offset
+        ).reshape(size, 2)
+        self.event_ids = counts[:, 0]
+        self.counts = counts[:, 1]
+
+    def __len__(self):
+        return len(self.event_ids)
+
+    def load(
+        self, events: Dict[int, Event], types: Optional[Set[EventType]] = None
+    ) -> Iterator[Event]:
+        """
+        Yields each event that was hit once, which is sufficient for the spectra
+        that coverage files support.
+        """
+        for event_id in self.event_ids.tolist():
+            event = events[event_id]
+            if types is None or event.event_type in types:
+                yield event.instantiate()
+
+    def close(self):
+        pass
@@ -1,32 +1,71 @@
 import os
 from pickle import PickleError
+from typing import Optional, Set
 
-from sflkitlib.events import event
+import numpy
+from sflkitlib.events import EventType, event
 
 from sflkit.mapping import EventMapping
+from sflkit.model import columnar, compression, coverage
 
 
 class EventFile(object):
+    READERS = {
+        columnar.MAGIC: columnar.ColumnarEventReader,
+        coverage.MAGIC: coverage.CoverageReader,
+    }
+
     def __init__(
         self,
         path: os.PathLike,
         run_id: int,
         mapping: EventMapping,
         failing: bool = False,
+        events: Optional[Set[EventType]] = None,
     ):
         self.path = path
         self.run_id = run_id
         self.mapping = mapping
         self.failing = failing
+        # the event types to load, all others are skipped
+        self.events = events
         self._csv_reader = None
         self._file_pointer = None
+        self._reader = None
 
     def __enter__(self):
-        self._file_pointer = open(self.path, "rb")
+        self._file_pointer = compression.open_events(self.path)
+        magic = self._file_pointer.peek(len(columnar.MAGIC))[: len(columnar.MAGIC)]
+        if magic in self.READERS:
+            self._file_pointer.close()
+            self._file_pointer = None
+            self._reader = self.READERS[magic](self.path)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._file_pointer.close()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        else:
+            self._file_pointer.close()
+
+    def __eq__(self, other):
+        if isinstance(other, EventFile):
+            return (
+                os.fspath(self.path) == os.fspath(other.path)
+                and self.run_id == other.run_id
+                and self.failing == other.failing
+            )
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((os.fspath(self.path), self.run_id, self.failing))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_file_pointer"] = None
+        state["_reader"] = None
+        return state
 
     def __repr__(self):
         return f'{self.path}:{self.run_id}:{"FAIL" if self.failing else "PASS"}'
@@ -35,8 +74,31 @@ class EventFile(object):
         return repr(self)
 
     def load(self):
+        if self._reader is not None:
+            yield from self._reader.load(self.mapping.mapping, self.events)
+            return
+        if self.events is not None:
+            try:
+                yield from columnar.load_projected(
+                    self._file_pointer, self.mapping.mapping, self.events
+                )
+            except (IndexError, ValueError, PickleError):
+                pass
+            return
         while self._file_pointer.peek(1):
             try:
                 yield event.load_next_event(self._file_pointer, self.mapping.mapping)
             except (IndexError, ValueError, PickleError):
                 break
+
+    def event_ids(self) -> numpy.ndarray:
+        if self._reader is not None:
+            if self.events is None:
+                return self._reader.event_ids
+            ids = [
+                event_id
+                for event_id, e in self.mapping.mapping.items()
+                if e.event_type in self.events
+            ]
+            return self._reader.event_ids[numpy.isin(self._reader.event_ids, ids)]
+        return numpy.fromiter((e.event_id for e in self.load()), dtype=numpy.uint32)
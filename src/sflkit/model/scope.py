@@ -2,6 +2,8 @@ from typing import List
 
 
 class Var(object):
+    __slots__ = ("var", "value", "type_")
+
     def __init__(self, var, value, type_):
         self.var = var
         self.value = value
@@ -15,12 +17,25 @@ class Var(object):
 
 
 class Scope(object):
+    """
+    A scope of variables. An entered scope shares the variables of its parent
+    until a variable is defined in it, which copies them first. Hence, entering
+    and exiting are constant and scopes without definitions never copy. A scope
+    must not change while a child of it is entered.
+    """
+
+    __slots__ = ("parent", "variables", "shared")
+
     def __init__(self, parent=None, variables: dict = None):
         self.parent = parent
         self.variables = dict() if variables is None else variables.copy()
+        self.shared = False
 
     def enter(self):
-        return Scope(parent=self, variables=self.variables)
+        scope = Scope(parent=self)
+        scope.variables = self.variables
+        scope.shared = True
+        return scope
 
     def exit(self):
         if self.parent is not None:
@@ -29,10 +44,14 @@ class Scope(object):
             return self
 
     def value(self, var: str) -> Var:
-        if var in self.variables:
-            return self.variables[var].value
+        variable = self.variables.get(var)
+        if variable is not None:
+            return variable.value
 
     def add(self, var, value, type_):
+        if self.shared:
+            self.variables = self.variables.copy()
+            self.shared = False
         self.variables[var] = Var(var, value, type_)
 
     def get_all_vars(self) -> List[Var]:
@@ -4,6 +4,9 @@ from sflkit.runners.run import (
     Runner,
     VoidRunner,
     PytestRunner,
+    PersistentPytestRunner,
+    ForkPytestRunner,
+    SessionPytestRunner,
     UnittestRunner,
     InputRunner,
 )
@@ -15,5 +18,8 @@ class RunnerType(enum.Enum):
 
     VOID_RUNNER = VoidRunner
     PYTEST_RUNNER = PytestRunner
+    PERSISTENT_PYTEST_RUNNER = PersistentPytestRunner
+    FORK_PYTEST_RUNNER = ForkPytestRunner
+    SESSION_PYTEST_RUNNER = SessionPytestRunner
     UNITTEST_RUNNER = UnittestRunner
     INPUT_RUNNER = InputRunner
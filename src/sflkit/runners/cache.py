@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from sflkit.runners.collection import hash_file, walk
+
+CACHE_VERSION = 1
+
+INDEX = "index.json"
+OBJECTS = "objects"
+SOURCE_SUFFIXES = (".py",)
+
+
+class ResultCache:
+    """
+    A content-addressed cache of the results and event files of tests across
+    runs. The entries are only valid for the sources they were produced from,
+    identified by a key hashing all python files of the instrumented subject,
+    including the tests, and the event mapping. Opening the cache with another
+    key invalidates all entries and removes the event files no longer needed.
+    Event files are stored by the hash of their content, such that tests
+    producing identical events share a single file.
+
+    Changes to other files the tests depend on, e.g., data files, are not
+    detected.
+    """
+
+    def __init__(self, path: os.PathLike, mapping: Optional[os.PathLike] = None):
+        self.path = Path(path)
+        self.mapping = Path(mapping) if mapping else None
+        self.key = None
+        self.entries: Dict[str, Dict] = dict()
+        self.lock = threading.Lock()
+        self.hits = 0
+
+    @property
+    def objects(self) -> Path:
+        return self.path / OBJECTS
+
+    def get_key(self, directory: Path) -> str:
+        key = hashlib.sha256()
+        if self.mapping is not None:
+            key.update(str(hash_file(self.mapping)).encode("utf8"))
+        directory = Path(directory)
+        files = walk(directory) if directory.is_dir() else [directory]
+        for f in files:
+            if f.suffix in SOURCE_SUFFIXES:
+                key.update(f"{f.relative_to(directory).as_posix()}:".encode("utf8"))
+                key.update(str(hash_file(f)).encode("utf8"))
+        return key.hexdigest()
+
+    def open(self, directory: Path):
+        self.key = self.get_key(directory)
+        self.entries = dict()
+        self.hits = 0
+        try:
+            with open(self.path / INDEX, "r") as fp:
+                index = json.load(fp)
+        except (OSError, ValueError):
+            index = dict()
+        if index.get("version") == CACHE_VERSION and index.get("key") == self.key:
+            self.entries = index["entries"]
+        else:
+            self.prune()
+
+    def prune(self):
+        """
+        Removes the event files that no entry refers to.
+        """
+        if not self.objects.exists():
+            return
+        used = {entry["object"] for entry in self.entries.values()}
+        for f in self.objects.iterdir():
+            if f.name not in used:
+                os.remove(f)
+
+    def save(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = self.path / (INDEX + ".tmp")
+        with self.lock, open(tmp, "w") as fp:
+            json.dump(
+                {"version": CACHE_VERSION, "key": self.key, "entries": self.entries},
+                fp,
+            )
+        os.replace(tmp, self.path / INDEX)
+
+    def get(self, test: str) -> Optional[Tuple[str, Optional[Path]]]:
+        """
+        Returns the result of the test and the path of its cached event file, or
+        None if the cache has no valid entry for the test.
+        """
+        with self.lock:
+            entry = self.entries.get(test)
+        if entry is None:
+            return None
+        obj = None
+        if entry["object"] is not None:
+            obj = self.objects / entry["object"]
+            if not obj.exists():
+                return None
+        self.hits += 1
+        return entry["result"], obj
+
+    def put(self, test: str, result: str, path: Optional[Path] = None):
+        obj = None
+        if path is not None and path.exists():
+            obj = hash_file(path)
+            target = self.objects / obj
+            if not target.exists():
+                self.objects.mkdir(parents=True, exist_ok=True)
+                tmp = target.with_name(f"{obj}.{threading.get_ident()}.tmp")
+                shutil.copyfile(path, tmp)
+                os.replace(tmp, target)
+        with self.lock:
+            self.entries[test] = {"result": result, "object": obj}
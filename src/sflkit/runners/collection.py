@@ -0,0 +1,124 @@
+import fnmatch
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+CACHE_VERSION = 1
+
+CONFIG_FILES = ("conftest.py", "pytest.ini", "pyproject.toml", "setup.cfg", "tox.ini")
+TEST_FILE_PATTERNS = ("test_*.py", "*_test.py")
+SKIPPED_DIRS = ("__pycache__", ".git", ".tox", ".venv", "venv", "node_modules")
+
+
+def hash_file(path: os.PathLike) -> Optional[str]:
+    try:
+        with open(path, "rb") as fp:
+            return hashlib.sha256(fp.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def walk(directory: Path):
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(
+            d for d in dirs if d not in SKIPPED_DIRS and not d.startswith(".")
+        )
+        for f in sorted(files):
+            yield Path(root, f)
+
+
+class CollectionCache:
+    """
+    A persistent cache of the tests collected by pytest. The cache is valid as
+    long as the arguments of the collection and all conftest and pytest config
+    files are unchanged. Inside a valid cache, only the test modules whose
+    content changed or that are new are collected again.
+
+    Changes to modules that are not test modules but affect the collection,
+    e.g., a helper generating parameters, are not detected.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.key = None
+        self.modules: Dict[str, Dict] = dict()
+
+    @staticmethod
+    def get_key(directory: Path, arguments: List[str]) -> str:
+        key = hashlib.sha256(json.dumps(arguments).encode("utf8"))
+        for f in walk(directory):
+            if f.name in CONFIG_FILES:
+                key.update(f"{f.relative_to(directory).as_posix()}:".encode("utf8"))
+                key.update(str(hash_file(f)).encode("utf8"))
+        return key.hexdigest()
+
+    @staticmethod
+    def find_test_modules(directory: Path, root: Path) -> Set[str]:
+        return {
+            f.relative_to(directory).as_posix()
+            for f in walk(root)
+            if any(fnmatch.fnmatch(f.name, pattern) for pattern in TEST_FILE_PATTERNS)
+        }
+
+    @staticmethod
+    def get_module(test: str) -> str:
+        return Path(test.split("::", 1)[0]).as_posix()
+
+    def load(self, key: str) -> bool:
+        self.key = key
+        self.modules = dict()
+        try:
+            with open(self.path, "r") as fp:
+                cache = json.load(fp)
+        except (OSError, ValueError):
+            return False
+        if cache.get("version") != CACHE_VERSION or cache.get("key") != key:
+            return False
+        self.modules = cache["modules"]
+        return True
+
+    def save(self):
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w") as fp:
+            json.dump(
+                {"version": CACHE_VERSION, "key": self.key, "modules": self.modules},
+                fp,
+            )
+        os.replace(tmp, self.path)
+
+    def get_changed(self, directory: Path, modules: Set[str]) -> Set[str]:
+        return {
+            module
+            for module in modules
+            if module not in self.modules
+            or self.modules[module]["hash"] != hash_file(directory / module)
+        }
+
+    def update(self, directory: Path, modules: Set[str], tests: List[str]):
+        for module in sorted(modules):
+            self.modules[module] = {
+                "hash": hash_file(directory / module),
+                "tests": list(),
+            }
+        for test in tests:
+            module = self.get_module(test)
+            if module not in self.modules:
+                self.modules[module] = {
+                    "hash": hash_file(directory / module),
+                    "tests": list(),
+                }
+            self.modules[module]["tests"].append(test)
+
+    def remove(self, modules: Set[str]):
+        for module in modules:
+            self.modules.pop(module, None)
+
+    def get_tests(self, modules: Optional[Set[str]] = None) -> List[str]:
+        return [
+            test
+            for module, entry in self.modules.items()
+            if modules is None or module in modules
+            for test in entry["tests"]
+        ]
@@ -0,0 +1,111 @@
+"""
+The input driver used by the sflkit input runner.
+
+This module is executed as a script inside the environment of the subject.
+Hence, it must only depend on the standard library and sflkitlib.
+"""
+import builtins
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from typing import List, Optional, Tuple
+
+ACCESS = os.path.abspath(sys.argv[1]) if __name__ == "__main__" else None
+
+if __name__ == "__main__":
+    sys.path[0] = os.path.dirname(ACCESS)
+
+# the drivers share their helpers, which are not on the path of the subject
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from sflkit_driver import (
+    dump_events,
+    open_protocol,
+    rotate_events,
+)
+
+del sys.path[0]
+
+
+def open_output(path: Optional[str]):
+    if path is None:
+        return io.StringIO()
+    return open(path, "w")
+
+
+def get_value(output) -> Optional[str]:
+    if isinstance(output, io.StringIO):
+        return output.getvalue()
+    return None
+
+
+def get_returncode(code) -> int:
+    if code is None:
+        return 0
+    elif isinstance(code, int):
+        return code
+    else:
+        print(code, file=sys.stderr)
+        return 1
+
+
+def execute(
+    code, args: List[str], stdout: Optional[str] = None, stderr: Optional[str] = None
+) -> Tuple[int, Optional[str], Optional[str]]:
+    """
+    Executes the compiled access script as __main__ with the given arguments,
+    like a fresh interpreter would, and returns the exit code and the outputs
+    if they are not written to files.
+    """
+    sys.argv = [ACCESS] + args
+    with open_output(stdout) as out, open_output(stderr) as err:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                exec(
+                    code,
+                    {
+                        "__name__": "__main__",
+                        "__file__": ACCESS,
+                        "__builtins__": builtins,
+                    },
+                )
+                returncode = 0
+            except SystemExit as e:
+                returncode = get_returncode(e.code)
+            except BaseException as e:
+                traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+                returncode = 1
+            sys.stdout.flush()
+            sys.stderr.flush()
+        return returncode, get_value(out), get_value(err)
+
+
+def serve():
+    protocol = open_protocol()
+    with open(ACCESS, "r") as fp:
+        code = compile(fp.read(), ACCESS, "exec")
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        rotate_events(request["events"])
+        start = time.process_time()
+        returncode, stdout, stderr = execute(
+            code, request["args"], request.get("stdout"), request.get("stderr")
+        )
+        dump_events()
+        response = {
+            "returncode": returncode,
+            "cpu": time.process_time() - start,
+            "stdout": stdout,
+            "stderr": stderr,
+        }
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+MANIFEST = "manifest.jsonl"
+
+_record = threading.local()
+
+
+class Record:
+    """
+    The measurements of the test that is currently executed by a thread. The
+    runners and their helpers fill in what they observe, e.g., the exit code
+    or cpu time of the process executing the test.
+    """
+
+    def __init__(self):
+        self.returncode: Optional[int] = None
+        self.cpu: Optional[float] = None
+        self.timeout = False
+
+    def update(
+        self,
+        returncode: Optional[int] = None,
+        cpu: Optional[float] = None,
+        timeout: Optional[bool] = None,
+    ):
+        if returncode is not None:
+            self.returncode = returncode
+        if cpu is not None:
+            self.cpu = cpu
+        if timeout is not None:
+            self.timeout = timeout
+
+
+def begin() -> Record:
+    _record.current = Record()
+    return _record.current
+
+
+def record(
+    returncode: Optional[int] = None,
+    cpu: Optional[float] = None,
+    timeout: Optional[bool] = None,
+):
+    current = getattr(_record, "current", None)
+    if current is not None:
+        current.update(returncode=returncode, cpu=cpu, timeout=timeout)
+
+
+def end() -> Record:
+    current = getattr(_record, "current", None) or Record()
+    _record.current = None
+    return current
+
+
+class Manifest:
+    """
+    A JSON lines file with one entry per executed test, that maps the test to
+    its event file and records its result, wall and cpu time in seconds,
+    whether it timed out, its exit code, and the size of its event file.
+    """
+
+    def __init__(self, path: os.PathLike, append: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        incomplete = False
+        if append and self.path.exists() and self.path.stat().st_size:
+            with open(self.path, "rb") as fp:
+                fp.seek(-1, os.SEEK_END)
+                incomplete = fp.read(1) != b"\n"
+        self._file_pointer = open(self.path, "a" if append else "w")
+        if incomplete:
+            # terminate the last entry of an interrupted run
+            self._file_pointer.write("\n")
+
+    def write(
+        self,
+        test: str,
+        result: str,
+        file: Optional[str] = None,
+        wall: Optional[float] = None,
+        cpu: Optional[float] = None,
+        timeout: bool = False,
+        returncode: Optional[int] = None,
+        size: Optional[int] = None,
+    ):
+        entry = {
+            "test": test,
+            "result": result,
+            "file": file,
+            "wall": wall,
+            "cpu": cpu,
+            "timeout": timeout,
+            "returncode": returncode,
+            "size": size,
+        }
+        with self.lock:
+            self._file_pointer.write(json.dumps(entry) + "\n")
+            self._file_pointer.flush()
+
+    def close(self):
+        self._file_pointer.close()
+
+    @staticmethod
+    def latest(path: os.PathLike) -> Dict[str, Dict]:
+        """
+        Returns the last entry of each test.
+        """
+        return {entry["test"]: entry for entry in Manifest.read(path)}
+
+    @staticmethod
+    def read(path: os.PathLike) -> Iterator[Dict]:
+        with open(path, "r") as fp:
+            for line in fp:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # an entry of an interrupted run
+                        continue
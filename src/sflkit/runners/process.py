@@ -0,0 +1,139 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+from sflkit.logger import LOGGER
+from sflkit.runners.manifest import record
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+POSIX = os.name == "posix"
+
+
+def get_limits(memory: Optional[int] = None, cpu: Optional[int] = None) -> Dict:
+    """
+    Returns the resource limits for a memory limit in megabytes, i.e., the
+    address space, and a cpu time limit in seconds. Limits above the hard limits
+    of this process, which the children inherit, are lowered to them.
+    """
+    limits = dict()
+    if resource is None:
+        if memory or cpu:
+            LOGGER.warning("resource limits are not supported on this platform")
+        return limits
+    if memory:
+        limits[resource.RLIMIT_AS] = memory * 1024 * 1024
+    if cpu:
+        limits[resource.RLIMIT_CPU] = cpu
+    for limit, value in limits.items():
+        _, hard = resource.getrlimit(limit)
+        if hard != resource.RLIM_INFINITY and value > hard:
+            LOGGER.warning(f"resource limit {value} exceeds hard limit {hard}")
+            limits[limit] = hard
+    return limits
+
+
+def without_cpu(limits: Dict) -> Dict:
+    """
+    Returns the limits without the cpu time, which must not be applied to
+    processes executing more than one test.
+    """
+    if resource is None:
+        return dict()
+    return {
+        limit: value for limit, value in limits.items() if limit != resource.RLIMIT_CPU
+    }
+
+
+# sets the limits and replaces itself with the command, such that the limits
+# apply before the command executes without a preexec_fn, which is not safe
+# when the runner executes tests from several threads
+LIMITS_SHIM = (
+    "import json, os, resource, sys\n"
+    "for limit, value in json.loads(sys.argv[1]):\n"
+    "    resource.setrlimit(limit, (value, value))\n"
+    "os.execvp(sys.argv[2], sys.argv[2:])\n"
+)
+
+
+def with_limits(args: List[str], limits: Dict) -> List[str]:
+    return [
+        sys.executable,
+        "-E",
+        "-S",
+        "-c",
+        LIMITS_SHIM,
+        json.dumps(list(limits.items())),
+    ] + list(args)
+
+
+def kill_group(process: subprocess.Popen):
+    """
+    Kills the process and all processes it started in its session.
+    """
+    if POSIX:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    if process.poll() is None:
+        process.kill()
+
+
+def open_process(args: List[str], limits: Optional[Dict] = None, **kwargs):
+    if limits:
+        args = with_limits(args, limits)
+    return _Popen(args, start_new_session=POSIX, **kwargs)
+
+
+class _Popen(subprocess.Popen):
+    """
+    A Popen that keeps the resource usage of the child when it is reaped.
+    """
+
+    rusage = None
+
+    def _try_wait(self, wait_flags):
+        if not hasattr(os, "wait4"):
+            return super()._try_wait(wait_flags)
+        try:
+            pid, sts, rusage = os.wait4(self.pid, wait_flags)
+        except ChildProcessError:
+            return self.pid, 0
+        if pid == self.pid:
+            self.rusage = rusage
+        return pid, sts
+
+
+def run_process(
+    args: List[str], timeout: float = None, limits: Optional[Dict] = None, **kwargs
+) -> subprocess.CompletedProcess:
+    """
+    Works like subprocess.run, but starts the process in a new session with the
+    given resource limits and kills the whole session when the process timed
+    out or finished. It records the exit code, the cpu time, and whether the
+    process timed out for the current test.
+    """
+    with open_process(args, limits, **kwargs) as process:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            kill_group(process)
+            process.communicate()
+            record(timeout=True)
+            raise
+        except BaseException:
+            kill_group(process)
+            raise
+        kill_group(process)
+    cpu = None
+    if process.rusage is not None:
+        cpu = process.rusage.ru_utime + process.rusage.ru_stime
+    record(returncode=process.returncode, cpu=cpu)
+    return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
@@ -0,0 +1,259 @@
+"""
+The pytest plugin and drivers used by the sflkit runners.
+
+This module is executed as a script inside the environment of the subject.
+Hence, it must only depend on the standard library, pytest, and sflkitlib.
+"""
+import json
+import os
+import select
+import shutil
+import signal
+import sys
+import time
+
+if __name__ == "__main__":
+    sys.path[0] = os.getcwd()
+
+import pytest
+
+# the drivers share their helpers, which are not on the path of the subject
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from sflkit_driver import (
+    EVENTS_PATH,
+    FAILING,
+    PASSING,
+    UNDEFINED,
+    dump_events,
+    open_protocol,
+    rotate_events,
+    silence_stdout,
+)
+
+del sys.path[0]
+
+SERVE = "serve"
+SESSION = "session"
+FORK = "fork"
+
+
+def get_result(reports) -> str:
+    passing, failing = 0, 0
+    for report in reports:
+        if report.when != "call" or hasattr(report, "wasxfail"):
+            continue
+        if report.passed:
+            passing += 1
+        elif report.failed:
+            failing += 1
+    if passing > 0 and failing == 0:
+        return PASSING
+    elif failing > 0 and passing == 0:
+        return FAILING
+    else:
+        return UNDEFINED
+
+
+class ResultCollector:
+    def __init__(self):
+        self.reports = list()
+
+    def pytest_runtest_logreport(self, report):
+        self.reports.append(report)
+
+    def get_result(self) -> str:
+        return get_result(self.reports)
+
+
+class EventSplitter:
+    def __init__(self, tests: dict, events: str, output: str, results: str):
+        self.tests = tests
+        self.events = events
+        self.output = output
+        self.results = open(results, "w")
+        self.test = None
+        self.reports = list()
+        self.count = 0
+        self.start = None
+
+    def get_test(self, item) -> str:
+        path = getattr(item, "path", None) or item.fspath
+        test = os.path.relpath(str(path), os.getcwd())
+        if "::" in item.nodeid:
+            test += "::" + item.nodeid.split("::", 1)[1]
+        return test
+
+    def get_events_path(self) -> str:
+        return os.path.join(self.events, f"{EVENTS_PATH}_{self.count}")
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        self.test = self.get_test(item)
+        self.reports = list()
+        self.start = time.perf_counter(), time.process_time()
+        rotate_events(self.get_events_path())
+
+    def pytest_runtest_logreport(self, report):
+        self.reports.append(report)
+        if report.when == "teardown":
+            self.finish()
+
+    def finish(self):
+        dump_events()
+        wall = time.perf_counter() - self.start[0]
+        cpu = time.process_time() - self.start[1]
+        result = get_result(self.reports)
+        events = self.get_events_path()
+        if self.test in self.tests and os.path.exists(events):
+            name = os.path.join(self.output, result.lower(), self.tests[self.test])
+            shutil.move(events, name)
+        self.results.write(
+            json.dumps({"test": self.test, "result": result, "wall": wall, "cpu": cpu})
+            + "\n"
+        )
+        self.results.flush()
+        self.test = None
+        self.count += 1
+
+    def pytest_sessionfinish(self):
+        self.results.close()
+
+
+def session(tests: str, events: str, output: str, results: str):
+    with open(tests, "r") as fp:
+        tests = {
+            request["test"]: request["name"]
+            for request in map(json.loads, filter(str.strip, fp))
+        }
+    silence_stdout()
+    pytest.main(list(tests), plugins=[EventSplitter(tests, events, output, results)])
+
+
+def run_test(test: str, events: str) -> dict:
+    rotate_events(events)
+    collector = ResultCollector()
+    start = time.process_time()
+    try:
+        returncode = int(pytest.main([test], plugins=[collector]))
+        result = collector.get_result()
+    except BaseException:
+        returncode, result = None, UNDEFINED
+    dump_events()
+    return {
+        "result": result,
+        "returncode": returncode,
+        "cpu": time.process_time() - start,
+    }
+
+
+def requests():
+    for line in sys.stdin:
+        if line.strip():
+            yield json.loads(line)
+
+
+def serve():
+    protocol = open_protocol()
+    for request in requests():
+        response = run_test(request["test"], request["events"])
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+
+
+def set_group(pid: int):
+    try:
+        os.setpgid(pid, pid)
+    except OSError:
+        pass
+
+
+def kill_group(pid: int):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def set_limits(limits: list):
+    import resource
+
+    for limit, value in limits:
+        try:
+            resource.setrlimit(limit, (value, value))
+        except (OSError, ValueError):
+            pass
+
+
+def run_forked(
+    test: str, events: str, timeout: float = None, limits: list = None
+) -> dict:
+    """
+    Executes the test in a forked child, that leads its own process group, such
+    that the child and all processes it started are killed afterward.
+    """
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read)
+        response = {"result": UNDEFINED}
+        try:
+            set_group(0)
+            set_limits(limits or [])
+            response = run_test(test, events)
+        finally:
+            os.write(write, json.dumps(response).encode("utf8") + b"\n")
+            os._exit(0)
+    os.close(write)
+    set_group(pid)
+    with os.fdopen(read, "rb") as child:
+        ready, _, _ = select.select([child], [], [], timeout)
+        if ready:
+            try:
+                response = json.loads(child.readline())
+            except ValueError:
+                response = {"result": UNDEFINED}
+        else:
+            response = {"result": UNDEFINED, "timeout": True}
+    kill_group(pid)
+    _, _, rusage = os.wait4(pid, 0)
+    response["cpu"] = rusage.ru_utime + rusage.ru_stime
+    if response["result"] not in (PASSING, FAILING):
+        response["result"] = UNDEFINED
+    return response
+
+
+def fork():
+    """
+    A fork server: The first request lists the test modules to preload, which
+    imports pytest and the instrumented project once. Each following test is
+    executed in a forked child, that shares the preloaded modules with the
+    server, while the server enforces the timeout of the test.
+    """
+    protocol = open_protocol()
+    requests_ = requests()
+    preload = next(requests_, {})
+    limits = preload.get("limits", [])
+    preload = preload.get("preload", [])
+    if preload:
+        try:
+            pytest.main(["--collect-only", "-q"] + preload)
+        except BaseException:
+            pass
+    dump_events()
+    protocol.write(json.dumps({"ready": True}) + "\n")
+    protocol.flush()
+    for request in requests_:
+        response = run_forked(
+            request["test"], request["events"], request.get("timeout"), limits
+        )
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    if sys.argv[1] == SERVE:
+        serve()
+    elif sys.argv[1] == FORK:
+        fork()
+    elif sys.argv[1] == SESSION:
+        session(*sys.argv[2:6])
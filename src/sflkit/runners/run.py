@@ -1,15 +1,35 @@
 import abc
+import contextlib
 import enum
 import hashlib
+import json
 import os
+import queue
 import re
+import select
 import shutil
 import string
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple, Set
 
 from sflkit.logger import LOGGER
+from sflkit.model.compression import check_compression, compress
+from sflkit.runners import manifest
+from sflkit.runners.cache import ResultCache
+from sflkit.runners.collection import CollectionCache
+from sflkit.runners.manifest import Manifest, MANIFEST
+from sflkit.runners.process import (
+    get_limits,
+    kill_group,
+    open_process,
+    run_process,
+    without_cpu,
+)
+from sflkit.runners.schedule import History
+from sflkit.runners.shard import Shard, get_shard, write_shard
 
 Environment = Dict[str, str]
 
@@ -23,6 +43,14 @@ PYTEST_RESULT_PATTERN = re.compile(
 )
 
 DEFAULT_TIMEOUT = 10
+DEFAULT_WORKERS = 1
+
+EVENTS_PATH = "EVENTS_PATH"
+QUARANTINE = "quarantine"
+
+PYTEST_PLUGIN = Path(__file__).parent / "pytest_plugin.py"
+UNITTEST_PLUGIN = Path(__file__).parent / "unittest_plugin.py"
+INPUT_PLUGIN = Path(__file__).parent / "input_plugin.py"
 
 
 class TestResult(enum.Enum):
@@ -35,9 +63,23 @@ class TestResult(enum.Enum):
 
 
 class Runner(abc.ABC):
-    def __init__(self, re_filter: str = r".*", timeout=DEFAULT_TIMEOUT):
+    def __init__(
+        self,
+        re_filter: str = r".*",
+        timeout=DEFAULT_TIMEOUT,
+        workers: int = DEFAULT_WORKERS,
+    ):
         self.timeout = timeout
+        self.workers = max(1, workers)
         self.re_filter = re.compile(re_filter)
+        self.collector = None
+        self.manifest: Optional[Manifest] = None
+        self.history: Optional[History] = None
+        self.results: Optional[ResultCache] = None
+        self.timeouts: Dict[str, float] = dict()
+        self.limits: Dict[int, int] = dict()
+        self.compression: Optional[str] = None
+        self.compression_level: Optional[int] = None
         self.passing_tests = set()
         self.failing_tests = set()
         self.undefined_tests = set()
@@ -62,6 +104,35 @@ class Runner(abc.ABC):
     ) -> TestResult:
         return TestResult.UNDEFINED
 
+    def set_limits(self, memory: Optional[int] = None, cpu: Optional[int] = None):
+        """
+        Limits the memory in megabytes and the cpu time in seconds of each test.
+        Runners executing several tests in one process only limit the memory.
+        """
+        self.limits = get_limits(memory, cpu)
+
+    def set_compression(self, compression: Optional[str], level: Optional[int] = None):
+        """
+        Compresses the event files with gzip or zstd when they are stored.
+        """
+        if compression is not None:
+            check_compression(compression)
+        self.compression = compression
+        self.compression_level = level
+
+    def store_events(self, events_path: Path, path: Path):
+        if self.compression is None:
+            shutil.move(events_path, path)
+            return
+        tmp = path.with_name(path.name + ".tmp")
+        compress(events_path, tmp, self.compression, self.compression_level)
+        os.replace(tmp, path)
+        if events_path != path:
+            os.remove(events_path)
+
+    def get_timeout(self, test: str) -> float:
+        return self.timeouts.get(test, self.timeout)
+
     def filter_tests(self, tests: List[str]) -> List[str]:
         return list(filter(self.re_filter.search, tests))
 
@@ -76,6 +147,142 @@ class Runner(abc.ABC):
                 s = s.replace(c, "_")
         return s
 
+    def get_events_path(self, directory: Path, worker: int = 0) -> Path:
+        if self.workers > 1:
+            return directory.absolute() / f"{EVENTS_PATH}_{worker}"
+        else:
+            return directory.absolute() / EVENTS_PATH
+
+    @staticmethod
+    def get_environ(environ: Environment, events_path: Path) -> Environment:
+        environ = dict(os.environ if environ is None else environ)
+        environ[EVENTS_PATH] = str(events_path)
+        return environ
+
+    def run_single_test(
+        self,
+        directory: Path,
+        output: Path,
+        test: str,
+        worker: int = 0,
+        environ: Environment = None,
+    ) -> TestResult:
+        events_path = self.get_events_path(directory, worker)
+        if events_path.exists():
+            os.remove(events_path)
+        stream = None
+        if self.collector is not None:
+            stream = self.collector.open(events_path, worker)
+        manifest.begin()
+        start = time.perf_counter()
+        test_result = self.run_test(
+            directory, test, environ=self.get_environ(environ, events_path)
+        )
+        wall = time.perf_counter() - start
+        record = manifest.end()
+        path = output / test_result.get_dir() / self.safe(test)
+        if stream is not None:
+            test_result = self.collector.close(stream, path, test_result)
+            path = None
+        elif events_path.exists():
+            if record.timeout:
+                # the events of a killed test are incomplete
+                path = output / QUARANTINE / self.safe(test)
+                path.parent.mkdir(parents=True, exist_ok=True)
+            self.store_events(events_path, path)
+        else:
+            path = None
+        self.tests[test_result].add(test)
+        if stream is None:
+            self.cache_result(test, test_result, path, record)
+        self.write_manifest(test, test_result, path, wall, record)
+        return test_result
+
+    def cache_result(
+        self,
+        test: str,
+        test_result: TestResult,
+        path: Optional[Path],
+        record: manifest.Record,
+    ):
+        # timeouts and undefined results, e.g., crashes, may be transient
+        if (
+            self.results is not None
+            and not record.timeout
+            and test_result != TestResult.UNDEFINED
+        ):
+            self.results.put(test, test_result.value, path)
+
+    def restore_cached(self, output: Path, tests: List[str]) -> List[str]:
+        """
+        Restores the results and event files of the tests found in the result
+        cache and returns the tests that still need to be executed.
+        """
+        for test_result in TestResult:
+            (output / test_result.get_dir()).mkdir(parents=True, exist_ok=True)
+        remaining = list()
+        for test in tests:
+            cached = self.results.get(test)
+            if cached is None:
+                remaining.append(test)
+                continue
+            result, obj = cached
+            test_result = TestResult(result)
+            path = None
+            if obj is not None:
+                path = output / test_result.get_dir() / self.safe(test)
+                shutil.copyfile(obj, path)
+            self.tests[test_result].add(test)
+            self.write_manifest(test, test_result, path)
+        return remaining
+
+    def get_completed(self, output: Path, tests: List[str]) -> Dict[str, TestResult]:
+        """
+        Returns the results of the tests that the manifest in the output records
+        as completed. Tests that timed out or whose event file is missing or
+        differs from the recorded size are not completed.
+        """
+        if self.collector is not None or not (output / MANIFEST).exists():
+            return dict()
+        entries = Manifest.latest(output / MANIFEST)
+        completed = dict()
+        for test in tests:
+            entry = entries.get(test)
+            if entry is None or entry.get("timeout"):
+                continue
+            if entry.get("file") is not None:
+                path = output / entry["file"]
+                if not path.exists() or path.stat().st_size != entry.get("size"):
+                    continue
+            completed[test] = TestResult(entry["result"])
+        return completed
+
+    def write_manifest(
+        self,
+        test: str,
+        test_result: TestResult,
+        path: Optional[Path] = None,
+        wall: Optional[float] = None,
+        record: Optional[manifest.Record] = None,
+    ):
+        if self.manifest is None:
+            return
+        record = record or manifest.Record()
+        file, size = None, None
+        if path is not None and path.exists():
+            file = f"{path.parent.name}/{path.name}"
+            size = path.stat().st_size
+        self.manifest.write(
+            test,
+            test_result.value,
+            file=file,
+            wall=wall,
+            cpu=record.cpu,
+            timeout=record.timeout,
+            returncode=record.returncode,
+            size=size,
+        )
+
     def run_tests(
         self,
         directory: Path,
@@ -86,14 +293,25 @@ class Runner(abc.ABC):
         output.mkdir(parents=True, exist_ok=True)
         for test_result in TestResult:
             (output / test_result.get_dir()).mkdir(parents=True, exist_ok=True)
-        for run_id, test in enumerate(tests):
-            test_result = self.run_test(directory, test, environ=environ)
-            self.tests[test_result].add(test)
-            if os.path.exists(directory / "EVENTS_PATH"):
-                shutil.move(
-                    directory / "EVENTS_PATH",
-                    output / test_result.get_dir() / self.safe(test),
-                )
+        if self.workers > 1:
+            workers = queue.Queue()
+            for worker in range(self.workers):
+                workers.put(worker)
+
+            def run_in_worker(test: str) -> TestResult:
+                worker = workers.get()
+                try:
+                    return self.run_single_test(
+                        directory, output, test, worker=worker, environ=environ
+                    )
+                finally:
+                    workers.put(worker)
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                list(executor.map(run_in_worker, tests))
+        else:
+            for test in tests:
+                self.run_single_test(directory, output, test, environ=environ)
 
     def run(
         self,
@@ -103,24 +321,167 @@ class Runner(abc.ABC):
         base: Optional[os.PathLike] = None,
         environ: Environment = None,
         k: str = None,
+        history: Optional[os.PathLike] = None,
+        resume: bool = False,
+        results: Optional[ResultCache] = None,
+        shard: Optional[Shard] = None,
     ):
+        """
+        If a history is given, the tests are scheduled longest first and get
+        timeouts derived from their past durations in the history, which is
+        extended by the manifest of this run afterward.
+
+        If resume is set, the tests that the manifest in the output records as
+        completed, with their event files intact, are not executed again.
+
+        If a result cache is given, the tests with a valid entry in the cache are
+        not executed, but their results and event files are restored from it.
+
+        If a shard (i, N) is given, only the i-th of N disjoint partitions of the
+        tests, assigned by the hashes of their ids, is executed.
+        """
         self.passing_tests.clear()
         self.failing_tests.clear()
         self.undefined_tests.clear()
-        self.run_tests(
-            directory,
-            output,
-            self.filter_tests(
-                self.get_tests(directory, files=files, base=base, environ=environ, k=k)
-            ),
-            environ=environ,
+        tests = self.filter_tests(
+            self.get_tests(directory, files=files, base=base, environ=environ, k=k)
         )
+        if history:
+            self.history = History.load(history)
+        if shard:
+            write_shard(output, tests, shard)
+            tests = get_shard(tests, shard)
+            LOGGER.info(f"running {len(tests)} tests of shard {shard[0]}/{shard[1]}")
+        if resume:
+            completed = self.get_completed(output, tests)
+            LOGGER.info(f"resuming after {len(completed)} completed tests")
+            for test, test_result in completed.items():
+                self.tests[test_result].add(test)
+            tests = [test for test in tests if test not in completed]
+        self.manifest = Manifest(output / MANIFEST, append=resume)
+        if results is not None and self.collector is None:
+            results.open(directory)
+            self.results = results
+        try:
+            if self.results is not None:
+                tests = self.restore_cached(output, tests)
+                LOGGER.info(f"restored {results.hits} tests from the result cache")
+            if self.history is not None:
+                tests = self.history.schedule(tests)
+                self.timeouts = {
+                    test: self.history.get_timeout(test, self.timeout) for test in tests
+                }
+            self.run_tests(directory, output, tests, environ=environ)
+        finally:
+            if self.results is not None:
+                self.results.save()
+                self.results = None
+            self.manifest.close()
+            self.manifest = None
+            self.history = None
+            self.timeouts = dict()
+        if history:
+            with open(output / MANIFEST, "r") as src, open(history, "a") as dst:
+                shutil.copyfileobj(src, dst)
 
 
 class VoidRunner(Runner):
     pass
 
 
+class WorkerProcess:
+    def __init__(
+        self,
+        args: List[str],
+        directory: Path,
+        environ: Environment = None,
+        limits: Optional[Dict[int, int]] = None,
+    ):
+        self.args = args
+        self.directory = directory
+        self.environ = environ
+        self.limits = limits
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self):
+        self.process = open_process(
+            self.args,
+            self.limits,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=self.environ,
+            cwd=self.directory,
+        )
+
+    def stop(self):
+        if self.process is not None:
+            kill_group(self.process)
+            self.process.wait()
+            self.process = None
+
+    def request(self, message: Dict, timeout: float = None) -> Optional[Dict]:
+        if self.process is None or self.process.poll() is not None:
+            self.start()
+            if self.process is None:
+                return None
+        return self.send(message, timeout=timeout)
+
+    def send(self, message: Dict, timeout: float = None) -> Optional[Dict]:
+        try:
+            self.process.stdin.write(json.dumps(message).encode("utf8") + b"\n")
+            self.process.stdin.flush()
+        except OSError:
+            self.stop()
+            return None
+        ready, _, _ = select.select([self.process.stdout], [], [], timeout)
+        if not ready:
+            LOGGER.info(f"worker {self.process.pid} timed out, restarting it")
+            manifest.record(timeout=True)
+            self.stop()
+            return None
+        response = self.process.stdout.readline()
+        if not response:
+            self.stop()
+            return None
+        response = json.loads(response)
+        manifest.record(
+            returncode=response.get("returncode"),
+            cpu=response.get("cpu"),
+            timeout=response.get("timeout"),
+        )
+        return response
+
+
+class ForkServer(WorkerProcess):
+    def __init__(
+        self,
+        modules: List[str],
+        directory: Path,
+        environ: Environment = None,
+        timeout: float = None,
+        limits: Optional[Dict[int, int]] = None,
+    ):
+        super().__init__(
+            ["python3", str(PYTEST_PLUGIN), "fork"],
+            directory,
+            environ,
+            without_cpu(limits or dict()),
+        )
+        self.modules = modules
+        self.timeout = timeout
+        self.child_limits = limits or dict()
+
+    def start(self):
+        super().start()
+        message = {
+            "preload": self.modules,
+            "limits": list(map(list, self.child_limits.items())),
+        }
+        if self.send(message, timeout=self.timeout) is None:
+            LOGGER.info("fork server failed to preload the test modules")
+
+
 class PytestStructure:
     def __init__(self, name: str, parent: Optional["PytestStructure"] = None):
         self.name = name
@@ -256,31 +617,81 @@ class Function(PytestStructure):
         return "::"
 
 
+class PathIndex:
+    """
+    An index of the test files of collected tests. Each distinct test file is
+    resolved once against the candidate bases, i.e., the prefixes of a
+    directory, and all existence checks are memoized, such that normalizing
+    many tests only touches the file system once per test file and base.
+    """
+
+    def __init__(self, tests: List[str]):
+        self.leaves: Dict[str, Path] = dict()
+        for test in tests:
+            path = test.split("::", 1)[0]
+            if path not in self.leaves:
+                self.leaves[path] = Path(path)
+        self.exists: Dict[Path, bool] = dict()
+
+    def path_exists(self, path: Path) -> bool:
+        if path not in self.exists:
+            self.exists[path] = path.exists()
+        return self.exists[path]
+
+    @staticmethod
+    def get_candidates(directory: Path) -> List[Path]:
+        parts = directory.parts
+        return [Path(*parts[:i]) for i in range(len(parts), 0, -1)]
+
+    def get_base(self, directory: Path, leaf: Path) -> Optional[Path]:
+        """
+        Returns the deepest prefix of the directory that contains the leaf.
+        """
+        for base in self.get_candidates(directory):
+            if self.path_exists(base / leaf):
+                return base
+        return None
+
+    def resolve(self, directories: List[Path]) -> Dict[str, Optional[Path]]:
+        """
+        Returns for each leaf the base of the first directory that contains it.
+        """
+        bases = dict()
+        for path, leaf in self.leaves.items():
+            bases[path] = None
+            for directory in directories:
+                base = self.get_base(directory, leaf)
+                if base is not None:
+                    bases[path] = base
+                    break
+        return bases
+
+    def common_base(self, directory: Path) -> Optional[Path]:
+        """
+        Returns the deepest prefix of the directory that contains all leaves.
+        """
+        for base in self.get_candidates(directory):
+            if all(self.path_exists(base / leaf) for leaf in self.leaves.values()):
+                return base
+        return None
+
+
 class PytestRunner(Runner):
     def __init__(
         self,
         re_filter: str = r".*",
         timeout=DEFAULT_TIMEOUT,
         set_python_path: bool = False,
+        workers: int = DEFAULT_WORKERS,
+        collection_cache: bool = False,
     ):
-        super().__init__(re_filter, timeout)
+        super().__init__(re_filter, timeout, workers)
         self.set_python_path = set_python_path
+        self.collection_cache = collection_cache
 
     @staticmethod
-    def common_base(directory: Path, tests: List[str]) -> Path:
-        parts = directory.parts
-        common_bases = {Path(*parts[:i]) for i in range(1, len(parts) + 1)}
-        leaves_paths = {Path(r.split("::", 1)[0] if "::" in r else r) for r in tests}
-        common_bases = set(
-            filter(
-                lambda p: all(map(lambda r: Path(p, *r.parts).exists(), leaves_paths)),
-                common_bases,
-            )
-        )
-        for cb in common_bases:
-            return cb
-        else:
-            return None
+    def common_base(directory: Path, tests: List[str]) -> Optional[Path]:
+        return PathIndex(tests).common_base(directory)
 
     @staticmethod
     def common_path(files: List[str]) -> Optional[Path]:
@@ -329,37 +740,52 @@ class PytestRunner(Runner):
         result = tests
 
         if directory:
+            index = PathIndex(tests)
             if files:
-                result = []
-                for r in tests:
-                    for f in files:
-                        base = PytestRunner.common_base(f, [r])
-                        if base is not None:
-                            path, test = r.split("::", 1)
-                            result.append(
-                                str((base / path).relative_to(directory)) + "::" + test
-                            )
-                            break
+                bases = index.resolve(sorted(files))
             else:
-                base = PytestRunner.common_base(directory, tests)
+                base = index.common_base(directory)
                 if base is None and root_dir:
-                    base = PytestRunner.common_base(root_dir, tests)
+                    base = index.common_base(root_dir)
                 if base is None and root_dir is not None:
-                    result = []
-                    for r in tests:
-                        path, test = r.split("::", 1)
-                        result.append(
-                            str((root_dir / path).relative_to(directory)) + "::" + test
-                        )
-                elif base is not None:
-                    result = []
-                    for r in tests:
-                        path, test = r.split("::", 1)
-                        result.append(
-                            str((base / path).relative_to(directory)) + "::" + test
-                        )
+                    base = root_dir
+                bases = None if base is None else dict.fromkeys(index.leaves, base)
+            if bases is not None:
+                paths = {
+                    path: str((base / path).relative_to(directory))
+                    for path, base in bases.items()
+                    if base is not None
+                }
+                result = []
+                for r in tests:
+                    path, test = r.split("::", 1)
+                    if path in paths:
+                        result.append(paths[path] + "::" + test)
         return result
 
+    @staticmethod
+    def get_cache_path(directory: Path) -> Path:
+        directory = directory.absolute()
+        return directory.parent / f".{directory.name}.collection.json"
+
+    def get_test_modules(
+        self,
+        directory: Path,
+        files: Optional[List[str]] = None,
+        base: Optional[os.PathLike] = None,
+    ) -> Set[str]:
+        if not files:
+            return CollectionCache.find_test_modules(
+                directory, directory / (base or "")
+            )
+        modules = set()
+        for f in self.get_absolute_files(self.get_files(files), directory):
+            if f.is_dir():
+                modules |= CollectionCache.find_test_modules(directory, f)
+            else:
+                modules.add(f.relative_to(directory).as_posix())
+        return modules
+
     def get_tests(
         self,
         directory: Path,
@@ -367,6 +793,44 @@ class PytestRunner(Runner):
         base: Optional[os.PathLike] = None,
         environ: Environment = None,
         k: str = None,
+    ) -> List[str]:
+        if not self.collection_cache:
+            return self.collect_tests(directory, files, base, environ, k)
+        directory = directory.absolute()
+        if isinstance(files, (str, os.PathLike)):
+            files = [files]
+        str_files = [str(f) for f in files] if files else None
+        cache = CollectionCache(self.get_cache_path(directory))
+        key = cache.get_key(directory, [str_files, str(base) if base else None, k])
+        if not cache.load(key):
+            tests = self.collect_tests(directory, files, base, environ, k)
+            cache.update(
+                directory, self.get_test_modules(directory, str_files, base), tests
+            )
+            cache.save()
+            return tests
+        modules = self.get_test_modules(directory, str_files, base)
+        if not str_files:
+            modules |= set(cache.modules)
+        removed = {module for module in modules if not (directory / module).exists()}
+        modules -= removed
+        cache.remove(removed)
+        changed = cache.get_changed(directory, modules)
+        if changed:
+            LOGGER.info(f"collecting {len(changed)} changed test modules")
+            tests = self.collect_tests(directory, sorted(changed), base, environ, k)
+            cache.update(directory, changed, tests)
+        if changed or removed:
+            cache.save()
+        return cache.get_tests(modules)
+
+    def collect_tests(
+        self,
+        directory: Path,
+        files: Optional[List[os.PathLike] | os.PathLike] = None,
+        base: Optional[os.PathLike] = None,
+        environ: Environment = None,
+        k: str = None,
     ) -> List[str]:
         c = []
         directory = directory.absolute()
@@ -425,12 +889,13 @@ class PytestRunner(Runner):
         self, directory: Path, test: str, environ: Environment = None
     ) -> TestResult:
         try:
-            output = subprocess.run(
+            output = run_process(
                 ["python3", "-m", "pytest", test],
                 stdout=subprocess.PIPE,
                 env=environ,
                 cwd=directory,
-                timeout=self.timeout,
+                timeout=self.get_timeout(test),
+                limits=self.limits,
             ).stdout
         except subprocess.TimeoutExpired:
             return TestResult.UNDEFINED
@@ -446,8 +911,273 @@ class PytestRunner(Runner):
             return TestResult.UNDEFINED
 
 
+class PersistentPytestRunner(PytestRunner):
+    def __init__(
+        self,
+        re_filter: str = r".*",
+        timeout=DEFAULT_TIMEOUT,
+        set_python_path: bool = False,
+        workers: int = DEFAULT_WORKERS,
+        collection_cache: bool = False,
+    ):
+        super().__init__(re_filter, timeout, set_python_path, workers, collection_cache)
+        self.processes: Dict[str, WorkerProcess] = dict()
+
+    def run_tests(
+        self,
+        directory: Path,
+        output: Path,
+        tests: List[str],
+        environ: Environment = None,
+    ):
+        try:
+            super().run_tests(directory, output, tests, environ=environ)
+        finally:
+            for process in self.processes.values():
+                process.stop()
+            self.processes.clear()
+
+    def run_test(
+        self, directory: Path, test: str, environ: Environment = None
+    ) -> TestResult:
+        events_path = environ[EVENTS_PATH]
+        if events_path not in self.processes:
+            self.processes[events_path] = WorkerProcess(
+                ["python3", str(PYTEST_PLUGIN), "serve"],
+                directory,
+                environ,
+                without_cpu(self.limits),
+            )
+        response = self.processes[events_path].request(
+            {"test": test, "events": events_path}, timeout=self.get_timeout(test)
+        )
+        if response is None:
+            return TestResult.UNDEFINED
+        return TestResult(response["result"])
+
+
+class ForkPytestRunner(PersistentPytestRunner):
+    """
+    Executes each test in a child forked from a server process, that has
+    imported pytest, the test modules, and the instrumented project once.
+    Events of the imports are not part of the event files of the tests.
+    Requires os.fork, i.e., a POSIX system.
+    """
+
+    FORK_GRACE = 5
+
+    def __init__(
+        self,
+        re_filter: str = r".*",
+        timeout=DEFAULT_TIMEOUT,
+        set_python_path: bool = False,
+        workers: int = DEFAULT_WORKERS,
+        collection_cache: bool = False,
+    ):
+        super().__init__(re_filter, timeout, set_python_path, workers, collection_cache)
+        self.modules: List[str] = list()
+
+    def run_tests(
+        self,
+        directory: Path,
+        output: Path,
+        tests: List[str],
+        environ: Environment = None,
+    ):
+        self.modules = sorted(self.get_files(tests))
+        super().run_tests(directory, output, tests, environ=environ)
+
+    def run_test(
+        self, directory: Path, test: str, environ: Environment = None
+    ) -> TestResult:
+        events_path = environ[EVENTS_PATH]
+        if events_path not in self.processes:
+            self.processes[events_path] = ForkServer(
+                self.modules,
+                directory,
+                environ,
+                timeout=self.timeout * max(len(self.modules), 1),
+                limits=self.limits,
+            )
+        response = self.processes[events_path].request(
+            {"test": test, "events": events_path, "timeout": self.get_timeout(test)},
+            timeout=self.get_timeout(test) + self.FORK_GRACE,
+        )
+        if response is None:
+            return TestResult.UNDEFINED
+        return TestResult(response["result"])
+
+
+class SessionPytestRunner(PytestRunner):
+    def run_session(
+        self,
+        directory: Path,
+        output: Path,
+        tests: List[str],
+        worker: int = 0,
+        environ: Environment = None,
+    ):
+        events = self.get_events_path(directory, worker).with_suffix(".session")
+        shutil.rmtree(events, ignore_errors=True)
+        events.mkdir(parents=True)
+        tests_path, results_path = events / "tests", events / "results"
+        with tests_path.open("w") as fp:
+            for test in tests:
+                fp.write(json.dumps({"test": test, "name": self.safe(test)}) + "\n")
+        timed_out = False
+        try:
+            run_process(
+                [
+                    "python3",
+                    str(PYTEST_PLUGIN),
+                    "session",
+                    str(tests_path),
+                    str(events),
+                    str(output.absolute()),
+                    str(results_path),
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                env=self.get_environ(environ, events / EVENTS_PATH),
+                cwd=directory,
+                timeout=sum(map(self.get_timeout, tests)) or self.timeout,
+                limits=without_cpu(self.limits),
+            )
+        except subprocess.TimeoutExpired:
+            LOGGER.info(f"pytest session {worker} timed out")
+            timed_out = True
+        results = dict()
+        if results_path.exists():
+            with results_path.open("r") as fp:
+                for response in map(json.loads, filter(str.strip, fp)):
+                    results[response["test"]] = response
+        for test in tests:
+            response = results.get(test, {"result": TestResult.UNDEFINED.value})
+            test_result = TestResult(response["result"])
+            self.tests[test_result].add(test)
+            record = manifest.Record()
+            # the first test without a result was running when the session timed out
+            record.update(
+                cpu=response.get("cpu"), timeout=test not in results and timed_out
+            )
+            timed_out = timed_out and test in results
+            path = output / test_result.get_dir() / self.safe(test)
+            if path.exists():
+                self.store_events(path, path)
+            self.cache_result(test, test_result, path, record)
+            self.write_manifest(test, test_result, path, response.get("wall"), record)
+        shutil.rmtree(events, ignore_errors=True)
+
+    def run_tests(
+        self,
+        directory: Path,
+        output: Path,
+        tests: List[str],
+        environ: Environment = None,
+    ):
+        output.mkdir(parents=True, exist_ok=True)
+        for test_result in TestResult:
+            (output / test_result.get_dir()).mkdir(parents=True, exist_ok=True)
+        if self.workers > 1:
+            if self.history is not None:
+                partitions = self.history.partition(tests, self.workers)
+            else:
+                partitions = [tests[i :: self.workers] for i in range(self.workers)]
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                list(
+                    executor.map(
+                        lambda worker: self.run_session(
+                            directory,
+                            output,
+                            partitions[worker],
+                            worker=worker,
+                            environ=environ,
+                        ),
+                        range(self.workers),
+                    )
+                )
+        else:
+            self.run_session(directory, output, tests, environ=environ)
+
+
 class UnittestRunner(Runner):
-    pass
+    """
+    Discovers and executes unittest tests with the unittest loader inside the
+    subject's environment. Each worker keeps a process that runs its tests one
+    after another and classifies them from the unittest result.
+    """
+
+    def __init__(
+        self,
+        re_filter: str = r".*",
+        timeout=DEFAULT_TIMEOUT,
+        workers: int = DEFAULT_WORKERS,
+    ):
+        super().__init__(re_filter, timeout, workers)
+        self.processes: Dict[str, WorkerProcess] = dict()
+
+    def get_tests(
+        self,
+        directory: Path,
+        files: Optional[List[os.PathLike] | os.PathLike] = None,
+        base: Optional[os.PathLike] = None,
+        environ: Environment = None,
+        k: str = None,
+    ) -> List[str]:
+        c = []
+        if k:
+            c += ["-k", k]
+        if files:
+            if isinstance(files, (str, os.PathLike)):
+                files = [files]
+            c += [str(f) for f in files]
+        elif base:
+            c.append(str(base))
+        process = subprocess.run(
+            ["python3", str(UNITTEST_PLUGIN), "discover"] + c,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=environ,
+            cwd=directory.absolute(),
+        )
+        LOGGER.info(f"unittest discovery finished with {process.returncode}")
+        return [
+            json.loads(line)["test"]
+            for line in process.stdout.decode("utf8").splitlines()
+            if line.strip()
+        ]
+
+    def run_tests(
+        self,
+        directory: Path,
+        output: Path,
+        tests: List[str],
+        environ: Environment = None,
+    ):
+        try:
+            super().run_tests(directory, output, tests, environ=environ)
+        finally:
+            for process in self.processes.values():
+                process.stop()
+            self.processes.clear()
+
+    def run_test(
+        self, directory: Path, test: str, environ: Environment = None
+    ) -> TestResult:
+        events_path = environ[EVENTS_PATH]
+        if events_path not in self.processes:
+            self.processes[events_path] = WorkerProcess(
+                ["python3", str(UNITTEST_PLUGIN), "serve"],
+                directory,
+                environ,
+                without_cpu(self.limits),
+            )
+        response = self.processes[events_path].request(
+            {"test": test, "events": events_path}, timeout=self.get_timeout(test)
+        )
+        if response is None:
+            return TestResult.UNDEFINED
+        return TestResult(response["result"])
 
 
 class InputRunner(Runner):
@@ -456,12 +1186,25 @@ class InputRunner(Runner):
         access: os.PathLike,
         passing: List[str | List[str]],
         failing: List[str | List[str]],
+        timeout=DEFAULT_TIMEOUT,
+        workers: int = DEFAULT_WORKERS,
+        persistent: bool = False,
+        output_dir: Optional[os.PathLike] = None,
     ):
-        super().__init__()
+        """
+        If persistent, each worker keeps an interpreter that executes the access
+        for one input after another, such that the subject is only imported
+        once per worker. If an output dir is given, the outputs of each input
+        are written to it instead of being kept in self.output.
+        """
+        super().__init__(timeout=timeout, workers=workers)
         self.access = access
         self.passing: Dict[str, List[str]] = self._prepare_tests(passing, "passing")
         self.failing: Dict[str, List[str]] = self._prepare_tests(failing, "failing")
         self.output: Dict[str, Tuple[str, str]] = dict()
+        self.persistent = persistent
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.processes: Dict[str, WorkerProcess] = dict()
 
     @staticmethod
     def split(s: str, sep: str = ",", esc: str = "\"'"):
@@ -497,6 +1240,94 @@ class InputRunner(Runner):
     ) -> List[str]:
         return list(self.passing.keys()) + list(self.failing.keys())
 
+    def get_output_paths(self, test_name: str) -> Tuple[Optional[Path], Optional[Path]]:
+        if self.output_dir is None:
+            return None, None
+        return (
+            self.output_dir / f"{test_name}.stdout",
+            self.output_dir / f"{test_name}.stderr",
+        )
+
+    def get_output(self, test_name: str) -> Optional[Tuple[str, str]]:
+        stdout, stderr = self.get_output_paths(test_name)
+        if stdout is None:
+            return self.output.get(test_name)
+        if not stdout.exists():
+            return None
+        return stdout.read_text("utf8"), stderr.read_text("utf8")
+
+    def run_tests(
+        self,
+        directory: Path,
+        output: Path,
+        tests: List[str],
+        environ: Environment = None,
+    ):
+        if self.output_dir is not None:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            super().run_tests(directory, output, tests, environ=environ)
+        finally:
+            for process in self.processes.values():
+                process.stop()
+            self.processes.clear()
+
+    def run_persistent(
+        self, directory: Path, test_name: str, test: List[str], environ: Environment
+    ) -> bool:
+        events_path = environ[EVENTS_PATH]
+        if events_path not in self.processes:
+            self.processes[events_path] = WorkerProcess(
+                ["python3", str(INPUT_PLUGIN), str(self.access)],
+                directory,
+                environ,
+                without_cpu(self.limits),
+            )
+        stdout, stderr = self.get_output_paths(test_name)
+        response = self.processes[events_path].request(
+            {
+                "args": test,
+                "events": events_path,
+                "stdout": str(stdout) if stdout else None,
+                "stderr": str(stderr) if stderr else None,
+            },
+            timeout=self.get_timeout(test_name),
+        )
+        if response is None:
+            return False
+        if stdout is None:
+            self.output[test_name] = (response["stdout"], response["stderr"])
+        return True
+
+    def run_process(
+        self, directory: Path, test_name: str, test: List[str], environ: Environment
+    ) -> bool:
+        stdout, stderr = self.get_output_paths(test_name)
+        with contextlib.ExitStack() as stack:
+            if stdout is None:
+                out, err = subprocess.PIPE, subprocess.PIPE
+            else:
+                out = stack.enter_context(open(stdout, "wb"))
+                err = stack.enter_context(open(stderr, "wb"))
+            try:
+                process = run_process(
+                    ["python3", self.access] + test,
+                    stdout=out,
+                    stderr=err,
+                    env=environ,
+                    cwd=directory,
+                    timeout=self.get_timeout(test_name),
+                    limits=self.limits,
+                )
+            except subprocess.TimeoutExpired:
+                return False
+        if stdout is None:
+            self.output[test_name] = (
+                process.stdout.decode("utf8"),
+                process.stderr.decode("utf8"),
+            )
+        return True
+
     def run_test(
         self, directory: Path, test_name: str, environ: Environment = None
     ) -> TestResult:
@@ -506,19 +1337,8 @@ class InputRunner(Runner):
         else:
             test = self.failing[test_name]
             result = TestResult.FAILING
-        try:
-            process = subprocess.run(
-                ["python3", self.access] + test,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                env=environ,
-                cwd=directory,
-                timeout=self.timeout,
-            )
-        except subprocess.TimeoutExpired:
-            return TestResult.UNDEFINED
-        self.output[test_name] = (
-            process.stdout.decode("utf8"),
-            process.stderr.decode("utf8"),
-        )
-        return result
+        if self.persistent:
+            finished = self.run_persistent(directory, test_name, test, environ)
+        else:
+            finished = self.run_process(directory, test_name, test, environ)
+        return result if finished else TestResult.UNDEFINED
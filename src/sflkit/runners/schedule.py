@@ -0,0 +1,101 @@
+import heapq
+import os
+from typing import Dict, List, Optional
+
+import numpy
+
+from sflkit.runners.manifest import Manifest
+
+HISTORY_SIZE = 20
+TIMEOUT_FACTOR = 3
+TIMEOUT_PERCENTILE = 95
+MIN_TIMEOUT = 1
+MAX_ESCALATIONS = 3
+
+
+class History:
+    """
+    The wall times of past executions of tests, read from run manifests. The
+    history schedules tests longest first and derives a timeout for each test
+    from its past durations. Executions that timed out are not durations, but
+    grant the test a longer timeout in the next run, growing with the number of
+    executions that timed out since the test last finished.
+    """
+
+    def __init__(self, size: int = HISTORY_SIZE):
+        self.size = size
+        self.durations: Dict[str, List[float]] = dict()
+        self.timeouts: Dict[str, int] = dict()
+
+    @staticmethod
+    def load(path: os.PathLike, size: int = HISTORY_SIZE) -> "History":
+        history = History(size)
+        if os.path.exists(path):
+            for entry in Manifest.read(path):
+                history.add(entry)
+        return history
+
+    def add(self, entry: Dict):
+        test = entry["test"]
+        if entry.get("timeout"):
+            self.timeouts[test] = self.timeouts.get(test, 0) + 1
+        elif entry.get("wall") is not None:
+            self.timeouts.pop(test, None)
+            durations = self.durations.setdefault(test, list())
+            durations.append(entry["wall"])
+            del durations[: -self.size]
+
+    def estimate(self, test: str) -> Optional[float]:
+        if test in self.durations:
+            return float(numpy.median(self.durations[test]))
+        return None
+
+    def get_timeout(
+        self,
+        test: str,
+        default: float,
+        factor: float = TIMEOUT_FACTOR,
+        percentile: float = TIMEOUT_PERCENTILE,
+    ) -> float:
+        timeout = default
+        if test in self.durations:
+            timeout = max(
+                MIN_TIMEOUT,
+                factor * float(numpy.percentile(self.durations[test], percentile)),
+            )
+        if test in self.timeouts:
+            escalations = min(self.timeouts[test], MAX_ESCALATIONS)
+            timeout = max(timeout, default) * factor**escalations
+        return timeout
+
+    def get_estimates(self, tests: List[str]) -> Dict[str, float]:
+        estimates = {test: self.estimate(test) for test in tests}
+        known = [e for e in estimates.values() if e is not None]
+        unknown = float(numpy.median(known)) if known else 0
+        return {
+            test: unknown if estimate is None else estimate
+            for test, estimate in estimates.items()
+        }
+
+    def schedule(self, tests: List[str]) -> List[str]:
+        """
+        Orders the tests longest first, such that workers taking the next test
+        whenever they are idle follow the LPT rule. Tests without a history are
+        estimated by the median duration.
+        """
+        estimates = self.get_estimates(tests)
+        return sorted(tests, key=lambda test: -estimates[test])
+
+    def partition(self, tests: List[str], bins: int) -> List[List[str]]:
+        """
+        Assigns the tests longest first to the bin with the least total
+        duration.
+        """
+        estimates = self.get_estimates(tests)
+        partitions = [list() for _ in range(bins)]
+        heap = [(0.0, i) for i in range(bins)]
+        for test in self.schedule(tests):
+            load, i = heapq.heappop(heap)
+            partitions[i].append(test)
+            heapq.heappush(heap, (load + estimates[test], i))
+        return partitions
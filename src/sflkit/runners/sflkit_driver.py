@@ -0,0 +1,48 @@
+"""
+The helpers shared by the drivers of the sflkit runners.
+
+The drivers import this module by its path inside the environment of the
+subject. Hence, it must only depend on the standard library.
+"""
+import os
+import sys
+
+EVENTS_PATH = "EVENTS_PATH"
+LIBS = ("sflkitlib.lib", "sflkit_coverage")
+
+PASSING = "PASSING"
+FAILING = "FAILING"
+UNDEFINED = "UNDEFINED"
+
+
+def rotate_events(events_path: str):
+    """
+    Directs the events of the instrumented libraries to a new file and discards
+    the events not yet written.
+    """
+    os.environ[EVENTS_PATH] = events_path
+    for lib in LIBS:
+        if lib in sys.modules:
+            sys.modules[lib].reset()
+
+
+def dump_events():
+    for lib in LIBS:
+        if lib in sys.modules:
+            sys.modules[lib].dump_events()
+
+
+def silence_stdout():
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    os.close(devnull)
+
+
+def open_protocol():
+    """
+    Returns a stream to the original stdout for the protocol with the runner
+    and silences the output of the subject.
+    """
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    silence_stdout()
+    return protocol
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from sflkit.runners.manifest import MANIFEST, Manifest
+
+Shard = Tuple[int, int]
+
+SHARD = "shard.json"
+
+
+def parse_shard(shard: str) -> Shard:
+    """
+    Parses a shard of the form i/N, where i is the index of the shard starting
+    at 1 and N the number of shards.
+    """
+    try:
+        index, count = map(int, shard.split("/"))
+    except ValueError:
+        raise ValueError(f"shard {shard} is not of the form i/N")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"shard {shard} is not in 1/{count} to {count}/{count}")
+    return index, count
+
+
+def get_shard_dir(output: Path, shard: Shard) -> Path:
+    return output / f"shard-{shard[0]}-of-{shard[1]}"
+
+
+def get_shard(tests: List[str], shard: Shard) -> List[str]:
+    """
+    Returns the tests of the shard. A test belongs to a shard by the hash of its
+    id alone, such that every node computes the same partition regardless of
+    the order in which it collected the tests or the history it has.
+    """
+    index, count = shard
+    return [
+        test
+        for test in sorted(set(tests))
+        if int.from_bytes(hashlib.sha1(test.encode("utf8")).digest()[:8], "big") % count
+        == index - 1
+    ]
+
+
+def write_shard(output: Path, tests: List[str], shard: Shard):
+    """
+    Records the shard and all collected tests in the output of the shard, such
+    that merging can check that the shards cover the same tests completely.
+    """
+    output.mkdir(parents=True, exist_ok=True)
+    with open(output / SHARD, "w") as fp:
+        json.dump({"shard": list(shard), "tests": sorted(set(tests))}, fp)
+
+
+def read_shard(output: Path) -> Dict:
+    try:
+        with open(output / SHARD, "r") as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        raise ValueError(f"{output} is not the output of a shard")
+
+
+def merge_runs(outputs: List[os.PathLike], output: os.PathLike) -> int:
+    """
+    Merges the outputs of several shards into one output with a single tree of
+    event files and one manifest, and returns the number of merged event files.
+    The output must be empty. The shards must have collected the same tests
+    and together executed all of them. Since the shards are disjoint, an event
+    file contained in several shards means that the nodes partitioned different
+    tests. In these cases nothing is merged.
+    """
+    output = Path(output)
+    if output.exists() and any(output.iterdir()):
+        raise ValueError(f"output {output} of the merge is not empty")
+    collected, executed = None, set()
+    for shard in map(Path, outputs):
+        tests = read_shard(shard)["tests"]
+        if collected is None:
+            collected = tests
+        elif tests != collected:
+            raise ValueError(f"{shard} collected other tests than {outputs[0]}")
+        if (shard / MANIFEST).exists():
+            executed.update(Manifest.latest(shard / MANIFEST))
+    missing = sorted(set(collected or []) - executed)
+    if missing:
+        raise ValueError(
+            f"{len(missing)} tests were executed by no shard, e.g., {missing[0]}"
+        )
+    files: Dict[Path, Path] = dict()
+    for shard in map(Path, outputs):
+        for directory in sorted(shard.iterdir()):
+            if not directory.is_dir():
+                continue
+            for f in sorted(directory.iterdir()):
+                if f.is_file():
+                    target = output / directory.name / f.name
+                    if target in files:
+                        raise ValueError(
+                            f"{f} is also contained in {files[target]}, the shards "
+                            "were not partitioned with the same tests and history"
+                        )
+                    files[target] = f
+    output.mkdir(parents=True, exist_ok=True)
+    for target, f in files.items():
+        target.parent.mkdir(exist_ok=True)
+        shutil.copyfile(f, target)
+    with open(output / MANIFEST, "w") as manifest:
+        for shard in map(Path, outputs):
+            if (shard / MANIFEST).exists():
+                with open(shard / MANIFEST, "r") as fp:
+                    for line in fp:
+                        if line.strip():
+                            manifest.write(line if line.endswith("\n") else line + "\n")
+    return len(files)
@@ -0,0 +1,152 @@
+"""
+The unittest drivers used by the sflkit unittest runner.
+
+This module is executed as a script inside the environment of the subject.
+Hence, it must only depend on the standard library and sflkitlib.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import time
+import unittest
+from typing import Iterator, List, Optional
+
+if __name__ == "__main__":
+    sys.path[0] = os.getcwd()
+
+# the drivers share their helpers, which are not on the path of the subject
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from sflkit_driver import (
+    FAILING,
+    PASSING,
+    UNDEFINED,
+    dump_events,
+    open_protocol,
+    rotate_events,
+)
+
+del sys.path[0]
+
+DISCOVER = "discover"
+SERVE = "serve"
+
+PATTERN = "test*.py"
+
+
+def get_module(path: str) -> Optional[str]:
+    name, ext = os.path.splitext(os.path.relpath(path, os.getcwd()))
+    parts = name.split(os.sep)
+    if ext != ".py" or not all(part.isidentifier() for part in parts):
+        return None
+    return ".".join(parts)
+
+
+def find_modules(start: str, pattern: str = PATTERN) -> Iterator[str]:
+    for root, dirs, files in os.walk(start):
+        dirs[:] = sorted(
+            d for d in dirs if not d.startswith(".") and d != "__pycache__"
+        )
+        for f in sorted(files):
+            if fnmatch.fnmatch(f, pattern):
+                module = get_module(os.path.join(root, f))
+                if module:
+                    yield module
+
+
+def get_names(arguments: List[str], pattern: str = PATTERN) -> Iterator[str]:
+    for argument in arguments:
+        if os.path.isdir(argument):
+            yield from find_modules(argument, pattern)
+        elif argument.endswith(".py"):
+            module = get_module(argument)
+            if module:
+                yield module
+        else:
+            yield argument
+
+
+def iter_tests(suite: unittest.TestSuite) -> Iterator[str]:
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from iter_tests(test)
+        elif not test.id().startswith("unittest.loader."):
+            yield test.id()
+
+
+def get_result(result: unittest.TestResult) -> str:
+    if result.failures or result.errors:
+        return FAILING
+    elif (
+        result.testsRun == 0
+        or result.skipped
+        or result.expectedFailures
+        or result.unexpectedSuccesses
+    ):
+        return UNDEFINED
+    else:
+        return PASSING
+
+
+def discover(arguments: List[str], pattern: str = PATTERN, k: str = None):
+    """
+    Loads the tests of the given modules, files, or directories, or of the
+    working directory, and writes their ids.
+    """
+    protocol = open_protocol()
+    loader = unittest.TestLoader()
+    if k:
+        loader.testNamePatterns = [k if "*" in k else f"*{k}*"]
+    tests = dict()
+    for name in get_names(arguments or [os.curdir], pattern):
+        try:
+            suite = loader.loadTestsFromName(name)
+        except BaseException:
+            continue
+        tests.update(dict.fromkeys(iter_tests(suite)))
+    for test in tests:
+        protocol.write(json.dumps({"test": test}) + "\n")
+    protocol.flush()
+
+
+def run_test(test: str, events: str) -> dict:
+    rotate_events(events)
+    result = unittest.TestResult()
+    start = time.process_time()
+    try:
+        unittest.TestLoader().loadTestsFromName(test).run(result)
+        test_result = get_result(result)
+        returncode = 0 if result.wasSuccessful() else 1
+    except BaseException:
+        test_result, returncode = UNDEFINED, None
+    dump_events()
+    return {
+        "result": test_result,
+        "returncode": returncode,
+        "cpu": time.process_time() - start,
+    }
+
+
+def serve():
+    protocol = open_protocol()
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        response = run_test(request["test"], request["events"])
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("mode", choices=[DISCOVER, SERVE])
+    parser.add_argument("-p", "--pattern", default=PATTERN)
+    parser.add_argument("-k", default=None)
+    parser.add_argument("names", nargs="*")
+    args = parser.parse_intermixed_args()
+    if args.mode == DISCOVER:
+        discover(args.names, args.pattern, args.k)
+    else:
+        serve()
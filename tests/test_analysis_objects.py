@@ -11,6 +11,7 @@ from sflkitlib.events.event import (
 )
 
 from sflkit.analysis.analysis_type import AnalysisType
+from sflkit.analysis.factory import BranchFactory
 from sflkit.analysis.predicate import (
     Branch,
     Condition,
@@ -48,6 +49,24 @@ class TestAnalysisObjects(BaseTest):
         self.assertEqual(1, len(obj.events()))
         self.assertIn(EventType.BRANCH, obj.events())
 
+    def test_branch_factory(self):
+        factory = BranchFactory()
+        objects = factory.get_analysis(BranchEvent(self.ACCESS, 1, 0, 1, 0))
+        self.assertEqual(
+            set(objects),
+            set(factory.get_analysis(BranchEvent(self.ACCESS, 1, 1, 0, 1))),
+        )
+        self.assertEqual(
+            [(0, True), (1, False)], sorted((o.then_id, o.then) for o in objects)
+        )
+        # a branch without an else
+        (obj,) = factory.get_analysis(BranchEvent(self.ACCESS, 2, 2, 2, -1))
+        self.assertEqual((-1, False), (obj.then_id, obj.then))
+        self.assertEqual(f"{AnalysisType.BRANCH}:{self.ACCESS}:2:else:-1", str(obj))
+        self.assertEqual(
+            [obj], factory.get_analysis(BranchEvent(self.ACCESS, 2, 2, 2, -1))
+        )
+
     def test_function(self):
         obj = Function(FunctionEnterEvent(self.ACCESS, 1, 0, "main", 0))
         self.assertEqual(self.ACCESS, obj.file)
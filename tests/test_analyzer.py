@@ -0,0 +1,109 @@
+import os
+
+from sflkit import Analyzer, Config, instrument_config
+from sflkit.analysis.factory import CombinationFactory
+from sflkit.mapping import EventMapping
+from sflkit.model import EventFile
+from utils import BaseTest
+
+
+class AnalyzerTest(BaseTest):
+    EVENTS = (
+        "line,branch,def,use,function_enter,function_exit,function_error,"
+        "condition,loop_begin,loop_hit,loop_end,len"
+    )
+    PREDICATES = (
+        "line,branch,function,loop,def_use,condition,scalar_pair,variable,"
+        "return,none,length,function_error"
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        config = cls.create_config()
+        instrument_config(config)
+        mapping = EventMapping.load(config)
+        cls.relevant = [
+            EventFile(cls.execute_subject(["2", "1", "3"], 0), 0, mapping, True)
+        ]
+        cls.irrelevant = [
+            EventFile(cls.execute_subject(test, count), count, mapping, False)
+            for count, test in enumerate(
+                [["3", "2", "1"], ["3", "1", "2"], ["2", "2", "3"]], start=1
+            )
+        ]
+
+    @classmethod
+    def create_config(cls):
+        return Config.create(
+            path=os.path.join(cls.TEST_RESOURCES, cls.TEST_SUGGESTIONS),
+            language="python",
+            events=cls.EVENTS,
+            predicates=cls.PREDICATES,
+            working=cls.TEST_DIR,
+        )
+
+    @staticmethod
+    def get_results(analyzer: Analyzer):
+        return {
+            (str(obj), getattr(obj, "evaluate_hit", None)): (
+                obj.passed_observed,
+                obj.failed_observed,
+                obj.get_metric(),
+            )
+            for obj in analyzer.get_analysis()
+        }
+
+    def analyze(self, workers: int):
+        analyzer = Analyzer(
+            self.relevant,
+            self.irrelevant,
+            self.create_config().factory,
+            workers=workers,
+        )
+        analyzer.analyze()
+        return self.get_results(analyzer)
+
+    def test_parallel(self):
+        expected = self.analyze(1)
+        actual = self.analyze(3)
+        self.assertLess(0, len(expected))
+        self.assertEqual(expected, actual)
+
+    def test_dispatch(self):
+        expected = dict()
+        for factory in self.create_config().factory.factories:
+            analyzer = Analyzer(self.relevant, self.irrelevant, factory)
+            analyzer.analyze()
+            expected.update(self.get_results(analyzer))
+        factory = self.create_config().factory
+        analyzer = Analyzer(self.relevant, self.irrelevant, factory)
+        analyzer.analyze()
+        self.assertLess(0, len(expected))
+        self.assertEqual(expected, self.get_results(analyzer))
+        self.assertIsInstance(factory, CombinationFactory)
+        self.assertLess(0, len(factory.dispatch))
+        for objects, dynamic in factory.dispatch.values():
+            self.assertTrue(all(not f.static for f in dynamic))
+
+    def test_dump_load(self):
+        expected = self.analyze(1)
+        analyzer = Analyzer(
+            self.relevant, self.irrelevant[:1], self.create_config().factory
+        )
+        analyzer.analyze()
+        dump = os.path.join(self.TEST_DIR, "analysis.pickle")
+        analyzer.dump(dump)
+        analyzer = Analyzer.load(dump)
+        analyzed = set(analyzer.analyzed)
+        added = analyzer.add_event_files(
+            [EventFile(self.relevant[0].path, 0, self.relevant[0].mapping, True)],
+            [
+                EventFile(e.path, i, e.mapping, False)
+                for i, e in enumerate(self.irrelevant)
+            ],
+        )
+        self.assertEqual(len(self.irrelevant) - 1, len(added))
+        analyzer.analyze()
+        self.assertEqual(len(self.relevant) + len(self.irrelevant), len(analyzer.paths))
+        self.assertTrue(analyzed.issubset(analyzer.analyzed))
+        self.assertEqual(expected, self.get_results(analyzer))
@@ -0,0 +1,169 @@
+import io
+import os
+
+from sflkitlib.events import EventType
+
+from sflkit import Analyzer, instrument_config
+from sflkit.analysis.factory import analysis_factory_mapping
+from sflkit.analysis.mapping import analysis_mapping, get_consumed_events
+from sflkit.config import Config
+from sflkit.mapping import EventMapping
+from sflkit.model import EventFile, columnar
+from sflkit.model.columnar import (
+    convert,
+    is_columnar,
+    load_projected,
+    ColumnarEventReader,
+)
+from sflkit.model.compression import GZIP, compress, is_compressed
+from utils import BaseTest
+
+
+class ColumnarTests(BaseTest):
+    def setUp(self) -> None:
+        self.config = Config.create(
+            path=os.path.join(self.TEST_RESOURCES, self.TEST_SUGGESTIONS),
+            language="python",
+            events="line,branch,def,use,function_enter,function_exit,"
+            "function_error,condition,loop_begin,loop_hit,loop_end,len",
+            working=self.TEST_DIR,
+        )
+        instrument_config(self.config)
+        self.mapping = EventMapping.load(self.config)
+        self.path = self.execute_subject(["2", "1", "3"], 0)
+
+    def test_convert(self):
+        columnar = os.path.join(self.TEST_DIR, "EVENTS_PATH_columnar")
+        with EventFile(self.path, 0, self.mapping) as event_file:
+            expected = list(event_file.load())
+        self.assertEqual(1, convert(self.path, self.mapping.mapping, columnar))
+        self.assertFalse(is_columnar(self.path))
+        self.assertTrue(is_columnar(columnar))
+        self.assertLess(0, len(expected))
+        with EventFile(columnar, 0, self.mapping) as event_file:
+            actual = list(event_file.load())
+        self.assertEqual(len(expected), len(actual))
+        for e, a in zip(expected, actual):
+            self.assertEqual(e, a)
+            self.assertEqual(repr(e), repr(a))
+            self.assertEqual(getattr(e, "value", None), getattr(a, "value", None))
+
+    def test_convert_batches(self):
+        with EventFile(self.path, 0, self.mapping) as event_file:
+            expected = list(event_file.load())
+        self.assertEqual(1, convert(self.path, self.mapping.mapping))
+        batch_size = columnar.BATCH_SIZE
+        columnar.BATCH_SIZE = 7
+        try:
+            with EventFile(self.path, 0, self.mapping) as event_file:
+                actual = list(event_file.load())
+        finally:
+            columnar.BATCH_SIZE = batch_size
+        self.assertEqual(len(expected), len(actual))
+        for e, a in zip(expected, actual):
+            self.assertEqual(repr(e), repr(a))
+            self.assertEqual(getattr(e, "value", None), getattr(a, "value", None))
+
+    def test_event_ids(self):
+        with EventFile(self.path, 0, self.mapping) as event_file:
+            expected = [e.event_id for e in event_file.load()]
+        self.assertEqual(1, convert(self.path, self.mapping.mapping))
+        self.assertTrue(is_columnar(self.path))
+        reader = ColumnarEventReader(self.path)
+        self.assertEqual(len(expected), len(reader))
+        self.assertEqual(expected, reader.event_ids.tolist())
+        reader.close()
+        with EventFile(self.path, 0, self.mapping) as event_file:
+            self.assertEqual(expected, event_file.event_ids().tolist())
+
+    def test_compressed(self):
+        with EventFile(self.path, 0, self.mapping) as event_file:
+            expected = list(event_file.load())
+        compressed = os.path.join(self.TEST_DIR, "EVENTS_PATH_gzip")
+        compress(self.path, compressed, GZIP)
+        self.assertTrue(is_compressed(compressed))
+        self.assertLess(os.path.getsize(compressed), os.path.getsize(self.path))
+        with EventFile(compressed, 0, self.mapping) as event_file:
+            self.assertEqual(expected, list(event_file.load()))
+        self.assertFalse(is_columnar(compressed))
+        columnar = os.path.join(self.TEST_DIR, "EVENTS_PATH_columnar")
+        self.assertEqual(1, convert(compressed, self.mapping.mapping, columnar))
+        compress(columnar, compressed, GZIP)
+        self.assertTrue(is_columnar(compressed))
+        with EventFile(compressed, 0, self.mapping) as event_file:
+            self.assertEqual(
+                [e.event_id for e in expected], event_file.event_ids().tolist()
+            )
+            self.assertEqual(expected, list(event_file.load()))
+
+    def get_hits(self, path, mapping, projected: bool = False):
+        hits = dict()
+        for analysis_type in analysis_mapping:
+            events = get_consumed_events([analysis_type]) if projected else None
+            analyzer = Analyzer(
+                [EventFile(path, 0, mapping, failing=True, events=events)],
+                [],
+                analysis_factory_mapping[analysis_type](),
+            )
+            analyzer.analyze()
+            for obj in analyzer.get_analysis():
+                hits.setdefault((analysis_type, str(obj)), list()).append(
+                    (
+                        sorted(obj.hits.values()),
+                        sorted(getattr(obj, "true_hits", dict()).values()),
+                    )
+                )
+        return {key: sorted(values) for key, values in hits.items()}
+
+    def test_projection(self):
+        with EventFile(self.path, 0, self.mapping) as event_file:
+            expected = list(event_file.load())
+        columnar = os.path.join(self.TEST_DIR, "EVENTS_PATH_columnar")
+        convert(self.path, self.mapping.mapping, columnar)
+        for types in (
+            {EventType.LINE},
+            {EventType.DEF, EventType.FUNCTION_EXIT},
+            {EventType.CONDITION, EventType.LEN},
+            set(),
+        ):
+            for path in (self.path, columnar):
+                with EventFile(path, 0, self.mapping, events=types) as event_file:
+                    self.assertEqual(
+                        [e for e in expected if e.event_type in types],
+                        list(event_file.load()),
+                    )
+                with EventFile(path, 0, self.mapping, events=types) as event_file:
+                    self.assertEqual(
+                        [e.event_id for e in expected if e.event_type in types],
+                        list(event_file.event_ids()),
+                    )
+        types = {EventType.LINE, EventType.DEF, EventType.CONDITION}
+        projected = [e for e in expected if e.event_type in types]
+        for chunk_size in (1, 7, 64):
+            with open(self.path, "rb") as fp:
+                self.assertEqual(
+                    projected,
+                    list(load_projected(fp, self.mapping.mapping, types, chunk_size)),
+                )
+        with open(self.path, "rb") as fp:
+            truncated = io.BytesIO(fp.read()[:-1])
+        self.assertEqual(
+            projected[:-1] if expected[-1].event_type in types else projected,
+            list(load_projected(truncated, self.mapping.mapping, types, 5)),
+        )
+
+    def test_projected_analysis(self):
+        config = Config.create(
+            path=os.path.join(self.TEST_RESOURCES, "test_events"),
+            language="python",
+            # loops are not instrumented, their ids are global to the process
+            events="line,branch,def,use,function_enter,function_exit,"
+            "function_error,condition,len",
+            working=self.TEST_DIR,
+        )
+        instrument_config(config)
+        mapping = EventMapping.load(config)
+        path = self.execute_subject([], 1)
+        hits = self.get_hits(path, mapping)
+        self.assertLess(0, len(hits))
+        self.assertEqual(hits, self.get_hits(path, mapping, projected=True))
@@ -9,9 +9,10 @@ from sflkit.analysis.analysis_type import AnalysisType
 from sflkit.analysis.factory import DefUseFactory
 from sflkit.analysis.spectra import Spectrum
 from sflkit.analysis.suggestion import Location
-from sflkit.config import Config, write_config
+from sflkit.config import Config, ConfigError, write_config
 from sflkit.language.language import Language
 from sflkit.language.python.factory import LineEventFactory, BranchEventFactory
+from sflkit.runners import RunnerType
 from utils import BaseTest
 
 
@@ -74,6 +75,60 @@ class ConfigTests(unittest.TestCase):
         self.assertEqual(0, len(config.instrument_exclude))
         self.assertIsNone(config.runner)
 
+    def test_workers(self):
+        config = Config.create(
+            path=os.path.join("test", "path"),
+            language="Python",
+            events="Line",
+            working=os.path.join("instrumentation", "path"),
+            runner="pytest_runner",
+            workers=4,
+        )
+        self.assertEqual(RunnerType.PYTEST_RUNNER, config.runner)
+        self.assertEqual(4, config.workers)
+
+    def test_compression(self):
+        config = Config.create(
+            path=os.path.join("test", "path"),
+            language="Python",
+            events="Line",
+            working=os.path.join("instrumentation", "path"),
+            runner="pytest_runner",
+            compression="gzip",
+            compression_level=9,
+        )
+        self.assertEqual("gzip", config.event_compression)
+        self.assertEqual(9, config.compression_level)
+        self.assertRaises(
+            ConfigError,
+            Config.create,
+            path=os.path.join("test", "path"),
+            language="Python",
+            events="Line",
+            compression="lzma",
+        )
+
+    def test_collection_cache(self):
+        config = Config.create(
+            path=os.path.join("test", "path"),
+            language="Python",
+            events="Line",
+            working=os.path.join("instrumentation", "path"),
+            runner="fork_pytest_runner",
+            cache=True,
+        )
+        self.assertTrue(config.collection_cache)
+        self.assertRaises(
+            ConfigError,
+            Config.create,
+            path=os.path.join("test", "path"),
+            language="Python",
+            events="Line",
+            working=os.path.join("instrumentation", "path"),
+            runner="unittest_runner",
+            cache=True,
+        )
+
     def test_create_config(self):
         config = Config.create(
             path=os.path.join("test", "path"),
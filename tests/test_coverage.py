@@ -1,7 +1,13 @@
+import os
 from typing import List
 
+from sflkit import Analyzer, instrument_config
 from sflkit.analysis.analysis_type import AnalysisType
 from sflkit.analysis.spectra import Line
+from sflkit.config import Config, ConfigError
+from sflkit.mapping import EventMapping
+from sflkit.model import EventFile
+from sflkit.model.coverage import is_coverage
 from utils import BaseTest
 
 
@@ -17,3 +23,43 @@ class TestCoverage(BaseTest):
         coverage: List[Line] = analyzer.get_coverage(AnalysisType.LINE)
         coverage = {line.line for line in coverage}
         self.assertEqual(coverage, {1, 5, 6, 7, 9, 10, 12, 13, 16, 19, 20})
+
+    def run_coverage_analysis(self, coverage: bool):
+        config = Config.create(
+            path=os.path.join(self.TEST_RESOURCES, self.TEST_SUGGESTIONS),
+            language="python",
+            predicates="line,branch,function",
+            working=self.TEST_DIR,
+            coverage=coverage,
+        )
+        instrument_config(config)
+        mapping = EventMapping.load(config)
+        relevant = [EventFile(self.execute_subject(["2", "1", "3"], 0), 0, mapping)]
+        irrelevant = [
+            EventFile(self.execute_subject(test, count), count, mapping)
+            for count, test in enumerate([["3", "2", "1"], ["3", "1", "2"]], start=1)
+        ]
+        self.assertEqual(coverage, is_coverage(relevant[0].path))
+        analyzer = Analyzer(relevant, irrelevant, config.factory)
+        analyzer.analyze()
+        return {
+            str(obj): (obj.passed_observed, obj.failed_observed)
+            for obj in analyzer.get_analysis()
+        }
+
+    def test_coverage_mode(self):
+        expected = self.run_coverage_analysis(False)
+        actual = self.run_coverage_analysis(True)
+        self.assertLess(0, len(expected))
+        self.assertEqual(expected, actual)
+
+    def test_coverage_mode_unsupported(self):
+        self.assertRaises(
+            ConfigError,
+            Config.create,
+            path=os.path.join(self.TEST_RESOURCES, self.TEST_SUGGESTIONS),
+            language="python",
+            predicates="line,def_use",
+            working=self.TEST_DIR,
+            coverage=True,
+        )
@@ -0,0 +1,54 @@
+import copy
+
+import numpy
+
+from sflkit.analysis.predicate import Predicate
+from utils import BaseTest
+
+
+class HitMatrixTest(BaseTest):
+    @classmethod
+    def setUpClass(cls):
+        cls.analyzer = cls.run_analysis(
+            cls.TEST_SUGGESTIONS,
+            "line,branch,def,use,function_enter,function_exit,function_error,"
+            "condition,loop_begin,loop_hit,loop_end,len",
+            "line,branch,function,loop,def_use,condition,scalar_pair,variable,"
+            "return,none,length",
+            relevant=[["2", "1", "3"]],
+            irrelevant=[["3", "2", "1"], ["3", "1", "2"]],
+        )
+
+    def test_shape(self):
+        matrix = self.analyzer.matrix
+        self.assertEqual((len(self.analyzer.get_analysis()), 3), matrix.shape)
+        dense = matrix.to_dense()
+        passed, failed = matrix.count()
+        self.assertTrue(numpy.array_equal(dense[:, :1].sum(axis=1), failed))
+        self.assertTrue(numpy.array_equal(dense[:, 1:].sum(axis=1), passed))
+
+    def test_object_api(self):
+        passed = self.analyzer.irrelevant_event_files
+        failed = self.analyzer.relevant_event_files
+        for obj in self.analyzer.get_analysis():
+            expected = copy.copy(obj)
+            expected.passed_observed = 0
+            expected.failed_observed = 0
+            if isinstance(expected, Predicate):
+                expected.true_relevant = 0
+                expected.true_irrelevant = 0
+                expected.false_relevant = 0
+                expected.false_irrelevant = 0
+            expected.analyze(passed, failed)
+            self.assertEqual(expected.passed_observed, obj.passed_observed, obj)
+            self.assertEqual(expected.failed_observed, obj.failed_observed, obj)
+            self.assertEqual(expected.passed_not_observed, obj.passed_not_observed)
+            self.assertEqual(expected.failed_not_observed, obj.failed_not_observed)
+            if isinstance(expected, Predicate):
+                self.assertEqual(expected.true_relevant, obj.true_relevant, obj)
+                self.assertEqual(expected.true_irrelevant, obj.true_irrelevant, obj)
+                self.assertEqual(expected.false_relevant, obj.false_relevant, obj)
+                self.assertEqual(expected.false_irrelevant, obj.false_irrelevant, obj)
+            self.assertAlmostEqual(
+                expected.get_metric(), obj.get_metric(), delta=self.DELTA
+            )
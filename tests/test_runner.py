@@ -1,16 +1,38 @@
+import gzip
 import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
 from pathlib import Path
 
+from sflkitlib.events.event import LineEvent
+
 from sflkit import Config, instrument_config, Analyzer
 from sflkit.analysis.analysis_type import AnalysisType
+from sflkit.analysis.factory import LineFactory
+from sflkit.analysis import stream as stream_module
+from sflkit.analysis.stream import EventCollector, EventStream, StreamModel
 from sflkit.analysis.suggestion import Location
 from sflkit.mapping import EventMapping
 from sflkit.model import EventFile
+from sflkit.model.compression import GZIP, is_compressed
+from sflkit.runners import manifest, process, run
+from sflkit.language.meta import IDGenerator
+from sflkit.runners.cache import ResultCache
+from sflkit.runners.manifest import Manifest, MANIFEST
 from sflkit.runners.run import (
     PytestRunner,
+    PersistentPytestRunner,
+    ForkPytestRunner,
+    SessionPytestRunner,
+    UnittestRunner,
     InputRunner,
     PytestStructure,
+    PathIndex,
 )
+from sflkit.runners.shard import get_shard, get_shard_dir, merge_runs
 from tests.utils import BaseTest
 
 
@@ -70,7 +92,306 @@ class RunnerTests(BaseTest):
         self.assertEqual(1, len(suggestions[-1].lines))
         self.assertEqual(Location("middle.py", 7), suggestions[-1].lines[0])
 
-    def test_input_runner(self):
+    def test_runner_parallel(self):
+        config = Config.create(
+            path=os.path.join(self.TEST_RESOURCES, BaseTest.TEST_RUNNER),
+            language="python",
+            events="line",
+            predicates="line",
+            working=BaseTest.TEST_DIR,
+            exclude="tests",
+        )
+        instrument_config(config)
+        runner = PytestRunner(workers=2)
+        output = Path(BaseTest.TEST_DIR, "events").absolute()
+        runner.run(
+            Path(BaseTest.TEST_DIR), output, files=[Path("tests", "test_middle.py")]
+        )
+        self.assertEqual(2, len(runner.passing_tests))
+        self.assertEqual(1, len(runner.failing_tests))
+        self.assertEqual(0, len(runner.undefined_tests))
+        self.assertEqual(2, len(os.listdir(output / "passing")))
+        self.assertEqual(1, len(os.listdir(output / "failing")))
+        for worker in range(2):
+            self.assertFalse(
+                runner.get_events_path(Path(BaseTest.TEST_DIR), worker).exists()
+            )
+
+    def test_persistent_runner(self):
+        config = Config.create(
+            path=os.path.join(self.TEST_RESOURCES, BaseTest.TEST_RUNNER),
+            language="python",
+            events="line",
+            predicates="line",
+            working=BaseTest.TEST_DIR,
+            exclude="tests",
+        )
+        instrument_config(config)
+        runner = PersistentPytestRunner()
+        output = Path(BaseTest.TEST_DIR, "events").absolute()
+        runner.run(
+            Path(BaseTest.TEST_DIR), output, files=[Path("tests", "test_middle.py")]
+        )
+        self.assertEqual(2, len(runner.passing_tests))
+        self.assertEqual(1, len(runner.failing_tests))
+        self.assertEqual(0, len(runner.undefined_tests))
+        self.assertEqual(0, len(runner.processes))
+        mapping = EventMapping.load(config)
+        analyzer = Analyzer(
+            [
+                EventFile(
+                    output / "failing" / os.listdir(output / "failing")[0],
+                    0,
+                    mapping,
+                    failing=True,
+                )
+            ],
+            [
+                EventFile(output / "passing" / path, run_id, mapping)
+                for run_id, path in enumerate(os.listdir(output / "passing"), start=1)
+            ],
+            config.factory,
+        )
+        analyzer.analyze()
+        predicates = analyzer.get_analysis_by_type(AnalysisType.LINE)
+        suggestions = sorted(map(lambda p: p.get_suggestion(), predicates))
+        self.assertEqual(1, suggestions[-1].suspiciousness)
+        self.assertEqual(Location("middle.py", 7), suggestions[-1].lines[0])
+
+    def test_fork_runner(self):
+        config = Config.create(
+            path=os.path.join(self.TEST_RESOURCES, BaseTest.TEST_RUNNER),
+            language="python",
+            events="line",
+            predicates="line",
+            working=BaseTest.TEST_DIR,
+            exclude="tests",
+        )
+        instrument_config(config)
+        runner = ForkPytestRunner(workers=2)
+        output = Path(BaseTest.TEST_DIR, "events").absolute()
+        runner.run(
+            Path(BaseTest.TEST_DIR), output, files=[Path("tests", "test_middle.py")]
+        )
+        self.assertEqual(2, len(runner.passing_tests))
+        self.assertEqual(1, len(runner.failing_tests))
+        self.assertEqual(0, len(runner.undefined_tests))
+        self.assertEqual(0, len(runner.processes))
+        mapping = EventMapping.load(config)
+        analyzer = Analyzer(
+            [
+                EventFile(
+                    output / "failing" / os.listdir(output / "failing")[0],
+                    0,
+                    mapping,
+                    failing=True,
+                )
+            ],
+            [
+                EventFile(output / "passing" / path, run_id, mapping)
+                for run_id, path in enumerate(os.listdir(output / "passing"), start=1)
+            ],
+            config.factory,
+        )
+        analyzer.analyze()
+        predicates = analyzer.get_analysis_by_type(AnalysisType.LINE)
+        suggestions = sorted(map(lambda p: p.get_suggestion(), predicates))
+        self.assertEqual(1, suggestions[-1].suspiciousness)
+        self.assertEqual(Location("middle.py", 7), suggestions[-1].lines[0])
+
+    def test_session_runner(self):
+        config = Config.create(
+            path=os.path.join(self.TEST_RESOURCES, BaseTest.TEST_RUNNER),
+            language="python",
+            events="line",
+            predicates="line",
+            working=BaseTest.TEST_DIR,
+            exclude="tests",
+        )
+        instrument_config(config)
+        runner = SessionPytestRunner()
+        output = Path(BaseTest.TEST_DIR, "events").absolute()
+        runner.run(
+            Path(BaseTest.TEST_DIR), output, files=[Path("tests", "test_middle.py")]
+        )
+        self.assertEqual(2, len(runner.passing_tests))
+        self.assertEqual(1, len(runner.failing_tests))
+        self.assertEqual(0, len(runner.undefined_tests))
+        self.assertEqual(2, len(os.listdir(output / "passing")))
+        self.assertEqual(1, len(os.listdir(output / "failing")))
+        self.assertIn(
+            runner.safe(next(iter(runner.failing_tests))),
+            os.listdir(output / "failing"),
+        )
+
+    def test_session_runner_result_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp, "subject")
+            (directory / "tests").mkdir(parents=True)
+            (directory / "tests" / "test_crash.py").write_text(
+                "import os\n"
+                "\n"
+                "\n"
+                "def test_pass():\n"
+                "    pass\n"
+                "\n"
+                "\n"
+                "def test_crash():\n"
+                "    if os.path.exists('crash'):\n"
+                "        os._exit(1)\n"
+            )
+            (directory / "crash").touch()
+            cache = ResultCache(Path(tmp, "cache"))
+            runner = SessionPytestRunner()
+            runner.run(directory, Path(tmp, "first"), results=cache)
+            self.assertEqual({"tests/test_crash.py::test_pass"}, runner.passing_tests)
+            self.assertEqual(
+                {"tests/test_crash.py::test_crash"}, runner.undefined_tests
+            )
+            # the crash is not restored from the cache
+            (directory / "crash").unlink()
+            runner.run(directory, Path(tmp, "second"), results=cache)
+            self.assertEqual(1, cache.hits)
+            self.assertEqual(
+                {"tests/test_crash.py::test_pass", "tests/test_crash.py::test_crash"},
+                runner.passing_tests,
+            )
+
+    def test_stream(self):
+        config = Config.create(
+            path=os.path.join(self.TEST_RESOURCES, BaseTest.TEST_RUNNER),
+            language="python",
+            events="line",
+            predicates="line",
+            working=BaseTest.TEST_DIR,
+            exclude="tests",
+        )
+        instrument_config(config)
+        mapping = EventMapping.load(config)
+        runner = PersistentPytestRunner(workers=2)
+        runner.collector = EventCollector(mapping, config.factory)
+        output = Path(BaseTest.TEST_DIR, "events").absolute()
+        runner.run(
+            Path(BaseTest.TEST_DIR), output, files=[Path("tests", "test_middle.py")]
+        )
+        self.assertEqual(2, len(runner.passing_tests))
+        self.assertEqual(1, len(runner.failing_tests))
+        self.assertEqual(0, len(os.listdir(output / "passing")))
+        self.assertEqual(0, len(os.listdir(output / "failing")))
+        self.assertFalse(os.path.exists(Path(BaseTest.TEST_DIR, "EVENTS_PATH_0")))
+        analyzer = runner.collector.get_analyzer()
+        self.assertEqual(1, len(analyzer.relevant_event_files))
+        self.assertEqual(2, len(analyzer.irrelevant_event_files))
+        predicates = analyzer.get_analysis_by_type(AnalysisType.LINE)
+        suggestions = sorted(map(lambda p: p.get_suggestion(), predicates))
+        self.assertEqual(1, suggestions[-1].suspiciousness)
+        self.assertEqual(1, len(suggestions[-1].lines))
+        self.assertEqual(Location("middle.py", 7), suggestions[-1].lines[0])
+
+    def test_stream_error(self):
+        os.makedirs(BaseTest.TEST_DIR, exist_ok=True)
+        path = Path(BaseTest.TEST_DIR, "EVENTS_PATH_stream")
+        mapping = EventMapping()
+        stream = EventStream(
+            path, EventFile(path, 0, mapping), StreamModel(LineFactory())
+        )
+
+        def write():
+            # unknown event ids exceeding the capacity of the pipe
+            with open(path, "wb") as fp:
+                fp.write(b"\x01\x05" * (1 << 17))
+
+        writer = threading.Thread(target=write, daemon=True)
+        writer.start()
+        writer.join(10)
+        self.assertFalse(writer.is_alive())
+        stream.close()
+        self.assertIsInstance(stream.error, KeyError)
+        self.assertFalse(path.exists())
+
+    def test_stream_timeout(self):
+        os.makedirs(BaseTest.TEST_DIR, exist_ok=True)
+        release = threading.Event()
+
+        class BlockingFactory(LineFactory):
+            def get_analysis(self, event, scope=None):
+                release.wait(10)
+                return super().get_analysis(event, scope)
+
+        mapping = EventMapping({1: LineEvent("middle.py", 1, 1)})
+        collector = EventCollector(mapping, BlockingFactory())
+        timeout, stream_module.JOIN_TIMEOUT = stream_module.JOIN_TIMEOUT, 0.1
+        try:
+            stream = collector.open(Path(BaseTest.TEST_DIR, "EVENTS_PATH_0"))
+            model = stream.model
+            with open(stream.path, "wb") as fp:
+                fp.write(b"\x01\x01")
+            result = collector.close(
+                stream, Path(BaseTest.TEST_DIR, "passing", "0"), run.TestResult.PASSING
+            )
+        finally:
+            stream_module.JOIN_TIMEOUT = timeout
+        self.assertEqual(run.TestResult.UNDEFINED, result)
+        self.assertIsNot(model, collector.models[0])
+        self.assertEqual([stream], collector.abandoned)
+        release.set()
+        analyzer = collector.get_analyzer()
+        self.assertEqual([], analyzer.irrelevant_event_files)
+        self.assertEqual([], collector.abandoned)
+
+    def test_unittest_runner(self):
+        config = Config.create(
+            path=os.path.join(self.TEST_RESOURCES, BaseTest.TEST_RUNNER),
+            language="python",
+            events="line",
+            predicates="line",
+            working=BaseTest.TEST_DIR,
+            exclude="tests",
+        )
+        instrument_config(config)
+        runner = UnittestRunner(workers=2)
+        directory = Path(BaseTest.TEST_DIR)
+        self.assertEqual(
+            [
+                "tests.test_middle.MiddleTests.test_213",
+                "tests.test_middle.MiddleTests.test_312",
+                "tests.test_middle.MiddleTests.test_321",
+            ],
+            runner.get_tests(directory),
+        )
+        self.assertEqual(
+            ["tests.test_middle.MiddleTests.test_312"],
+            runner.get_tests(directory, files=[Path("tests")], k="312"),
+        )
+        output = Path(BaseTest.TEST_DIR, "events").absolute()
+        runner.run(directory, output, files=[Path("tests", "test_middle.py")])
+        self.assertEqual(2, len(runner.passing_tests))
+        self.assertEqual(1, len(runner.failing_tests))
+        self.assertEqual(0, len(runner.undefined_tests))
+        self.assertEqual(0, len(runner.processes))
+        mapping = EventMapping.load(config)
+        analyzer = Analyzer(
+            [
+                EventFile(
+                    output / "failing" / os.listdir(output / "failing")[0],
+                    0,
+                    mapping,
+                    failing=True,
+                )
+            ],
+            [
+                EventFile(output / "passing" / path, run_id, mapping)
+                for run_id, path in enumerate(os.listdir(output / "passing"), start=1)
+            ],
+            config.factory,
+        )
+        analyzer.analyze()
+        predicates = analyzer.get_analysis_by_type(AnalysisType.LINE)
+        suggestions = sorted(map(lambda p: p.get_suggestion(), predicates))
+        self.assertEqual(1, suggestions[-1].suspiciousness)
+        self.assertEqual(Location("middle.py", 7), suggestions[-1].lines[0])
+
+    def run_input_runner(self, **kwargs) -> InputRunner:
         config = Config.create(
             path=os.path.join(self.TEST_RESOURCES, BaseTest.TEST_SUGGESTIONS),
             language="python",
@@ -84,6 +405,7 @@ class RunnerTests(BaseTest):
             "main.py",
             failing=[["2", "1", "3"]],
             passing=[["3", "2", "1"], ["3", "1", "2"]],
+            **kwargs,
         )
         output = Path(BaseTest.TEST_DIR, "events").absolute()
         runner.run(Path(BaseTest.TEST_DIR), output)
@@ -113,6 +435,22 @@ class RunnerTests(BaseTest):
         self.assertEqual(1, suggestions[-1].suspiciousness)
         self.assertEqual(1, len(suggestions[-1].lines))
         self.assertEqual(Location("main.py", 10), suggestions[-1].lines[0])
+        return runner
+
+    def test_input_runner(self):
+        runner = self.run_input_runner()
+        self.assertEqual(("", ""), runner.get_output("failing_0"))
+
+    def test_input_runner_persistent(self):
+        output_dir = Path(BaseTest.TEST_DIR, "output").absolute()
+        runner = self.run_input_runner(
+            persistent=True, workers=2, output_dir=output_dir
+        )
+        self.assertEqual(0, len(runner.processes))
+        self.assertEqual(0, len(runner.output))
+        self.assertEqual(3, len(runner.passing_tests) + len(runner.failing_tests))
+        self.assertEqual(("", ""), runner.get_output("failing_0"))
+        self.assertPathExists(output_dir / "passing_1.stdout")
 
     def test_parse_and_paths(self):
         collect = (
@@ -177,3 +515,418 @@ class RunnerTests(BaseTest):
             os.path.join("structure", "tests", "test_a.py::test_c"),
             tests,
         )
+
+    def test_path_index(self):
+        directory = Path(BaseTest.TEST_RESOURCES, "structure").absolute()
+        tests = [f"structure/tests/test_a.py::test_{i}" for i in range(100)] + [
+            f"structure/tests/b/test_b.py::test_{i}" for i in range(100)
+        ]
+        index = PathIndex(tests)
+        self.assertEqual(2, len(index.leaves))
+        self.assertEqual(directory, index.common_base(directory / "structure"))
+        self.assertEqual(directory, index.common_base(directory))
+        probed = len(index.exists)
+        self.assertLessEqual(probed, 2 * len(directory.parts))
+        normalized = PytestRunner.normalize_paths(
+            tests, directory=directory, root_dir=directory / "structure"
+        )
+        self.assertEqual(
+            [os.path.join(*t.split("/")) for t in tests],
+            normalized,
+        )
+
+    def test_manifest(self):
+        config = Config.create(
+            path=os.path.join(self.TEST_RESOURCES, BaseTest.TEST_RUNNER),
+            language="python",
+            events="line",
+            predicates="line",
+            working=BaseTest.TEST_DIR,
+            exclude="tests",
+        )
+        instrument_config(config)
+        for runner in (PytestRunner(), SessionPytestRunner()):
+            output = Path(BaseTest.TEST_DIR, "events").absolute()
+            shutil.rmtree(output, ignore_errors=True)
+            runner.run(
+                Path(BaseTest.TEST_DIR),
+                output,
+                files=[Path("tests", "test_middle.py")],
+            )
+            entries = list(Manifest.read(output / MANIFEST))
+            self.assertEqual(3, len(entries))
+            for entry in entries:
+                self.assertIn(
+                    entry["test"],
+                    {
+                        "PASSING": runner.passing_tests,
+                        "FAILING": runner.failing_tests,
+                        "UNDEFINED": runner.undefined_tests,
+                    }[entry["result"]],
+                )
+                self.assertEqual(
+                    f"{entry['result'].lower()}/{runner.safe(entry['test'])}",
+                    entry["file"],
+                )
+                self.assertEqual(os.path.getsize(output / entry["file"]), entry["size"])
+                self.assertGreater(entry["wall"], 0)
+                self.assertGreaterEqual(entry["cpu"], 0)
+                self.assertFalse(entry["timeout"])
+            if isinstance(runner, SessionPytestRunner):
+                continue
+            self.assertEqual({0, 1}, {entry["returncode"] for entry in entries})
+
+    def test_run_process_timeout(self):
+        manifest.begin()
+        with self.assertRaises(subprocess.TimeoutExpired):
+            process.run_process(["sleep", "5"], timeout=0.1)
+        record = manifest.end()
+        self.assertTrue(record.timeout)
+        manifest.begin()
+        process.run_process(["python3", "-c", "exit(3)"])
+        record = manifest.end()
+        self.assertFalse(record.timeout)
+        self.assertEqual(3, record.returncode)
+        self.assertIsNotNone(record.cpu)
+
+    def test_run_process_kills_group(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pid_file = Path(tmp, "pid")
+            with self.assertRaises(subprocess.TimeoutExpired):
+                process.run_process(
+                    [
+                        "python3",
+                        "-c",
+                        "import subprocess, sys, time\n"
+                        "p = subprocess.Popen(['sleep', '30'])\n"
+                        "open(sys.argv[1], 'w').write(str(p.pid))\n"
+                        "time.sleep(30)\n",
+                        str(pid_file),
+                    ],
+                    timeout=2,
+                )
+            pid = int(pid_file.read_text())
+        for _ in range(50):
+            try:
+                with open(f"/proc/{pid}/stat") as fp:
+                    if fp.read().split()[2] == "Z":
+                        break
+            except FileNotFoundError:
+                break
+            time.sleep(0.1)
+        else:
+            self.fail(f"process {pid} is still running")
+
+    def test_run_process_limits(self):
+        completed = process.run_process(
+            ["python3", "-c", "x = bytearray(512 * 1024 * 1024)"],
+            limits=process.get_limits(memory=128),
+            stderr=subprocess.PIPE,
+        )
+        self.assertNotEqual(0, completed.returncode)
+        self.assertIn(b"MemoryError", completed.stderr)
+        # the limits are set before the child executes
+        completed = process.run_process(
+            [
+                "python3",
+                "-c",
+                "import resource; print(resource.getrlimit(resource.RLIMIT_AS)[0])",
+            ],
+            limits=process.get_limits(memory=128),
+            stdout=subprocess.PIPE,
+        )
+        self.assertEqual(str(128 * 1024 * 1024), completed.stdout.decode().strip())
+        completed = process.run_process(
+            ["python3", "-c", "while True: pass"],
+            timeout=30,
+            limits=process.get_limits(cpu=1),
+        )
+        self.assertLess(completed.returncode, 0)
+        self.assertEqual({}, process.without_cpu(process.get_limits(cpu=1)))
+
+    def test_quarantine(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp, "subject")
+            (directory / "tests").mkdir(parents=True)
+            (directory / "tests" / "test_hang.py").write_text(
+                "import os, time\n"
+                "\n"
+                "\n"
+                "def test_hang():\n"
+                "    open(os.environ['EVENTS_PATH'], 'wb').write(b'partial')\n"
+                "    time.sleep(30)\n"
+                "\n"
+                "\n"
+                "def test_pass():\n"
+                "    open(os.environ['EVENTS_PATH'], 'wb').write(b'complete')\n"
+            )
+            runner = PytestRunner(timeout=3)
+            output = Path(tmp, "events")
+            runner.run(directory, output)
+            self.assertEqual({"tests/test_hang.py::test_hang"}, runner.undefined_tests)
+            self.assertEqual({"tests/test_hang.py::test_pass"}, runner.passing_tests)
+            self.assertEqual(
+                [runner.safe("tests/test_hang.py::test_hang")],
+                os.listdir(output / "quarantine"),
+            )
+            self.assertEqual([], os.listdir(output / "undefined"))
+            entries = {e["test"]: e for e in Manifest.read(output / MANIFEST)}
+            self.assertTrue(entries["tests/test_hang.py::test_hang"]["timeout"])
+            self.assertTrue(
+                entries["tests/test_hang.py::test_hang"]["file"].startswith(
+                    "quarantine/"
+                )
+            )
+
+    def test_resume(self):
+        config = Config.create(
+            path=os.path.join(self.TEST_RESOURCES, BaseTest.TEST_RUNNER),
+            language="python",
+            events="line",
+            predicates="line",
+            working=BaseTest.TEST_DIR,
+            exclude="tests",
+        )
+        instrument_config(config)
+        executed = list()
+
+        class CountingRunner(PytestRunner):
+            def run_test(self, directory, test, environ=None):
+                executed.append(test)
+                return super().run_test(directory, test, environ=environ)
+
+        runner = CountingRunner()
+        output = Path(BaseTest.TEST_DIR, "events").absolute()
+        files = [Path("tests", "test_middle.py")]
+        runner.run(Path(BaseTest.TEST_DIR), output, files=files)
+        self.assertEqual(3, len(executed))
+        passing, failing = set(runner.passing_tests), set(runner.failing_tests)
+        # simulate a run interrupted while writing the third entry
+        with open(output / MANIFEST, "r") as fp:
+            lines = fp.readlines()
+        with open(output / MANIFEST, "w") as fp:
+            fp.writelines(lines[:2])
+            fp.write(lines[2][:10])
+        first = Manifest.latest(output / MANIFEST)
+        self.assertEqual(2, len(first))
+        # an event file that was not completely written
+        damaged = next(iter(first.values()))
+        with open(output / damaged["file"], "ab") as fp:
+            fp.write(b"\x00")
+        executed.clear()
+        runner.run(Path(BaseTest.TEST_DIR), output, files=files, resume=True)
+        self.assertEqual(2, len(executed))
+        self.assertIn(damaged["test"], executed)
+        self.assertEqual(passing, runner.passing_tests)
+        self.assertEqual(failing, runner.failing_tests)
+        self.assertEqual(3, len(Manifest.latest(output / MANIFEST)))
+        executed.clear()
+        runner.run(Path(BaseTest.TEST_DIR), output, files=files, resume=True)
+        self.assertEqual([], executed)
+        self.assertEqual(passing, runner.passing_tests)
+        self.assertEqual(failing, runner.failing_tests)
+
+    def test_result_cache(self):
+        config = Config.create(
+            path=os.path.join(self.TEST_RESOURCES, BaseTest.TEST_RUNNER),
+            language="python",
+            events="line",
+            predicates="line",
+            working=BaseTest.TEST_DIR,
+            exclude="tests",
+        )
+        instrument_config(config)
+        executed = list()
+        crashing = list()
+
+        class CountingRunner(PytestRunner):
+            def run_test(self, directory, test, environ=None):
+                executed.append(test)
+                if crashing:
+                    return run.TestResult.UNDEFINED
+                return super().run_test(directory, test, environ=environ)
+
+        runner = CountingRunner()
+        files = [Path("tests", "test_middle.py")]
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResultCache(Path(tmp, "cache"), config.mapping.path)
+            first = Path(tmp, "first")
+            runner.run(Path(BaseTest.TEST_DIR), first, files=files, results=cache)
+            self.assertEqual(3, len(executed))
+            passing, failing = set(runner.passing_tests), set(runner.failing_tests)
+            executed.clear()
+            second = Path(tmp, "second")
+            runner.run(Path(BaseTest.TEST_DIR), second, files=files, results=cache)
+            self.assertEqual([], executed)
+            self.assertEqual(3, cache.hits)
+            self.assertEqual(passing, runner.passing_tests)
+            self.assertEqual(failing, runner.failing_tests)
+            for entry in Manifest.read(first / MANIFEST):
+                with open(first / entry["file"], "rb") as a, open(
+                    second / entry["file"], "rb"
+                ) as b:
+                    self.assertEqual(a.read(), b.read())
+            objects = set(cache.objects.iterdir())
+            # changing an instrumented file invalidates the cache
+            with open(Path(BaseTest.TEST_DIR, "middle.py"), "a") as fp:
+                fp.write("\n")
+            executed.clear()
+            runner.run(
+                Path(BaseTest.TEST_DIR), Path(tmp, "third"), files=files, results=cache
+            )
+            self.assertEqual(3, len(executed))
+            self.assertEqual(0, cache.hits)
+            self.assertEqual(passing, runner.passing_tests)
+            self.assertEqual(objects, set(cache.objects.iterdir()))
+            # undefined results are not cached
+            with open(Path(BaseTest.TEST_DIR, "middle.py"), "a") as fp:
+                fp.write("\n")
+            crashing.append(True)
+            runner.run(
+                Path(BaseTest.TEST_DIR), Path(tmp, "fourth"), files=files, results=cache
+            )
+            self.assertEqual(3, len(runner.undefined_tests))
+            crashing.clear()
+            executed.clear()
+            runner.run(
+                Path(BaseTest.TEST_DIR), Path(tmp, "fifth"), files=files, results=cache
+            )
+            self.assertEqual(3, len(executed))
+            self.assertEqual(0, cache.hits)
+            self.assertEqual(passing, runner.passing_tests)
+
+    def test_compressed_events(self):
+        config = Config.create(
+            path=os.path.join(self.TEST_RESOURCES, BaseTest.TEST_RUNNER),
+            language="python",
+            events="line",
+            predicates="line",
+            working=BaseTest.TEST_DIR,
+            exclude="tests",
+        )
+        instrument_config(config)
+        files = [Path("tests", "test_middle.py")]
+        with tempfile.TemporaryDirectory() as tmp:
+            for runner in (PytestRunner(), SessionPytestRunner()):
+                output = Path(tmp, runner.__class__.__name__)
+                runner.run(Path(BaseTest.TEST_DIR), output, files=files)
+                raw = {
+                    entry["file"]: (output / entry["file"]).read_bytes()
+                    for entry in Manifest.read(output / MANIFEST)
+                }
+                runner.set_compression(GZIP, 9)
+                runner.run(Path(BaseTest.TEST_DIR), output, files=files)
+                for entry in Manifest.read(output / MANIFEST):
+                    path = output / entry["file"]
+                    self.assertTrue(is_compressed(path))
+                    self.assertEqual(path.stat().st_size, entry["size"])
+                    self.assertEqual(
+                        raw[entry["file"]], gzip.decompress(path.read_bytes())
+                    )
+                    with EventFile(path, 0, config.mapping) as event_file:
+                        self.assertLess(0, len(event_file.event_ids()))
+        self.assertRaises(ValueError, PytestRunner().set_compression, "lzma")
+
+    def test_shards(self):
+        config = Config.create(
+            path=os.path.join(self.TEST_RESOURCES, BaseTest.TEST_RUNNER),
+            language="python",
+            events="line",
+            predicates="line",
+            working=BaseTest.TEST_DIR,
+            exclude="tests",
+        )
+        instrument_config(config)
+        runner = PytestRunner()
+        files = [Path("tests", "test_middle.py")]
+
+        def get_event_files(output: Path):
+            generator = IDGenerator()
+            return [
+                (os.path.basename(e.path), e.run_id, e.failing)
+                for failing in (False, True)
+                for e in Config.get_event_files(
+                    [output / ("failing" if failing else "passing")],
+                    generator,
+                    config.mapping,
+                    failing,
+                )
+            ]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            full = Path(tmp, "full")
+            runner.run(Path(BaseTest.TEST_DIR), full, files=files)
+            shards = list()
+            for i in range(1, 3):
+                shard = get_shard_dir(Path(tmp), (i, 2))
+                runner.run(Path(BaseTest.TEST_DIR), shard, files=files, shard=(i, 2))
+                shards.append(Manifest.latest(shard / MANIFEST))
+            self.assertEqual(
+                [
+                    len(get_shard(list(shards[0]) + list(shards[1]), (i, 2)))
+                    for i in (1, 2)
+                ],
+                list(map(len, shards)),
+            )
+            self.assertFalse(set(shards[0]) & set(shards[1]))
+            outputs = [get_shard_dir(Path(tmp), (i, 2)) for i in range(1, 3)]
+            merged = Path(tmp, "merged")
+            self.assertEqual(3, merge_runs(outputs, merged))
+            self.assertEqual(
+                set(Manifest.latest(full / MANIFEST)),
+                set(Manifest.latest(merged / MANIFEST)),
+            )
+            self.assertEqual(get_event_files(full), get_event_files(merged))
+            # the output must be empty
+            self.assertRaises(ValueError, merge_runs, outputs, merged)
+            # the outputs must be shards
+            self.assertRaises(ValueError, merge_runs, [full], Path(tmp, "full-merged"))
+            # every test must be executed by a shard
+            missing = Path(tmp, "missing")
+            self.assertRaises(ValueError, merge_runs, outputs[1:], missing)
+            self.assertFalse(missing.exists())
+            # the shards must be disjoint
+            duplicate = Path(tmp, "duplicate")
+            shutil.copytree(outputs[0], duplicate)
+            twice = Path(tmp, "twice")
+            self.assertRaises(ValueError, merge_runs, outputs + [duplicate], twice)
+            self.assertFalse(twice.exists())
+
+    def test_collection_cache(self):
+        collections = list()
+
+        class CountingRunner(PytestRunner):
+            def collect_tests(self, directory, files=None, *args, **kwargs):
+                collections.append(files)
+                return super().collect_tests(directory, files, *args, **kwargs)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp, "subject")
+            shutil.copytree(
+                os.path.join(self.TEST_RESOURCES, BaseTest.TEST_RUNNER), directory
+            )
+            shutil.copy(
+                directory / "tests" / "test_middle.py",
+                directory / "tests" / "test_other.py",
+            )
+            runner = CountingRunner(collection_cache=True)
+            tests = runner.get_tests(directory)
+            self.assertEqual([None], collections)
+            self.assertTrue(runner.get_cache_path(directory).exists())
+            self.assertEqual(tests, runner.get_tests(directory))
+            self.assertEqual([None], collections)
+
+            with open(directory / "tests" / "test_other.py", "a") as fp:
+                fp.write("\n\ndef test_added():\n    pass\n")
+            changed = runner.get_tests(directory)
+            self.assertEqual([None, ["tests/test_other.py"]], collections)
+            self.assertEqual(len(tests) + 1, len(changed))
+            self.assertIn(os.path.join("tests", "test_other.py::test_added"), changed)
+
+            os.remove(directory / "tests" / "test_other.py")
+            removed = runner.get_tests(directory)
+            self.assertEqual(2, len(collections))
+            self.assertEqual(len(tests) // 2, len(removed))
+            self.assertEqual(
+                sorted(PytestRunner().get_tests(directory)), sorted(removed)
+            )
@@ -0,0 +1,135 @@
+import os
+import tempfile
+from pathlib import Path
+
+from sflkit import Config, instrument_config
+from sflkit.runners.manifest import Manifest, MANIFEST
+from sflkit.runners.run import PytestRunner
+from sflkit.runners.schedule import (
+    History,
+    MAX_ESCALATIONS,
+    MIN_TIMEOUT,
+    TIMEOUT_FACTOR,
+)
+from sflkit.runners.shard import get_shard, parse_shard
+from utils import BaseTest
+
+
+class ScheduleTest(BaseTest):
+    @staticmethod
+    def get_history() -> History:
+        history = History(size=3)
+        for test, wall in [
+            ("a", 1),
+            ("b", 5),
+            ("b", 7),
+            ("c", 2),
+            ("c", 0.01),
+            ("c", 0.02),
+            ("c", 0.03),
+        ]:
+            history.add({"test": test, "wall": wall, "timeout": False})
+        history.add({"test": "d", "wall": 10, "timeout": True})
+        return history
+
+    def test_history_size(self):
+        history = self.get_history()
+        self.assertEqual([0.01, 0.02, 0.03], history.durations["c"])
+        self.assertNotIn("d", history.durations)
+        self.assertEqual(1, history.timeouts["d"])
+
+    def test_schedule(self):
+        history = self.get_history()
+        self.assertEqual(
+            ["b", "a", "d", "e", "c"], history.schedule(["a", "b", "c", "d", "e"])
+        )
+
+    def test_partition(self):
+        history = self.get_history()
+        history.add({"test": "a", "wall": 1, "timeout": False})
+        self.assertEqual(
+            [["b"], ["a", "x0", "x1", "x2", "c"]],
+            history.partition(["a", "b", "c", "x0", "x1", "x2"], 2),
+        )
+
+    def test_shard(self):
+        self.assertEqual((2, 3), parse_shard("2/3"))
+        for shard in ["0/3", "4/3", "1", "a/b"]:
+            self.assertRaises(ValueError, parse_shard, shard)
+        tests = ["e", "a", "d", "c", "b"]
+        self.assertEqual(["a", "d", "e"], get_shard(tests, (1, 2)))
+        self.assertEqual(["b", "c"], get_shard(sorted(tests) + ["c"], (2, 2)))
+        self.assertEqual(
+            sorted(tests),
+            sorted(test for i in range(1, 4) for test in get_shard(tests, (i, 3))),
+        )
+        # a test belongs to the same shard regardless of the other tests
+        self.assertEqual(["a", "d"], get_shard(["a", "b", "d"], (1, 2)))
+
+    def test_timeouts(self):
+        history = self.get_history()
+        self.assertAlmostEqual(
+            TIMEOUT_FACTOR * (5 + 0.95 * 2), history.get_timeout("b", 10)
+        )
+        self.assertEqual(MIN_TIMEOUT, history.get_timeout("c", 10))
+        self.assertEqual(10 * TIMEOUT_FACTOR, history.get_timeout("d", 10))
+        self.assertEqual(10, history.get_timeout("e", 10))
+        # tests that timed out since they last finished get longer timeouts
+        timeout = history.get_timeout("b", 10)
+        history.add({"test": "b", "wall": 100, "timeout": True})
+        self.assertAlmostEqual(TIMEOUT_FACTOR * timeout, history.get_timeout("b", 10))
+        history.add({"test": "b", "wall": 100, "timeout": True})
+        self.assertAlmostEqual(
+            TIMEOUT_FACTOR**2 * timeout, history.get_timeout("b", 10)
+        )
+        history.add({"test": "c", "wall": 10, "timeout": True})
+        self.assertEqual(10 * TIMEOUT_FACTOR, history.get_timeout("c", 10))
+        history.add({"test": "c", "wall": 0.01, "timeout": False})
+        self.assertEqual(MIN_TIMEOUT, history.get_timeout("c", 10))
+        for _ in range(10):
+            history.add({"test": "d", "wall": 10, "timeout": True})
+        self.assertEqual(
+            10 * TIMEOUT_FACTOR**MAX_ESCALATIONS, history.get_timeout("d", 10)
+        )
+
+    def test_run_with_history(self):
+        config = Config.create(
+            path=os.path.join(self.TEST_RESOURCES, BaseTest.TEST_RUNNER),
+            language="python",
+            events="line",
+            predicates="line",
+            working=BaseTest.TEST_DIR,
+            exclude="tests",
+        )
+        instrument_config(config)
+        runner = PytestRunner()
+        output = Path(BaseTest.TEST_DIR, "events").absolute()
+        with tempfile.TemporaryDirectory() as tmp:
+            history = Path(tmp, "history.jsonl")
+            runner.run(
+                Path(BaseTest.TEST_DIR),
+                output,
+                files=[Path("tests", "test_middle.py")],
+                history=history,
+            )
+            durations = {
+                entry["test"]: entry["wall"]
+                for entry in Manifest.read(output / MANIFEST)
+            }
+            runner.run(
+                Path(BaseTest.TEST_DIR),
+                output,
+                files=[Path("tests", "test_middle.py")],
+                history=history,
+            )
+            self.assertEqual(2, len(runner.passing_tests))
+            self.assertEqual(1, len(runner.failing_tests))
+            self.assertEqual(dict(), runner.timeouts)
+            self.assertEqual(
+                sorted(durations, key=lambda test: -durations[test]),
+                [entry["test"] for entry in Manifest.read(output / MANIFEST)],
+            )
+            self.assertEqual(6, len(list(Manifest.read(history))))
+            self.assertEqual(
+                {2}, set(map(len, History.load(history).durations.values()))
+            )
@@ -18,3 +18,29 @@ class TestScope(unittest.TestCase):
     def test_scope_without_parent(self):
         scope = Scope()
         self.assertIs(scope, scope.exit())
+
+    def test_scope_chain(self):
+        scope = Scope()
+        scope.add("x", 1, int)
+        scope.add("y", 2, int)
+        child = scope.enter()
+        self.assertEqual(1, child.value("x"))
+        self.assertEqual([("x", 1), ("y", 2)], self.get_vars(child))
+        child.add("z", 3, int)
+        child.add("x", 4, int)
+        self.assertEqual(4, child.value("x"))
+        self.assertEqual([("x", 4), ("y", 2), ("z", 3)], self.get_vars(child))
+        grandchild = child.enter()
+        self.assertEqual(3, grandchild.value("z"))
+        self.assertIsNone(grandchild.value("w"))
+        grandchild.add("y", 5, int)
+        self.assertEqual([("x", 4), ("y", 5), ("z", 3)], self.get_vars(grandchild))
+        self.assertEqual([("x", 4), ("y", 2), ("z", 3)], self.get_vars(child))
+        self.assertIs(scope, grandchild.exit().exit())
+        self.assertEqual(1, scope.value("x"))
+        self.assertIsNone(scope.value("z"))
+        self.assertEqual([("x", 1), ("y", 2)], self.get_vars(scope))
+
+    @staticmethod
+    def get_vars(scope: Scope):
+        return [(v.var, v.value) for v in scope.get_all_vars()]
@@ -1,10 +1,13 @@
+import itertools
 import unittest
+import warnings
 
+import numpy
 from parameterized import parameterized
 from sflkitlib.events.event import LineEvent
 
-from sflkit.analysis import similarity
-from sflkit.analysis.spectra import Line
+from sflkit.analysis import similarity, coefficients
+from sflkit.analysis.spectra import Line, Spectrum
 from utils import BaseTest
 
 
@@ -94,6 +97,38 @@ class TestSimilarityCoefficient(BaseTest):
         )
 
 
+class TestVectorizedCoefficient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        counts = numpy.array(list(itertools.product(range(4), repeat=4)))
+        cls.po, cls.pn, cls.fo, cls.fn = counts.T
+        cls.spectra = [Spectrum("main.py", 1, *count) for count in counts.tolist()]
+
+    @parameterized.expand(similarity.similarity_coefficients)
+    def test_coefficient(self, metric):
+        result = coefficients.evaluate(metric, self.po, self.pn, self.fo, self.fn)
+        self.assertEqual(len(self.spectra), len(result))
+        self.assertTrue(numpy.isfinite(result).all())
+        for spectrum, suspiciousness in zip(self.spectra, result):
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", RuntimeWarning)
+                value = spectrum.get_metric(getattr(Spectrum, metric))
+            self.assertAlmostEqual(
+                value,
+                suspiciousness,
+                msg=f"The results for {metric} do not match for {spectrum.__dict__}",
+                delta=0.00001,
+            )
+
+    def test_all(self):
+        results = coefficients.evaluate_all(self.po, self.pn, self.fo, self.fn)
+        self.assertEqual(set(similarity.similarity_coefficients), set(results))
+        results = coefficients.evaluate_all(
+            self.po, self.pn, self.fo, self.fn, ["Ochiai", "DStar"]
+        )
+        self.assertEqual({"Ochiai", "DStar"}, set(results))
+
+
 class TestComparison(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None: